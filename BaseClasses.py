@@ -81,6 +81,8 @@ class MultiWorld():
     game: Dict[int, str]
 
     random: random.Random
+    cancellation: Utils.CancellationToken
+    """Checked during long-running steps of generation, raising Utils.GenerationCancelled once cancelled."""
     per_slot_randoms: Utils.DeprecateDict[int, random.Random]
     """Deprecated. Please use `self.random` instead."""
 
@@ -131,6 +133,7 @@ class MultiWorld():
     def __init__(self, players: int):
         # world-local random state is saved for multiple generations running concurrently
         self.random = ThreadBarrierProxy(random.Random())
+        self.cancellation = Utils.CancellationToken()
         self.players = players
         self.player_types = {player: NetUtils.SlotType.player for player in self.player_ids}
         self.algorithm = 'balanced'
@@ -1166,6 +1169,7 @@ class Spoiler:
         sphere_candidates = set(prog_locations)
         logging.debug('Building up collection spheres.')
         while sphere_candidates:
+            multiworld.cancellation.check()
 
             # build up spheres of collection radius.
             # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
@@ -1199,6 +1203,7 @@ class Spoiler:
         for num, sphere in reversed(tuple(enumerate(collection_spheres))):
             to_delete = set()
             for location in sphere:
+                multiworld.cancellation.check()
                 # we remove the item at location and check if game is still beatable
                 logging.debug('Checking if %s (Player %d) is required to beat the game.', location.item.name,
                               location.item.player)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import array
+import bisect
 import copy
 import logging
 import asyncio
@@ -8,6 +10,7 @@ import sys
 import typing
 import time
 import functools
+import zlib
 
 import ModuleUpdate
 ModuleUpdate.update()
@@ -18,6 +21,7 @@ import Utils
 
 if __name__ == "__main__":
     Utils.init_logging("TextClient", exception_logger="Client")
+    Utils.lazy_world_loading = True
 
 from MultiServer import CommandProcessor
 from NetUtils import (Endpoint, decode, NetworkItem, encode, JSONtoTextParser, ClientStatus, Permission, NetworkSlot,
@@ -166,6 +170,141 @@ class ClientCommandProcessor(CommandProcessor):
             async_start(self.ctx.send_msgs([{"cmd": "Say", "text": raw}]), name="send Say")
 
 
+class NameLookup:
+    """Maps ids to names as a sorted array of ids and the list of names in the same order, which takes a fraction of
+    the memory of a dict. Games can be added lazily, which loads them on the first lookup of an unknown id."""
+    unknown_format: str
+    ids: array.array
+    names: typing.List[str]
+    _lazy: typing.List[typing.Callable[[], typing.Mapping[str, int]]]
+
+    def __init__(self, unknown_format: str) -> None:
+        """:param unknown_format: format string for the name of unknown ids, with the id as {0}"""
+        self.unknown_format = unknown_format
+        self.ids = array.array("q")
+        self.names = []
+        self._lazy = []
+
+    def update(self, *name_to_ids: typing.Mapping[str, int]) -> None:
+        """Adds name to id mappings, such as a game's item_name_to_id."""
+        merged = dict(zip(self.ids, self.names))
+        for name_to_id in name_to_ids:
+            merged.update((code, name) for name, code in name_to_id.items())
+        self.ids = array.array("q", sorted(merged))
+        self.names = [merged[code] for code in self.ids]
+
+    def update_lazy(self, loader: typing.Callable[[], typing.Mapping[str, int]]) -> None:
+        """Adds a name to id mapping that is only retrieved once an id is looked up that is not known so far."""
+        self._lazy.append(loader)
+
+    def get(self, code: int, default: typing.Optional[str] = None) -> typing.Optional[str]:
+        index = bisect.bisect_left(self.ids, code)
+        if index < len(self.ids) and self.ids[index] == code:
+            return self.names[index]
+        if self._lazy:
+            lazy, self._lazy = self._lazy, []
+            self.update(*(loader() for loader in lazy))
+            return self.get(code, default)
+        return default
+
+    def __getitem__(self, code: int) -> str:
+        name = self.get(code)
+        return self.unknown_format.format(code) if name is None else name
+
+    def __setitem__(self, code: int, name: str) -> None:
+        index = bisect.bisect_left(self.ids, code)
+        if index < len(self.ids) and self.ids[index] == code:
+            self.names[index] = name
+        else:
+            self.ids.insert(index, code)
+            self.names.insert(index, name)
+
+    def __contains__(self, code: int) -> bool:
+        return self.get(code) is not None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class PollScheduler:
+    """Decides how long a game watcher waits between polls of game memory.
+
+    Polls at the minimum interval while the memory read during a poll keeps changing and right after the watcher got
+    woken up, for example by received items. Once the memory stayed the same for a few polls, backs off exponentially
+    up to max_interval, as nothing could have happened that needs handling."""
+    max_interval: float
+    backoff: float
+    settle_polls: int
+    interval: float
+    """Current interval between polls, never below the minimum interval passed to wait"""
+
+    def __init__(self, max_interval: float = 2.0, backoff: float = 1.5, settle_polls: int = 4) -> None:
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.settle_polls = settle_polls
+        self.interval = 0.
+        self._digest = 0
+        self._last_digest = 0
+        self._idle_polls = 0
+        self._woken = False
+        self.reset_metrics()
+
+    def reset_metrics(self) -> None:
+        self._metrics_start = time.monotonic()
+        self._polls = 0
+        self._reads = 0
+        self._bytes_read = 0
+        self._read_time = 0.
+
+    def record_read(self, data: bytes, latency: float) -> None:
+        """To be called with the data of every memory read and the time in seconds it took."""
+        self._digest = zlib.crc32(data, self._digest)
+        self._reads += 1
+        self._bytes_read += len(data)
+        self._read_time += latency
+
+    def wake(self) -> None:
+        """Poll quickly again, as something happened that may need handling."""
+        self._woken = True
+
+    async def wait(self, event: asyncio.Event, min_interval: float) -> None:
+        """Ends the current poll and waits until the next one is due, or event gets set."""
+        self._polls += 1
+        if self._woken or self._digest != self._last_digest:
+            self._idle_polls = 0
+            self.interval = min_interval
+        else:
+            self._idle_polls += 1
+            if self._idle_polls > self.settle_polls:
+                self.interval = min(max(self.interval, min_interval) * self.backoff, self.max_interval)
+        self.interval = max(self.interval, min_interval)
+        self._last_digest, self._digest = self._digest, 0
+        self._woken = False
+
+        try:
+            await asyncio.wait_for(event.wait(), self.interval)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            self.wake()
+
+    def get_metrics(self) -> typing.Dict[str, float]:
+        elapsed = max(time.monotonic() - self._metrics_start, 0.001)
+        return {
+            "polls_per_second": self._polls / elapsed,
+            "bytes_read_per_second": self._bytes_read / elapsed,
+            "average_latency": self._read_time / self._reads if self._reads else 0.,
+            "interval": self.interval,
+        }
+
+    def format_metrics(self) -> str:
+        metrics = self.get_metrics()
+        return f"{metrics['polls_per_second']:.2f} polls/s, " \
+               f"{Utils.format_SI_prefix(metrics['bytes_read_per_second'], 1024)}B/s read, " \
+               f"{metrics['average_latency'] * 1000:.1f} ms average read latency, " \
+               f"currently polling every {metrics['interval']:.3f} s"
+
+
 class CommonContext:
     # Should be adjusted as needed in subclasses
     tags: typing.Set[str] = {"AP"}
@@ -175,8 +314,8 @@ class CommonContext:
 
     # data package
     # Contents in flux until connection to server is made, to download correct data for this multiworld.
-    item_names: typing.Dict[int, str] = Utils.KeyedDefaultDict(lambda code: f'Unknown item (ID:{code})')
-    location_names: typing.Dict[int, str] = Utils.KeyedDefaultDict(lambda code: f'Unknown location (ID:{code})')
+    item_names: NameLookup = NameLookup("Unknown item (ID:{0})")
+    location_names: NameLookup = NameLookup("Unknown location (ID:{0})")
 
     # defaults
     starting_reconnect_delay: int = 5
@@ -460,6 +599,7 @@ class CommonContext:
         relevant_games.add("Archipelago")
 
         needed_updates: typing.Set[str] = set()
+        cached_games: typing.List[dict] = []
         for game in relevant_games:
             if game not in remote_date_package_versions and game not in remote_data_package_checksums:
                 continue
@@ -476,6 +616,12 @@ class CommonContext:
             # no action required if local version is new enough
             if (not remote_checksum and (remote_version > local_version or remote_version == 0)) \
                     or remote_checksum != local_checksum:
+                if remote_checksum and game not in network_data_package["games"] \
+                        and Utils.has_data_package_for_checksum(game, remote_checksum):
+                    # the names are only needed once ids of this game show up, while names of a local version of
+                    # the game have to be replaced right away
+                    self.update_game_lazy(game, remote_checksum)
+                    continue
                 cached_game = Utils.load_data_package_for_checksum(game, remote_checksum)
                 cache_version: int = cached_game.get("version", 0)
                 cache_checksum: typing.Optional[str] = cached_game.get("checksum")
@@ -484,25 +630,31 @@ class CommonContext:
                         or remote_checksum != cache_checksum:
                     needed_updates.add(game)
                 else:
-                    self.update_game(cached_game)
+                    cached_games.append(cached_game)
+        if cached_games:
+            self.update_game(*cached_games)
         if needed_updates:
             await self.send_msgs([{"cmd": "GetDataPackage", "games": [game_name]} for game_name in needed_updates])
 
-    def update_game(self, game_package: dict):
-        for item_name, item_id in game_package["item_name_to_id"].items():
-            self.item_names[item_id] = item_name
-        for location_name, location_id in game_package["location_name_to_id"].items():
-            self.location_names[location_id] = location_name
+    def update_game(self, *game_packages: dict):
+        self.item_names.update(*(game_package["item_name_to_id"] for game_package in game_packages))
+        self.location_names.update(*(game_package["location_name_to_id"] for game_package in game_packages))
+
+    def update_game_lazy(self, game: str, checksum: str):
+        """Adds a game's cached data package, which only gets loaded once names are looked up that are unknown."""
+        def load(key: str) -> typing.Dict[str, int]:
+            return Utils.load_data_package_for_checksum(game, checksum).get(key, {})
+
+        self.item_names.update_lazy(functools.partial(load, "item_name_to_id"))
+        self.location_names.update_lazy(functools.partial(load, "location_name_to_id"))
 
     def update_data_package(self, data_package: dict):
-        for game, game_data in data_package["games"].items():
-            self.update_game(game_data)
+        games = data_package["games"].values()
+        self.item_names.update(*(game_data["item_name_to_id"] for game_data in games))
+        self.location_names.update(*(game_data["location_name_to_id"] for game_data in games))
 
     def consume_network_data_package(self, data_package: dict):
         self.update_data_package(data_package)
-        current_cache = Utils.persistent_load().get("datapackage", {}).get("games", {})
-        current_cache.update(data_package["games"])
-        Utils.persistent_store("datapackage", "games", current_cache)
         logger.info(f"Got new ID/Name DataPackage for {', '.join(data_package['games'])}")
         for game, game_data in data_package["games"].items():
             Utils.store_data_package_for_checksum(game, game_data)
@@ -57,6 +57,7 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     placed = 0
 
     while any(reachable_items.values()) and locations:
+        multiworld.cancellation.check()
         # grab one item per player
         items_to_place = [items.pop()
                           for items in reachable_items.values() if items]
@@ -615,6 +616,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
             return
 
         while True:
+            multiworld.cancellation.check()
             # Gather non-locked locations.
             # This ensures that only shuffled locations get counted for progression balancing,
             #   i.e. the items the players will be checking.
@@ -654,6 +656,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                     balancing_sphere = sphere_locations.copy()
                     candidate_items: typing.Dict[int, typing.Set[Location]] = collections.defaultdict(set)
                     while True:
+                        multiworld.cancellation.check()
                         # Check locations in the current sphere and gather progression items to swap earlier
                         for location in balancing_sphere:
                             if location.advancement:
@@ -690,6 +693,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         items_to_test.sort()
                         multiworld.random.shuffle(items_to_test)
                         while items_to_test:
+                            multiworld.cancellation.check()
                             testing = items_to_test.pop()
                             reducing_state = state.copy()
                             for location in itertools.chain((
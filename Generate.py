@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import logging
 import os
+import pickle
 import random
 import string
+import time
 import urllib.parse
 import urllib.request
 from collections import Counter
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, Hashable, Optional, Tuple, Type, Union
 
 import ModuleUpdate
 
@@ -16,6 +19,10 @@ ModuleUpdate.update()
 
 import copy
 import Utils
+
+if __name__ == "__main__":
+    Utils.lazy_world_loading = True  # only import the worlds of the games being generated
+
 import Options
 from BaseClasses import seeddigits, get_seed, PlandoOptions
 from Main import main as ERmain
@@ -23,7 +30,7 @@ from settings import get_settings
 from Utils import parse_yamls, version_tuple, __version__, tuplize_version
 from worlds.alttp.EntranceRandomizer import parse_arguments
 from worlds.alttp.Text import TextTable
-from worlds.AutoWorld import AutoWorldRegister
+from worlds.AutoWorld import AutoWorldRegister, World
 from worlds.generic import PlandoConnection
 from worlds import failed_world_loads
 
@@ -154,8 +161,10 @@ def main(args=None, callback=ERmain):
     erargs.skip_prog_balancing = args.skip_prog_balancing
     erargs.skip_output = args.skip_output
 
+    option_cache = OptionCache()
     settings_cache: Dict[str, Tuple[argparse.Namespace, ...]] = \
-        {fname: (tuple(roll_settings(yaml, args.plando) for yaml in yamls) if args.sameoptions else None)
+        {fname: (tuple(roll_settings(yaml, args.plando, option_cache) for yaml in yamls)
+                 if args.sameoptions else None)
          for fname, yamls in weights_cache.items()}
 
     if meta_weights:
@@ -187,7 +196,7 @@ def main(args=None, callback=ERmain):
         if path:
             try:
                 settings: Tuple[argparse.Namespace, ...] = settings_cache[path] if settings_cache[path] else \
-                    tuple(roll_settings(yaml, args.plando) for yaml in weights_cache[path])
+                    tuple(roll_settings(yaml, args.plando, option_cache) for yaml in weights_cache[path])
                 for settingsObject in settings:
                     for k, v in vars(settingsObject).items():
                         if v is not None:
@@ -241,14 +250,60 @@ def main(args=None, callback=ERmain):
 def read_weights_yamls(path) -> Tuple[Any, ...]:
     try:
         if urllib.parse.urlparse(path).scheme in ('https', 'file'):
-            yaml = str(urllib.request.urlopen(path).read(), "utf-8-sig")
+            data = urllib.request.urlopen(path).read()
         else:
             with open(path, 'rb') as f:
-                yaml = str(f.read(), "utf-8-sig")
+                data = f.read()
     except Exception as e:
         raise Exception(f"Failed to read weights ({path})") from e
 
-    return tuple(parse_yamls(yaml))
+    return parse_weights_yamls(data)
+
+
+yaml_cache_max_files = 1000
+yaml_cache_max_age = 7 * 24 * 60 * 60  # seconds since a cached yaml was last used
+
+
+def parse_weights_yamls(data: bytes) -> Tuple[Any, ...]:
+    """Parses all yaml documents in data, reusing the result of an earlier parse of the same content if cached."""
+    cache_file = Utils.cache_path("yaml", f"{hashlib.sha256(data).hexdigest()}.pickle")
+    try:
+        with open(cache_file, "rb") as f:
+            weights = Utils.restricted_loads(f.read())
+        os.utime(cache_file)  # mark as recently used, so it is kept by prune_yaml_cache
+        return weights
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.debug(f"Could not load cached yaml {cache_file}: {e}")
+
+    weights = tuple(parse_yamls(str(data, "utf-8-sig")))
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temp_file = f"{cache_file}.{os.getpid()}"
+        with open(temp_file, "wb") as f:
+            pickle.dump(weights, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)  # concurrent generations may write the same file
+        prune_yaml_cache(os.path.dirname(cache_file))
+    except Exception as e:
+        logging.debug(f"Could not cache yaml {cache_file}: {e}")
+    return weights
+
+
+def prune_yaml_cache(cache_dir: str) -> None:
+    """Deletes cached yamls that were not used for a while and the least recently used ones above the limit."""
+    files = []
+    for file in os.scandir(cache_dir):
+        if file.name.endswith(".pickle"):
+            files.append((file.stat().st_mtime, file.path))
+    files.sort(reverse=True)
+    oldest_kept = time.time() - yaml_cache_max_age
+    for index, (last_used, path) in enumerate(files):
+        if index >= yaml_cache_max_files or last_used < oldest_kept:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass  # pruned by a concurrent generation
 
 
 def interpret_on_off(value) -> bool:
@@ -408,23 +463,83 @@ def roll_triggers(weights: dict, triggers: list) -> dict:
     return weights
 
 
-def handle_option(ret: argparse.Namespace, game_weights: dict, option_key: str, option: type(Options.Option), plando_options: PlandoOptions):
+class OptionCache:
+    """Remembers verified options by their rolled value, so players sharing a value skip from_any and verify.
+    Only container options are cached, as their verification against item and location names is what adds up.
+    Values that could roll randomly in from_any and options overriding from_any, from_text or verify outside
+    of Options.py are never cached, so every player keeps their own rolls."""
+
+    def __init__(self) -> None:
+        self.options: Dict[Hashable, Options.Option] = {}
+        self.cacheable: Dict[Type[Options.Option], bool] = {}
+
+    def is_cacheable(self, option: Type[Options.Option]) -> bool:
+        if option not in self.cacheable:
+            defining_classes = (next((base for base in option.__mro__ if method in vars(base)), Options.Option)
+                                for method in ("from_any", "from_text", "verify"))
+            self.cacheable[option] = issubclass(option, Options.VerifyKeys) and \
+                all(base.__module__ == Options.__name__ for base in defining_classes)
+        return self.cacheable[option]
+
+    @classmethod
+    def value_key(cls, value: Any) -> Hashable:
+        if isinstance(value, dict):
+            return dict, tuple((cls.value_key(key), cls.value_key(item)) for key, item in value.items())
+        if isinstance(value, (list, tuple, set, frozenset)):
+            items = tuple(cls.value_key(item) for item in value)
+            return type(value), frozenset(items) if isinstance(value, (set, frozenset)) else items
+        if isinstance(value, str) and "random" in value.lower():
+            raise ValueError(f"{value} may be rolled randomly")
+        hash(value)
+        return type(value), value
+
+    def get_key(self, world_type: Type[World], option: Type[Options.Option], value: Any,
+                plando_options: PlandoOptions) -> Optional[Hashable]:
+        """Returns the key to cache the verified option under or None, if it can't be cached."""
+        if not self.is_cacheable(option):
+            return None
+        try:
+            return world_type, option, self.value_key(value), plando_options
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key: Hashable) -> Optional[Options.Option]:
+        if key in self.options:
+            return copy.deepcopy(self.options[key])
+        return None
+
+    def store(self, key: Hashable, player_option: Options.Option) -> None:
+        self.options[key] = copy.deepcopy(player_option)
+
+
+def handle_option(ret: argparse.Namespace, game_weights: dict, option_key: str, option: type(Options.Option),
+                  plando_options: PlandoOptions, option_cache: Optional[OptionCache] = None):
+    world_type = AutoWorldRegister.world_types[ret.game]
     if option_key in game_weights:
         try:
             if not option.supports_weighting:
-                player_option = option.from_any(game_weights[option_key])
+                value = game_weights[option_key]
             else:
-                player_option = option.from_any(get_choice(option_key, game_weights))
+                value = get_choice(option_key, game_weights)
+            key = option_cache.get_key(world_type, option, value, plando_options) if option_cache else None
+            player_option = None if key is None else option_cache.get(key)
+            if player_option is not None:
+                setattr(ret, option_key, player_option)
+                return
+            player_option = option.from_any(value)
             setattr(ret, option_key, player_option)
         except Exception as e:
             raise Exception(f"Error generating option {option_key} in {ret.game}") from e
         else:
-            player_option.verify(AutoWorldRegister.world_types[ret.game], ret.name, plando_options)
+            player_option.verify(world_type, ret.name, plando_options)
+            if key is not None:
+                option_cache.store(key, player_option)
     else:
         setattr(ret, option_key, option.from_any(option.default))  # call the from_any here to support default "random"
 
 
-def roll_settings(weights: dict, plando_options: PlandoOptions = PlandoOptions.bosses):
+def roll_settings(weights: dict, plando_options: PlandoOptions = PlandoOptions.bosses,
+                  option_cache: Optional[OptionCache] = None):
     if "linked_options" in weights:
         weights = roll_linked_options(weights)
 
@@ -477,7 +592,7 @@ def roll_settings(weights: dict, plando_options: PlandoOptions = PlandoOptions.b
         setattr(ret, option_key, option.from_any(get_choice(option_key, weights, option.default)))
 
     for option_key, option in world_type.options_dataclass.type_hints.items():
-        handle_option(ret, game_weights, option_key, option, plando_options)
+        handle_option(ret, game_weights, option_key, option, plando_options, option_cache)
     if PlandoOptions.items in plando_options:
         ret.plando_items = game_weights.get("plando_items", [])
     if ret.game == "A Link to the Past":
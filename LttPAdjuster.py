@@ -23,7 +23,7 @@ from urllib.request import urlopen
 import ModuleUpdate
 ModuleUpdate.update()
 
-from worlds.alttp.Rom import Sprite, LocalRom, apply_rom_settings, get_base_rom_bytes
+from worlds.alttp.Rom import Sprite, LocalRom, apply_rom_settings, get_base_rom_bytes, load_sprite, load_sprite_dir
 from Utils import output_path, local_path, user_path, open_file, get_cert_none_ssl_context, persistent_store, \
     get_adjuster_settings, get_adjuster_settings_no_defaults, tkinter_center_window, init_logging
 
@@ -1010,10 +1010,7 @@ class SpriteSelector():
 
         sprites = []
 
-        for file in os.listdir(path):
-            if file == '.gitignore':
-                continue
-            sprite = Sprite(os.path.join(path, file))
+        for file, sprite in load_sprite_dir(path):
             if sprite.valid:
                 sprites.append((file, sprite))
             else:
@@ -1073,7 +1070,7 @@ class SpriteSelector():
                        ("Rom Files", (".sfc", ".smc")),
                        ("All Files", "*")])
         try:
-            self.callback(Sprite(sprite))
+            self.callback(load_sprite(sprite))
         except Exception:
             self.callback(None)
         self.window.destroy()
@@ -2,18 +2,17 @@ import collections
 import concurrent.futures
 import logging
 import os
-import pickle
 import tempfile
+import threading
 import time
 import zipfile
-import zlib
 from typing import Dict, List, Optional, Set, Tuple, Union
 
 import worlds
 from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, Region
 from Fill import balance_multiworld_progression, distribute_items_restrictive, distribute_planned, flood_items
 from Options import StartInventoryPool
-from Utils import __version__, output_path, version_tuple
+from Utils import CancellationToken, __version__, compress_multidata, output_path, version_tuple
 from settings import get_settings
 from worlds import AutoWorld
 from worlds.generic.Rules import exclusion_rules, locality_rules
@@ -21,7 +20,38 @@ from worlds.generic.Rules import exclusion_rules, locality_rules
 __all__ = ["main"]
 
 
-def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = None):
+class OutputArchive:
+    """Zip archive of a generation's output, which files can be added to from any thread as soon as they are done."""
+    def __init__(self, path: str, compresslevel: int = 9):
+        self.path = path
+        self.lock = threading.Lock()
+        self.zf = zipfile.ZipFile(path, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+
+    def write(self, path: str, arcname: str) -> None:
+        # patch files are commonly zip archives themselves, compressing those again would only cost time
+        compress_type = zipfile.ZIP_STORED if zipfile.is_zipfile(path) else zipfile.ZIP_DEFLATED
+        with self.lock:
+            self.zf.write(path, arcname=arcname, compress_type=compress_type)
+
+    def write_directory(self, directory: str) -> None:
+        for file in os.scandir(directory):
+            self.write(file.path, file.name)
+
+    def writestr(self, arcname: str, data: bytes, compressed: bool = False) -> None:
+        with self.lock:
+            self.zf.writestr(arcname, data, zipfile.ZIP_STORED if compressed else zipfile.ZIP_DEFLATED)
+
+    def __enter__(self) -> "OutputArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.zf.close()
+        if exc_type:
+            os.remove(self.path)  # don't leave an incomplete archive behind
+
+
+def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = None,
+         cancellation: Optional[CancellationToken] = None):
     if not baked_server_options:
         baked_server_options = get_settings().server_options.as_dict()
     assert isinstance(baked_server_options, dict)
@@ -32,6 +62,8 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     start = time.perf_counter()
     # initialize the multiworld
     multiworld = MultiWorld(args.multi)
+    if cancellation:
+        multiworld.cancellation = cancellation
 
     logger = logging.getLogger()
     multiworld.set_seed(seed, args.race, str(args.outputname) if args.outputname else None)
@@ -49,23 +81,26 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     multiworld.state = CollectionState(multiworld)
     logger.info('Archipelago Version %s  -  Seed: %s\n', __version__, multiworld.seed)
 
-    logger.info(f"Found {len(AutoWorld.AutoWorldRegister.world_types)} World Types:")
-    longest_name = max(len(text) for text in AutoWorld.AutoWorldRegister.world_types)
+    # when loading worlds lazily, only the worlds being generated are listed, instead of importing all of them
+    world_types = {world.game: type(world) for world in multiworld.worlds.values()} if worlds.world_manifest \
+        else AutoWorld.AutoWorldRegister.world_types
+    logger.info(f"Found {len(world_types)} World Types:")
+    longest_name = max(len(text) for text in world_types)
 
     max_item = 0
     max_location = 0
-    for cls in AutoWorld.AutoWorldRegister.world_types.values():
+    for cls in world_types.values():
         if cls.item_id_to_name:
             max_item = max(max_item, max(cls.item_id_to_name))
             max_location = max(max_location, max(cls.location_id_to_name))
 
     item_digits = len(str(max_item))
     location_digits = len(str(max_location))
-    item_count = len(str(max(len(cls.item_names) for cls in AutoWorld.AutoWorldRegister.world_types.values())))
-    location_count = len(str(max(len(cls.location_names) for cls in AutoWorld.AutoWorldRegister.world_types.values())))
+    item_count = len(str(max(len(cls.item_names) for cls in world_types.values())))
+    location_count = len(str(max(len(cls.location_names) for cls in world_types.values())))
     del max_item, max_location
 
-    for name, cls in AutoWorld.AutoWorldRegister.world_types.items():
+    for name, cls in world_types.items():
         if not cls.hidden and len(cls.item_names) > 0:
             logger.info(f" {name:{longest_name}}: {len(cls.item_names):{item_count}} "
                         f"Items (IDs: {min(cls.item_id_to_name):{item_digits}} - "
@@ -74,7 +109,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
                         f"Locations (IDs: {min(cls.location_id_to_name):{location_digits}} - "
                         f"{max(cls.location_id_to_name):{location_digits}})")
 
-    del item_digits, location_digits, item_count, location_count
+    del item_digits, location_digits, item_count, location_count, world_types
 
     # This assertion method should not be necessary to run if we are not outputting any multidata.
     if not args.skip_output:
@@ -106,12 +141,14 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
                     del local_early
             del early
 
+    multiworld.cancellation.check()
     logger.info('Creating MultiWorld.')
     AutoWorld.call_all(multiworld, "create_regions")
 
     logger.info('Creating Items.')
     AutoWorld.call_all(multiworld, "create_items")
 
+    multiworld.cancellation.check()
     logger.info('Calculating Access Rules.')
 
     for player in multiworld.player_ids:
@@ -259,6 +296,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     if any(multiworld.item_links.values()):
         multiworld._all_state = None
 
+    multiworld.cancellation.check()
     logger.info("Running Item Plando.")
 
     distribute_planned(multiworld)
@@ -267,6 +305,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
 
     AutoWorld.call_all(multiworld, "pre_fill")
 
+    multiworld.cancellation.check()
     logger.info(f'Filling the multiworld with {len(multiworld.itempool)} items.')
 
     if multiworld.algorithm == 'flood':
@@ -281,6 +320,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     else:
         logger.info("Progression balancing skipped.")
 
+    multiworld.cancellation.check()
     # we're about to output using multithreading, so we're removing the global random state to prevent accidental use
     multiworld.random.passthrough = False
 
@@ -291,18 +331,30 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     logger.info(f'Beginning output...')
     outfilebase = 'AP_' + multiworld.seed_name
 
+    zipfilename = output_path(f"AP_{multiworld.seed_name}.zip")
+    logger.info(f"Writing output archive at {zipfilename}")
     output = tempfile.TemporaryDirectory()
-    with output as temp_dir:
+    with output as temp_dir, OutputArchive(zipfilename, get_settings().generator.zip_compression_level) as archive:
         output_players = [player for player in multiworld.player_ids if AutoWorld.World.generate_output.__code__
                           is not multiworld.worlds[player].generate_output.__code__]
+
+        def generate_output(player: Optional[int] = None) -> None:
+            """Runs generate_output into its own directory, then adds its files to the archive right away."""
+            output_directory = os.path.join(temp_dir, str(player) if player else "stage")
+            os.mkdir(output_directory)
+            if player:
+                AutoWorld.call_single(multiworld, "generate_output", player, output_directory)
+            else:
+                AutoWorld.call_stage(multiworld, "generate_output", output_directory)
+            archive.write_directory(output_directory)
+
         with concurrent.futures.ThreadPoolExecutor(len(output_players) + 2) as pool:
             check_accessibility_task = pool.submit(multiworld.fulfills_accessibility)
 
-            output_file_futures = [pool.submit(AutoWorld.call_stage, multiworld, "generate_output", temp_dir)]
+            output_file_futures = [pool.submit(generate_output)]
             for player in output_players:
                 # skip starting a thread for methods that say "pass".
-                output_file_futures.append(
-                    pool.submit(AutoWorld.call_single, multiworld, "generate_output", player, temp_dir))
+                output_file_futures.append(pool.submit(generate_output, player))
 
             # collect ER hint info
             er_hint_data: Dict[int, Dict[int, str]] = {}
@@ -390,11 +442,11 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
                 }
                 AutoWorld.call_all(multiworld, "modify_multidata", multidata)
 
-                multidata = zlib.compress(pickle.dumps(multidata), 9)
+                generator_settings = get_settings().generator
+                multidata = compress_multidata(multidata, generator_settings.multidata_codec,
+                                               generator_settings.multidata_compression_level)
 
-                with open(os.path.join(temp_dir, f'{outfilebase}.archipelago'), 'wb') as f:
-                    f.write(bytes([3]))  # version of format
-                    f.write(multidata)
+                archive.writestr(f'{outfilebase}.archipelago', multidata, compressed=True)
 
             output_file_futures.append(pool.submit(write_multidata))
             if not check_accessibility_task.result():
@@ -408,20 +460,16 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
                 if i % 10 == 0 or i == len(output_file_futures):
                     logger.info(f'Generating output files ({i}/{len(output_file_futures)}).')
                 future.result()
+                multiworld.cancellation.check()
 
         if args.spoiler > 1:
             logger.info('Calculating playthrough.')
             multiworld.spoiler.create_playthrough(create_paths=args.spoiler > 2)
 
         if args.spoiler:
-            multiworld.spoiler.to_file(os.path.join(temp_dir, '%s_Spoiler.txt' % outfilebase))
-
-        zipfilename = output_path(f"AP_{multiworld.seed_name}.zip")
-        logger.info(f"Creating final archive at {zipfilename}")
-        with zipfile.ZipFile(zipfilename, mode="w", compression=zipfile.ZIP_DEFLATED,
-                             compresslevel=9) as zf:
-            for file in os.scandir(temp_dir):
-                zf.write(file.path, arcname=file.name)
+            spoiler_path = os.path.join(temp_dir, '%s_Spoiler.txt' % outfilebase)
+            multiworld.spoiler.to_file(spoiler_path)
+            archive.write(spoiler_path, os.path.basename(spoiler_path))
 
     logger.info('Done. Enjoy. Total Time: %s', time.perf_counter() - start)
     return multiworld
@@ -375,6 +375,15 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
                     all_locations[source_slot].add(location_id)
         return all_locations
 
+    def get_scouted(self, slot: int, locations: typing.Iterable[int]
+                    ) -> typing.List[typing.Tuple[int, int, int, int]]:
+        player_locations = self[slot]
+        scouted = []
+        for location_id in locations:
+            item_id, receiving_player, item_flags = player_locations[location_id]
+            scouted.append((item_id, location_id, receiving_player, item_flags))
+        return scouted
+
     def get_checked(self, state: typing.Dict[typing.Tuple[int, int], typing.Set[int]], team: int, slot: int
                     ) -> typing.List[int]:
         checked = state[team, slot]
@@ -11,9 +11,9 @@ from Options import Choice, Range, Toggle
 from worlds.oot import OOTWorld
 from worlds.oot.Cosmetics import patch_cosmetics
 from worlds.oot.Options import cosmetic_options, sfx_options
-from worlds.oot.Rom import Rom, compress_rom_file
+from worlds.oot.Rom import Rom
 from worlds.oot.N64Patch import apply_patch_file
-from worlds.oot.Utils import data_path
+import Utils
 from Utils import local_path
 
 logger = logging.getLogger('OoTAdjuster')
@@ -236,12 +236,8 @@ def adjust(args):
         rom.write_byte(rom.sym('DEATH_LINK'), args.deathlink)
         # Output new file
         path_pieces = os.path.splitext(args.rom)
-        decomp_path = path_pieces[0] + '-adjusted-decomp.n64'
         comp_path = path_pieces[0] + '-adjusted.n64'
-        rom.write_to_file(decomp_path)
-        os.chdir(data_path("Compress"))
-        compress_rom_file(decomp_path, comp_path)
-        os.remove(decomp_path)
+        rom.write_compressed_to_file(comp_path)
     finally:
         if delete_zootdec:
             os.chdir(os.path.split(__file__)[0])
@@ -249,4 +245,5 @@ def adjust(args):
     return comp_path
 
 if __name__ == '__main__':
+    Utils.freeze_support()
     main()
@@ -12,9 +12,8 @@ from CommonClient import CommonContext, server_loop, gui_enabled, \
 import Utils
 from Utils import async_start
 from worlds import network_data_package
-from worlds.oot.Rom import Rom, compress_rom_file
+from worlds.oot.Rom import Rom
 from worlds.oot.N64Patch import apply_patch_file
-from worlds.oot.Utils import data_path
 
 
 CONNECTION_TIMING_OUT_STATUS = "Connection timing out. Please restart your emulator, then restart connector_oot.lua"
@@ -292,7 +291,6 @@ async def run_game(romfile):
 async def patch_and_run_game(apz5_file):
     apz5_file = os.path.abspath(apz5_file)
     base_name = os.path.splitext(apz5_file)[0]
-    decomp_path = base_name + '-decomp.z64'
     comp_path = base_name + '.z64'
     # Load vanilla ROM, patch file, compress ROM
     rom_file_name = Utils.get_options()["oot_options"]["rom_file"]
@@ -306,10 +304,7 @@ async def patch_and_run_game(apz5_file):
                 break
 
     apply_patch_file(rom, apz5_file, sub_file=sub_file)
-    rom.write_to_file(decomp_path)
-    os.chdir(data_path("Compress"))
-    compress_rom_file(decomp_path, comp_path)
-    os.remove(decomp_path)
+    rom.write_compressed_to_file(comp_path)
     async_start(run_game(comp_path))
 
 
@@ -15,7 +15,8 @@ import typing
 from json import loads, dumps
 
 # CommonClient import first to trigger ModuleUpdater
-from CommonClient import CommonContext, server_loop, ClientCommandProcessor, gui_enabled, get_base_parser
+from CommonClient import CommonContext, server_loop, ClientCommandProcessor, gui_enabled, get_base_parser, \
+    PollScheduler
 
 import Utils
 from Utils import async_start
@@ -51,6 +52,11 @@ class SNIClientCommandProcessor(ClientCommandProcessor):
 
         self.output(f"Setting slow mode to {self.ctx.slow_mode}")
 
+    def _cmd_poll_stats(self) -> None:
+        """Show how often SNES memory is being read."""
+        self.output(self.ctx.poll_scheduler.format_metrics())
+        self.ctx.poll_scheduler.reset_metrics()
+
     @mark_raw
     def _cmd_snes(self, snes_options: str = "") -> bool:
         """Connect to a snes. Optionally include network address of a snes to connect to,
@@ -141,6 +147,7 @@ class SNIContext(CommonContext):
 
     hud_message_queue: typing.List[str]  # TODO: str is a guess, is this right?
     death_link_allow_survive: bool
+    poll_scheduler: PollScheduler
 
     def __init__(self, snes_address: str, server_address: str, password: str) -> None:
         super(SNIContext, self).__init__(server_address, password)
@@ -164,6 +171,7 @@ class SNIContext(CommonContext):
         self.awaiting_rom = False
         self.rom = None
         self.prev_rom = None
+        self.poll_scheduler = PollScheduler()
 
     async def connection_closed(self) -> None:
         await super(SNIContext, self).connection_closed()
@@ -528,6 +536,7 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
             "Space": "SNES",
             "Operands": [hex(address)[2:], hex(size)[2:]]
         }
+        start = time.perf_counter()
         try:
             await ctx.snes_socket.send(dumps(GetAddress_Request))
         except ConnectionClosed:
@@ -549,6 +558,7 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
                 await ctx.snes_socket.close()
             return None
 
+        ctx.poll_scheduler.record_read(data, time.perf_counter() - start)
         return data
     finally:
         ctx.snes_request_lock.release()
@@ -599,10 +609,7 @@ async def snes_flush_writes(ctx: SNIContext) -> None:
 async def game_watcher(ctx: SNIContext) -> None:
     perf_counter = time.perf_counter()
     while not ctx.exit_event.is_set():
-        try:
-            await asyncio.wait_for(ctx.watcher_event.wait(), 0.125)
-        except asyncio.TimeoutError:
-            pass
+        await ctx.poll_scheduler.wait(ctx.watcher_event, 0.125)
         ctx.watcher_event.clear()
 
         if not ctx.rom or not ctx.client_handler:
@@ -9,6 +9,7 @@ import itertools
 import subprocess
 import sys
 import pickle
+import time
 import functools
 import io
 import collections
@@ -53,6 +54,9 @@ is_linux = sys.platform.startswith("linux")
 is_macos = sys.platform == "darwin"
 is_windows = sys.platform in ("win32", "cygwin", "msys")
 
+# set before worlds is first imported to only import worlds once their game is looked up, see worlds.world_manifest
+lazy_world_loading = False
+
 
 def int16_as_bytes(value: int) -> typing.List[int]:
     value = value & 0xFFFF
@@ -331,6 +335,12 @@ def get_file_safe_name(name: str) -> str:
     return "".join(c for c in name if c not in '<>:"/\\|?*')
 
 
+def has_data_package_for_checksum(game: str, checksum: str) -> bool:
+    if checksum != get_file_safe_name(checksum):
+        raise ValueError(f"Bad symbols in checksum: {checksum}")
+    return os.path.exists(cache_path("datapackage", get_file_safe_name(game), f"{checksum}.json"))
+
+
 def load_data_package_for_checksum(game: str, checksum: typing.Optional[str]) -> Dict[str, Any]:
     if checksum and game:
         if checksum != get_file_safe_name(checksum):
@@ -442,6 +452,85 @@ def restricted_loads(s):
     return RestrictedUnpickler(io.BytesIO(s)).load()
 
 
+multidata_format_version = 4
+multidata_codecs: typing.Tuple[str, ...] = ("zlib", "lzma", "zstd")  # index is stored in the multidata
+# keys of multidata that get compressed separately from the rest, so all of them can be compressed in parallel
+multidata_sections: typing.Tuple[str, ...] = ("datapackage", "slot_data", "locations", "er_hint_data")
+
+
+def _compress_multidata_section(codec: str, level: int, data: bytes) -> bytes:
+    if codec == "zlib":
+        import zlib
+        return zlib.compress(data, level)
+    if codec == "lzma":
+        import lzma
+        return lzma.compress(data, preset=level)
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Unknown multidata codec {codec}, known codecs are {', '.join(multidata_codecs)}.")
+
+
+def _decompress_multidata_section(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        import zlib
+        return zlib.decompress(data)
+    if codec == "lzma":
+        import lzma
+        return lzma.decompress(data)
+    try:
+        import zstandard
+    except ImportError as e:
+        raise VersionException("Multidata requires the zstandard module to be loaded.") from e
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def compress_multidata(multidata: typing.Dict[str, typing.Any], codec: str = "zlib", level: int = 9) -> bytes:
+    """Encodes multidata into the current .archipelago format,
+    which is the format version byte, the codec index byte, the number of sections and their lengths,
+    followed by each section as compressed pickled dict of some of multidata's keys."""
+    import concurrent.futures
+    import struct
+
+    sections = [{key: value for key, value in multidata.items() if key not in multidata_sections}]
+    sections.extend({key: multidata[key]} for key in multidata_sections if key in multidata)
+    pickled = [pickle.dumps(section, protocol=5) for section in sections]  # pickling holds the GIL, compressing not
+    with concurrent.futures.ThreadPoolExecutor(len(pickled)) as pool:
+        compressed = list(pool.map(functools.partial(_compress_multidata_section, codec, level), pickled))
+    header = bytes([multidata_format_version, multidata_codecs.index(codec)]) + \
+        struct.pack(f"<{len(compressed) + 1}I", len(compressed), *(len(section) for section in compressed))
+    return header + b"".join(compressed)
+
+
+def decompress_multidata(data: bytes) -> typing.Dict[str, typing.Any]:
+    """Decodes multidata of any known .archipelago format version."""
+    import concurrent.futures
+    import struct
+
+    format_version = data[0]
+    if format_version > multidata_format_version:
+        raise VersionException("Incompatible multidata.")
+    if format_version < 4:
+        import zlib
+        return restricted_loads(zlib.decompress(data[1:]))
+    if data[1] >= len(multidata_codecs):
+        raise VersionException("Incompatible multidata codec.")
+    codec = multidata_codecs[data[1]]
+    section_count, = struct.unpack_from("<I", data, 2)
+    offset = 6 + 4 * section_count
+    view = memoryview(data)
+    compressed: typing.List[memoryview] = []
+    for length in struct.unpack_from(f"<{section_count}I", data, 6):
+        compressed.append(view[offset:offset + length])
+        offset += length
+    with concurrent.futures.ThreadPoolExecutor(section_count) as pool:
+        sections = pool.map(functools.partial(_decompress_multidata_section, codec), compressed)
+        multidata: typing.Dict[str, typing.Any] = {}
+        for section in sections:
+            multidata.update(restricted_loads(section))
+    return multidata
+
+
 class ByValue:
     """
     Mixin for enums to pickle value instead of name (restores pre-3.11 behavior). Use as left-most parent.
@@ -572,6 +661,57 @@ class VersionException(Exception):
     pass
 
 
+def get_rss() -> int:
+    """Resident set size of the current process in bytes, or 0 if it cannot be determined."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    # peak instead of current usage, which still catches growth
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+class CancellationToken:
+    """Checked by long-running generation steps, which then abort by raising GenerationCancelled.
+    Can be cancelled from another thread, or expires on its own by deadline or memory usage."""
+    reason: Optional[str] = None
+    memory_check_interval: float = 0.5
+
+    def __init__(self, timeout: Optional[float] = None, max_rss: Optional[int] = None):
+        """
+        :param timeout: seconds from now after which the token expires
+        :param max_rss: resident memory in bytes of the whole process above which the token expires
+        """
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.max_rss = max_rss
+        self._next_memory_check = 0.
+
+    def cancel(self, reason: str = "Generation was cancelled.") -> None:
+        self.reason = reason
+
+    def check(self) -> None:
+        if self.reason is None and (self.deadline or self.max_rss):
+            now = time.monotonic()
+            if self.deadline and now > self.deadline:
+                self.cancel("Allowed time for Generation exceeded, please consider generating locally instead.")
+            elif self.max_rss and now > self._next_memory_check:
+                self._next_memory_check = now + self.memory_check_interval
+                if get_rss() > self.max_rss:
+                    self.cancel("Allowed memory for Generation exceeded, please consider generating locally instead.")
+        if self.reason is not None:
+            raise GenerationCancelled(self.reason)
+
+
 def chaining_prefix(index: int, labels: typing.Tuple[str]) -> str:
     text = ""
     max_label = len(labels) - 1
@@ -23,7 +23,12 @@ app.jinja_env.filters['all'] = all
 
 app.config["SELFHOST"] = True  # application process is in charge of running the websites
 app.config["GENERATORS"] = 8  # maximum concurrent world gens
+# generator processes are replaced once their memory usage grew by this many bytes. Can be set to None to disable.
+app.config["GENERATOR_MAX_RSS_GROWTH"] = 1024 * 1024 * 1024
+# a single generation is cancelled once it grew its process by this many bytes. Can be set to None to disable.
+app.config["GENERATOR_MAX_JOB_MEMORY"] = None
 app.config["SELFLAUNCH"] = True  # application process is in charge of launching Rooms.
+app.config["HOSTERS"] = 8  # maximum concurrent room hosters, each hosting any amount of rooms
 app.config["SELFLAUNCHCERT"] = None  # can point to a SSL Certificate to encrypt Room websocket connections
 app.config["SELFLAUNCHKEY"] = None  # can point to a SSL Certificate Key to encrypt Room websocket connections
 app.config["SELFGEN"] = True  # application process is in charge of scheduling Generations.
@@ -50,6 +55,8 @@ app.config["PONY"] = {
 }
 app.config["MAX_ROLL"] = 20
 app.config["CACHE_TYPE"] = "SimpleCache"
+# estimated bytes of decompressed multidata each process keeps in memory for trackers
+app.config["TRACKER_MULTIDATA_CACHE_SIZE"] = 256 * 1024 * 1024
 app.config["HOST_ADDRESS"] = ""
 app.config["ASSET_RIGHTS"] = False
 
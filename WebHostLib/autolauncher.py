@@ -1,30 +1,23 @@
 from __future__ import annotations
 
+import itertools
 import json
 import logging
 import multiprocessing
-import threading
+import os
+import queue
 import time
+import traceback
 import typing
 from uuid import UUID
 from datetime import timedelta, datetime
 
 from pony.orm import db_session, select, commit
 
-from Utils import restricted_loads
+from Utils import CancellationToken, get_rss, restricted_loads
 from .locker import Locker, AlreadyRunningException
 
 
-def launch_room(room: Room, config: dict):
-    # requires db_session!
-    if room.last_activity >= datetime.utcnow() - timedelta(seconds=room.timeout):
-        multiworld = multiworlds.get(room.id, None)
-        if not multiworld:
-            multiworld = MultiworldInstance(room, config)
-
-        multiworld.start()
-
-
 def handle_generation_success(seed_id):
     logging.info(f"Generation finished for seed {seed_id}")
 
@@ -36,16 +29,12 @@ def handle_generation_failure(result: BaseException):
         logging.exception(e)
 
 
-def launch_generator(pool: multiprocessing.pool.Pool, generation: Generation):
+def launch_generator(pool: GeneratorPool, generation: Generation):
     try:
         meta = json.loads(generation.meta)
         options = restricted_loads(generation.options)
         logging.info(f"Generating {generation.id} for {len(options)} players")
-        pool.apply_async(gen_game, (options,),
-                         {"meta": meta,
-                          "sid": generation.id,
-                          "owner": generation.owner},
-                         handle_generation_success, handle_generation_failure)
+        pool.submit(options, meta, generation.id, generation.owner)
     except Exception as e:
         generation.state = STATE_ERROR
         commit()
@@ -59,6 +48,114 @@ def init_db(pony_config: dict):
     db.generate_mapping()
 
 
+def run_generator(pony_config: dict, jobs: multiprocessing.Queue, events: multiprocessing.Queue,
+                  max_rss_growth: typing.Optional[int], job_time: typing.Optional[float],
+                  max_job_memory: typing.Optional[int], spawned: float):
+    """Generator process main, running generations until memory grew too much or None is received."""
+    init_db(pony_config)
+    # all worlds got imported through .generate while unpickling this function in the spawned process,
+    # so they are loaded before the first job is taken
+    from worlds import AutoWorldRegister
+    import_time = time.time() - spawned
+    logging.info(f"Generator ready with {len(AutoWorldRegister.world_types)} worlds after {import_time:.2f} seconds")
+    base_rss = get_rss()
+    pid = os.getpid()
+    while 1:
+        job = jobs.get()
+        if job is None:
+            break
+        options, meta, sid, owner, submitted = job
+        # import time is only paid by the first generation of each process
+        timings = {"queue_wait": time.time() - submitted, "import": import_time}
+        import_time = 0.
+        events.put((pid, sid, None))
+        cancellation = CancellationToken(job_time, get_rss() + max_job_memory if max_job_memory else None)
+        try:
+            seed_id = gen_game(options, meta=meta, sid=sid, owner=owner, timings=timings, cancellation=cancellation)
+        except BaseException:
+            events.put((pid, sid, traceback.format_exc()))
+        else:
+            events.put((pid, sid, seed_id))
+        if max_rss_growth and get_rss() - base_rss > max_rss_growth:
+            logging.info(f"Generator {pid} grew by more than {max_rss_growth} bytes, recycling.")
+            break
+
+
+class GeneratorPool:
+    """Long-lived generator processes with all worlds imported ahead of time,
+    recycled once their memory usage grows beyond GENERATOR_MAX_RSS_GROWTH."""
+    termination_grace: float = 60
+    """Seconds past JOB_TIME after which a generation that did not cancel itself gets its process terminated."""
+
+    def __init__(self, config: dict):
+        self.ponyconfig = config["PONY"]
+        self.size: int = config["GENERATORS"]
+        self.job_time: typing.Optional[float] = config["JOB_TIME"]
+        self.max_rss_growth: typing.Optional[int] = config["GENERATOR_MAX_RSS_GROWTH"]
+        self.max_job_memory: typing.Optional[int] = config["GENERATOR_MAX_JOB_MEMORY"]
+        # spawn on every platform, forking the threaded WebHost process could copy locks held by other threads
+        self.context = multiprocessing.get_context("spawn")
+        self.jobs = self.context.Queue()
+        self.events = self.context.Queue()
+        self.processes: typing.Dict[int, multiprocessing.Process] = {}
+        # pid -> (generation id, time.monotonic() at start)
+        self.running: typing.Dict[int, typing.Tuple[UUID, float]] = {}
+        self.counter = itertools.count()
+
+    def start(self):
+        self.fill()
+        import threading
+        threading.Thread(target=self.run, name="AP_GeneratorPool", daemon=True).start()
+
+    def submit(self, options: dict, meta: dict, sid: UUID, owner: UUID):
+        # idle generators block on the job queue, so this gets picked up right away if one is free
+        self.jobs.put((options, meta, sid, owner, time.time()))
+
+    def fill(self):
+        for pid, process in list(self.processes.items()):
+            if not process.is_alive():
+                process.join()
+                del self.processes[pid]
+                if pid in self.running:
+                    sid, _ = self.running.pop(pid)
+                    set_generation_error(sid, f"Generator process exited unexpectedly ({process.exitcode}).")
+                    logging.error(f"Generator process exited unexpectedly while generating {sid}.")
+        while len(self.processes) < self.size:
+            process = self.context.Process(
+                target=run_generator, name=f"Generator{next(self.counter)}", daemon=True,
+                args=(self.ponyconfig, self.jobs, self.events, self.max_rss_growth, self.job_time,
+                      self.max_job_memory, time.time()))
+            process.start()
+            self.processes[process.pid] = process
+
+    def run(self):
+        while 1:
+            try:
+                pid, sid, result = self.events.get(timeout=1)
+            except queue.Empty:
+                pass
+            else:
+                if result is None:
+                    self.running[pid] = sid, time.monotonic()
+                else:
+                    self.running.pop(pid, None)
+                    if isinstance(result, str):
+                        logging.error(f"Generation failed for {sid}:\n{result}")
+                    else:
+                        handle_generation_success(result)
+            if self.job_time:
+                timeout = time.monotonic() - self.job_time - self.termination_grace
+                for pid, (sid, started) in list(self.running.items()):
+                    if started < timeout and pid in self.processes:
+                        self.processes[pid].terminate()
+                        self.processes[pid].join()
+                        del self.processes[pid], self.running[pid]
+                        set_generation_error(sid, "Allowed time for Generation exceeded, "
+                                                  "please consider generating locally instead.")
+                        logging.info(f"Generation of {sid} exceeded allowed time.")
+            self.fill()
+
+
 def autohost(config: dict):
     def keep_running():
         try:
@@ -70,18 +167,31 @@ def autohost(config: dict):
                     rooms = Room.select(lambda room: room.owner == UUID(int=0)).delete(bulk=True)
                     seeds = Seed.select(lambda seed: seed.owner == UUID(int=0) and not seed.rooms).delete(bulk=True)
                     slots = Slot.select(lambda slot: not slot.seed).delete(bulk=True)
+                    SlotFile.select(lambda slot_file: not slot_file.slots).delete(bulk=True)
                     # Command gets deleted by ponyorm Cascade Delete, as Room is Required
                 if rooms or seeds or slots:
                     logging.info(f"{rooms} Rooms, {seeds} Seeds and {slots} Slots have been deleted.")
-                run_guardian()
+                for x in range(config["HOSTERS"]):
+                    hoster = MultiworldInstance(config, x)
+                    hosters.append(hoster)
+                    hoster.start()
+
                 while 1:
                     time.sleep(0.1)
+                    for hoster in hosters:
+                        hoster.collect_shut_down_rooms()
+                        if hoster.done():
+                            logging.warning(f"{hoster.name} stopped unexpectedly, restarting it.")
+                            hoster.collect()
+                            hoster.start()
                     with db_session:
                         rooms = select(
                             room for room in Room if
                             room.last_activity >= datetime.utcnow() - timedelta(days=3))
                         for room in rooms:
-                            launch_room(room, config)
+                            # we have to filter twice, as the per-room timeout can't currently be PonyORM transpiled.
+                            if room.last_activity >= datetime.utcnow() - timedelta(seconds=room.timeout):
+                                launch_room(room.id)
 
         except AlreadyRunningException:
             logging.info("Autohost reports as already running, not starting another.")
@@ -90,37 +200,53 @@ def autohost(config: dict):
     threading.Thread(target=keep_running, name="AP_Autohost").start()
 
 
+def notify_command(room_id: UUID):
+    """Wakes up the hoster of the room to apply newly added Commands.
+    Without autohost running in this process, the hoster still picks them up on its next poll."""
+    for hoster in hosters:
+        if room_id in hoster.room_ids:
+            hoster.commands_pending.set()
+
+
+def launch_room(room_id: UUID):
+    for hoster in hosters:
+        if room_id in hoster.room_ids:
+            return  # should already be hosted currently.
+    # pack the room into the least loaded hoster
+    min(hosters, key=lambda hoster: len(hoster.room_ids)).start_room(room_id)
+
+
 def autogen(config: dict):
     def keep_running():
         try:
             with Locker("autogen"):
 
-                with multiprocessing.Pool(config["GENERATORS"], initializer=init_db,
-                                          initargs=(config["PONY"],), maxtasksperchild=10) as generator_pool:
-                    with db_session:
-                        to_start = select(generation for generation in Generation if generation.state == STATE_STARTED)
-
-                        if to_start:
-                            logging.info("Resuming generation")
-                            for generation in to_start:
-                                sid = Seed.get(id=generation.id)
-                                if sid:
-                                    generation.delete()
-                                else:
-                                    launch_generator(generator_pool, generation)
-
-                            commit()
-                        select(generation for generation in Generation if generation.state == STATE_ERROR).delete()
-
-                    while 1:
-                        time.sleep(0.1)
-                        with db_session:
-                            # for update locks the database row(s) during transaction, preventing writes from elsewhere
-                            to_start = select(
-                                generation for generation in Generation
-                                if generation.state == STATE_QUEUED).for_update()
-                            for generation in to_start:
+                generator_pool = GeneratorPool(config)
+                generator_pool.start()
+                with db_session:
+                    to_start = select(generation for generation in Generation if generation.state == STATE_STARTED)
+
+                    if to_start:
+                        logging.info("Resuming generation")
+                        for generation in to_start:
+                            sid = Seed.get(id=generation.id)
+                            if sid:
+                                generation.delete()
+                            else:
                                 launch_generator(generator_pool, generation)
+
+                        commit()
+                    select(generation for generation in Generation if generation.state == STATE_ERROR).delete()
+
+                while 1:
+                    time.sleep(0.1)
+                    with db_session:
+                        # for update locks the database row(s) during transaction, preventing writes from elsewhere
+                        to_start = select(
+                            generation for generation in Generation
+                            if generation.state == STATE_QUEUED).for_update()
+                        for generation in to_start:
+                            launch_generator(generator_pool, generation)
         except AlreadyRunningException:
             logging.info("Autogen reports as already running, not starting another.")
 
@@ -128,33 +254,42 @@ def autogen(config: dict):
     threading.Thread(target=keep_running, name="AP_Autogen").start()
 
 
-multiworlds: typing.Dict[type(Room.id), MultiworldInstance] = {}
-
-
 class MultiworldInstance():
-    def __init__(self, room: Room, config: dict):
-        self.room_id = room.id
+    """A process hosting any number of rooms, sharing static server data between them."""
+    def __init__(self, config: dict, id: int):
+        self.room_ids: typing.Set[UUID] = set()
         self.process: typing.Optional[multiprocessing.Process] = None
-        with guardian_lock:
-            multiworlds[self.room_id] = self
         self.ponyconfig = config["PONY"]
         self.cert = config["SELFLAUNCHCERT"]
         self.key = config["SELFLAUNCHKEY"]
         self.host = config["HOST_ADDRESS"]
+        self.rooms_to_start = multiprocessing.Queue()
+        self.rooms_shutting_down = multiprocessing.Queue()
+        self.commands_pending = multiprocessing.Event()
+        self.name = f"MultiHoster{id}"
 
     def start(self):
         if self.process and self.process.is_alive():
             return False
 
-        logging.info(f"Spinning up {self.room_id}")
+        logging.info(f"Spinning up {self.name}")
         process = multiprocessing.Process(group=None, target=run_server_process,
-                                          args=(self.room_id, self.ponyconfig, get_static_server_data(),
-                                                self.cert, self.key, self.host),
-                                          name="MultiHost")
+                                          args=(self.name, self.ponyconfig, get_static_server_data(),
+                                                self.cert, self.key, self.host,
+                                                self.rooms_to_start, self.rooms_shutting_down,
+                                                self.commands_pending),
+                                          name=self.name)
         process.start()
-        # bind after start to prevent thread sync issues with guardian.
         self.process = process
 
+    def start_room(self, room_id: UUID):
+        self.room_ids.add(room_id)
+        self.rooms_to_start.put(room_id)
+
+    def collect_shut_down_rooms(self):
+        while not self.rooms_shutting_down.empty():
+            self.room_ids.discard(self.rooms_shutting_down.get(block=True, timeout=None))
+
     def stop(self):
         if self.process:
             self.process.terminate()
@@ -166,42 +301,16 @@ class MultiworldInstance():
     def collect(self):
         self.process.join()  # wait for process to finish
         self.process = None
+        # rooms that did not get to shut down cleanly, can be picked up again by any hoster
+        self.room_ids.clear()
+        self.rooms_to_start = multiprocessing.Queue()
+        self.rooms_shutting_down = multiprocessing.Queue()
+        self.commands_pending = multiprocessing.Event()
 
 
-guardian = None
-guardian_lock = threading.Lock()
-
-
-def run_guardian():
-    global guardian
-    global multiworlds
-    with guardian_lock:
-        if not guardian:
-            try:
-                import resource
-            except ModuleNotFoundError:
-                pass  # unix only module
-            else:
-                # Each Server is another file handle, so request as many as we can from the system
-                file_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[1]
-                # set soft limit to hard limit
-                resource.setrlimit(resource.RLIMIT_NOFILE, (file_limit, file_limit))
-
-            def guard():
-                while 1:
-                    time.sleep(1)
-                    done = []
-                    with guardian_lock:
-                        for key, instance in multiworlds.items():
-                            if instance.done():
-                                instance.collect()
-                                done.append(key)
-                        for key in done:
-                            del (multiworlds[key])
-
-            guardian = threading.Thread(name="Guardian", target=guard)
+hosters: typing.List[MultiworldInstance] = []
 
 
-from .models import Room, Generation, STATE_QUEUED, STATE_STARTED, STATE_ERROR, db, Seed, Slot
+from .models import Room, Generation, STATE_QUEUED, STATE_STARTED, STATE_ERROR, db, Seed, Slot, SlotFile
 from .customserver import run_server_process, get_static_server_data
-from .generate import gen_game
+from .generate import gen_game, set_generation_error
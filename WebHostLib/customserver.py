@@ -4,7 +4,11 @@ import asyncio
 import collections
 import datetime
 import functools
+import heapq
+import itertools
 import logging
+import multiprocessing
+import os
 import pickle
 import random
 import socket
@@ -18,10 +22,11 @@ from pony.orm import commit, db_session, select
 
 import Utils
 
-from MultiServer import Context, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, load_server_cert
-from Utils import restricted_loads, cache_argsless
+from MultiServer import Context, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, \
+    load_server_cert, get_saving_second, OperationalError
+from Utils import restricted_loads, cache_argsless, KeyedDefaultDict
 from .locker import Locker
-from .models import Command, GameDataPackage, Room, db
+from .models import Command, GameDataPackage, Room, TrackerSummary, db
 
 
 class CustomClientMessageProcessor(ClientMessageProcessor):
@@ -53,40 +58,160 @@ del MultiServer
 
 class DBCommandProcessor(ServerCommandProcessor):
     def output(self, text: str):
-        logging.info(text)
+        self.ctx.logger.info(text)
+
+
+class SaveScheduler:
+    """Runs the periodic auto save of every room hosted by this process from a single thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.queue: typing.List[typing.Tuple[float, int, WebHostContext]] = []
+        self.rooms: typing.Set[WebHostContext] = set()
+        self.counter = itertools.count()  # tie-breaker, contexts are not orderable
+        self.thread: typing.Optional[threading.Thread] = None
+
+    @staticmethod
+    def get_next_save_time(ctx: WebHostContext) -> float:
+        # time.time() is platform dependent, so using the expensive datetime method instead
+        now = datetime.datetime.now()
+        second = get_saving_second(ctx.seed_name, ctx.auto_save_interval)
+        next_wakeup = (second - now.second - now.microsecond * 0.000001) % ctx.auto_save_interval
+        return time.monotonic() + max(1.0, next_wakeup)
+
+    def add(self, ctx: WebHostContext):
+        with self.lock:
+            self.rooms.add(ctx)
+            heapq.heappush(self.queue, (self.get_next_save_time(ctx), next(self.counter), ctx))
+            if not self.thread:
+                self.thread = threading.Thread(target=self.run, name="AutoSaver", daemon=True)
+                self.thread.start()
+                import atexit
+                atexit.register(self.save_all)  # make sure we save on exit too
+        self.wakeup.set()
+
+    def remove(self, ctx: WebHostContext):
+        with self.lock:
+            self.rooms.discard(ctx)
+
+    def run(self):
+        while 1:
+            with self.lock:
+                timeout = self.queue[0][0] - time.monotonic() if self.queue else None
+            self.wakeup.wait(timeout)
+            self.wakeup.clear()
+            now = time.monotonic()
+            with self.lock:
+                due = []
+                while self.queue and self.queue[0][0] <= now:
+                    due.append(heapq.heappop(self.queue)[2])
+            for ctx in due:
+                if ctx not in self.rooms:
+                    continue  # room shut down, its final save is done by the room itself
+                try:
+                    if ctx.save_dirty:
+                        ctx.logger.debug("Saving via thread.")
+                        ctx._save()
+                except OperationalError as e:
+                    ctx.logger.exception(e)
+                    ctx.logger.info(f"Saving failed. Retry in {ctx.auto_save_interval} seconds.")
+                except Exception as e:
+                    ctx.logger.exception(e)
+                else:
+                    ctx.save_dirty = False
+                with self.lock:
+                    heapq.heappush(self.queue, (self.get_next_save_time(ctx), next(self.counter), ctx))
+
+    def save_all(self):
+        with self.lock:
+            rooms = list(self.rooms)
+        for ctx in rooms:
+            ctx._save(True)
+
+
+save_scheduler = SaveScheduler()
+
+
+class DBCommandListener:
+    """Delivers database Commands to all rooms hosted by this process, using one query for all of them.
+    Polling backs off while no commands arrive. Setting wakeup delivers new commands immediately."""
+    min_interval = 0.5
+    max_interval = 4.0  # commands sent from another process may not wake this one, stay below the old 5s poll
+
+    def __init__(self, wakeup: typing.Optional[threading.Event] = None):
+        self.lock = threading.Lock()
+        self.wakeup = wakeup if wakeup else threading.Event()
+        self.rooms: typing.Dict[typing.Any, typing.Tuple[WebHostContext, DBCommandProcessor]] = {}
+        self.interval = self.min_interval
+        self.thread: typing.Optional[threading.Thread] = None
+
+    def add(self, ctx: WebHostContext):
+        with self.lock:
+            self.rooms[ctx.room_id] = ctx, DBCommandProcessor(ctx)
+            if not self.thread:
+                self.thread = threading.Thread(target=self.run, name="DBCommandListener", daemon=True)
+                self.thread.start()
+        self.wakeup.set()  # pick up commands that were sent while the room was down
+
+    def remove(self, ctx: WebHostContext):
+        with self.lock:
+            self.rooms.pop(ctx.room_id, None)
+
+    def run(self):
+        while 1:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                if self.deliver_commands():
+                    self.interval = self.min_interval
+                else:
+                    self.interval = min(self.interval * 2, self.max_interval)
+            except Exception as e:
+                # keep the listener alive, rooms would not get any commands anymore otherwise
+                logging.exception(e)
+                self.interval = self.max_interval
+
+    @db_session
+    def deliver_commands(self) -> int:
+        with self.lock:
+            room_ids = list(self.rooms)
+        if not room_ids:
+            return 0
+        commands = select(command for command in Command if command.room.id in room_ids)[:]
+        for command in commands:
+            with self.lock:
+                ctx, cmdprocessor = self.rooms.get(command.room.id, (None, None))
+            if ctx:
+                ctx.main_loop.call_soon_threadsafe(cmdprocessor, command.commandtext)
+                command.delete()
+        commit()
+        return len(commands)
 
 
 class WebHostContext(Context):
     room_id: int
+    tracker_activity_interval = 60.  # seconds between publishing TrackerSummary only for changed activity timers
 
-    def __init__(self, static_server_data: dict):
+    def __init__(self, static_server_data: dict, logger: logging.Logger):
         # static server data is used during _load_game_data to load required data,
         # without needing to import worlds system, which takes quite a bit of memory
         self.static_server_data = static_server_data
-        super(WebHostContext, self).__init__("", 0, "", "", 1, 40, True, "enabled", "enabled", "enabled", 0, 2)
+        super(WebHostContext, self).__init__("", 0, "", "", 1, 40, True, "enabled", "enabled", "enabled", 0, 2,
+                                             logger=logger)
         del self.static_server_data
         self.main_loop = asyncio.get_running_loop()
         self.video = {}
         self.tags = ["AP", "WebHost"]
+        self.tracker_progress: bytes = b""  # progress of the last published TrackerSummary, without the timers
+        self.tracker_summary_time = 0.  # time.monotonic() of the last published TrackerSummary
 
     def _load_game_data(self):
         for key, value in self.static_server_data.items():
+            # NOTE: these are shared by all rooms of this process, so they have to be copied before being modified
             setattr(self, key, value)
         self.non_hintable_names = collections.defaultdict(frozenset, self.non_hintable_names)
 
-    def listen_to_db_commands(self):
-        cmdprocessor = DBCommandProcessor(self)
-
-        while not self.exit_event.is_set():
-            with db_session:
-                commands = select(command for command in Command if command.room.id == self.room_id)
-                if commands:
-                    for command in commands:
-                        self.main_loop.call_soon_threadsafe(cmdprocessor, command.commandtext)
-                        command.delete()
-                    commit()
-            time.sleep(5)
-
     @db_session
     def load(self, room_id: int):
         self.room_id = room_id
@@ -97,18 +222,39 @@ class WebHostContext(Context):
             self.port = get_random_port()
 
         multidata = self.decompress(room.seed.multidata)
+        if "datapackage" not in multidata:
+            # rolled before data packages were embedded, needs all of the static data
+            return self._load(multidata, {}, True)
+
         game_data_packages = {}
-        for game in list(multidata.get("datapackage", {})):
+        static_gamespackage = self.gamespackage  # shared across all rooms of this process
+        static_item_name_groups = self.item_name_groups
+        static_location_name_groups = self.location_name_groups
+        # only reference the games of this room, _load may modify these
+        self.gamespackage = {"Archipelago": static_gamespackage["Archipelago"]}
+        self.item_name_groups = {"Archipelago": static_item_name_groups.get("Archipelago", {})}
+        self.location_name_groups = {"Archipelago": static_location_name_groups.get("Archipelago", {})}
+
+        for game in list(multidata["datapackage"]):
             game_data = multidata["datapackage"][game]
             if "checksum" in game_data:
-                if self.gamespackage.get(game, {}).get("checksum") == game_data["checksum"]:
-                    # non-custom. remove from multidata
+                if static_gamespackage.get(game, {}).get("checksum") == game_data["checksum"]:
+                    # non-custom. remove from multidata and use static data
                     # games package could be dropped from static data once all rooms embed data package
                     del multidata["datapackage"][game]
                 else:
                     row = GameDataPackage.get(checksum=game_data["checksum"])
                     if row:  # None if rolled on >= 0.3.9 but uploaded to <= 0.3.8. multidata should be complete
                         game_data_packages[game] = Utils.restricted_loads(row.data)
+                    continue
+            self.gamespackage[game] = static_gamespackage.get(game, {})
+            self.item_name_groups[game] = static_item_name_groups.get(game, {})
+            self.location_name_groups[game] = static_location_name_groups.get(game, {})
+
+        if multidata["datapackage"]:
+            # custom data packages may reuse ids of other games, so this room gets its own name lookups
+            self.item_names = KeyedDefaultDict(lambda code: f'Unknown item (ID:{code})')
+            self.location_names = KeyedDefaultDict(lambda code: f'Unknown location (ID:{code})')
 
         return self._load(multidata, game_data_packages, True)
 
@@ -120,12 +266,31 @@ class WebHostContext(Context):
             if savegame_data:
                 self.set_save(restricted_loads(Room.get(id=self.room_id).multisave))
             self._start_async_saving()
-        threading.Thread(target=self.listen_to_db_commands, daemon=True).start()
+
+    def _start_async_saving(self):
+        save_scheduler.add(self)
+
+    def _stop_async_saving(self):
+        save_scheduler.remove(self)
 
     @db_session
     def _save(self, exit_save: bool = False) -> bool:
         room = Room.get(id=self.room_id)
-        room.multisave = pickle.dumps(self.get_save())
+        savegame = self.get_save()
+        room.multisave = pickle.dumps(savegame)
+        tracker_summary = get_tracker_summary(savegame)
+        client_activity_timers = tracker_summary.pop("client_activity_timers")
+        tracker_progress = pickle.dumps(tracker_summary)
+        # activity timers change on every save, so on their own they only get published every so often
+        if tracker_progress != self.tracker_progress or \
+                time.monotonic() - self.tracker_summary_time >= self.tracker_activity_interval:
+            tracker_summary["client_activity_timers"] = client_activity_timers
+            if room.tracker_summary:
+                room.tracker_summary.data = pickle.dumps(tracker_summary)
+            else:
+                TrackerSummary(room=room, data=pickle.dumps(tracker_summary))
+            self.tracker_progress = tracker_progress
+            self.tracker_summary_time = time.monotonic()
         # saving only occurs on activity, so we can "abuse" this information to mark this as last_activity
         if not exit_save:  # we don't want to count a shutdown as activity, which would restart the server again
             room.last_activity = datetime.datetime.utcnow()
@@ -137,6 +302,20 @@ class WebHostContext(Context):
         return d
 
 
+def get_tracker_summary(savegame: dict) -> dict:
+    """Condenses a room's save into what multiworld trackers display,
+    so they don't have to unpickle the whole save."""
+    return {
+        "location_checks_count": {team_slot: len(checks) for team_slot, checks
+                                  in savegame.get("location_checks", {}).items()},
+        "client_game_state": savegame.get("client_game_state", {}),
+        "hints": savegame.get("hints", {}),
+        "name_aliases": savegame.get("name_aliases", {}),
+        "video": savegame.get("video", []),
+        "client_activity_timers": savegame.get("client_activity_timers", ()),
+    }
+
+
 def get_random_port():
     return random.randint(49152, 65535)
 
@@ -159,24 +338,65 @@ def get_static_server_data() -> dict:
     return data
 
 
-def run_server_process(room_id, ponyconfig: dict, static_server_data: dict,
+def set_up_logging(room_id) -> logging.Logger:
+    """Sets up a logger writing to the room's own log file, as several rooms share one process and root logger."""
+    logger = logging.getLogger(f"RoomLogger {room_id}")
+    # this *should* be empty, but just in case.
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+    logger.propagate = False
+    log_folder = Utils.user_path("logs")
+    os.makedirs(log_folder, exist_ok=True)
+    file_handler = logging.FileHandler(os.path.join(log_folder, f"{room_id}.txt"), "a", encoding="utf-8-sig")
+    file_handler.setFormatter(logging.Formatter("[%(asctime)s]: %(message)s"))
+    logger.setLevel(logging.INFO)
+    logger.addHandler(file_handler)
+    return logger
+
+
+def tear_down_logging(logger: logging.Logger):
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                        cert_file: typing.Optional[str], cert_key_file: typing.Optional[str],
-                       host: str):
+                       host: str, rooms_to_run: multiprocessing.Queue, rooms_shutting_down: multiprocessing.Queue,
+                       commands_pending: typing.Optional[multiprocessing.Event] = None):
+    """Hosts every room received through rooms_to_run in this process, sharing static_server_data between them.
+    Room ids are put into rooms_shutting_down once the room has stopped.
+    Setting commands_pending makes the rooms check for new Commands right away."""
+    Utils.init_logging(name)
+    try:
+        import resource
+    except ModuleNotFoundError:
+        pass  # unix only module
+    else:
+        # Each Server is another file handle, so request as many as we can from the system
+        file_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[1]
+        # set soft limit to hard limit
+        resource.setrlimit(resource.RLIMIT_NOFILE, (file_limit, file_limit))
+        del resource, file_limit
+
     # establish DB connection for multidata and multisave
     db.bind(**ponyconfig)
     db.generate_mapping(check_tables=False)
 
-    async def main():
-        if "worlds" in sys.modules:
-            raise Exception("Worlds system should not be loaded in the custom server.")
-
-        import gc
-        Utils.init_logging(str(room_id), write_mode="a")
-        ctx = WebHostContext(static_server_data)
-        ctx.load(room_id)
-        ctx.init_save()
-        ssl_context = load_server_cert(cert_file, cert_key_file) if cert_file else None
-        gc.collect()  # free intermediate objects used during setup
+    if "worlds" in sys.modules:
+        raise Exception("Worlds system should not be loaded in the custom server.")
+
+    import gc
+    ssl_context = load_server_cert(cert_file, cert_key_file) if cert_file else None
+    del cert_file, cert_key_file, ponyconfig
+    gc.collect()  # free intermediate objects used during setup
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    command_listener = DBCommandListener(commands_pending)
+
+    async def host_room(ctx: WebHostContext):
         try:
             ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, ctx.port, ssl=ssl_context)
 
@@ -195,36 +415,82 @@ def run_server_process(room_id, ponyconfig: dict, static_server_data: dict,
             elif wssocket.family == socket.AF_INET:
                 port = socketname[1]
         if port:
-            logging.info(f'Hosting game at {host}:{port}')
+            ctx.logger.info(f'Hosting game at {host}:{port}')
             with db_session:
                 room = Room.get(id=ctx.room_id)
                 room.last_port = port
         else:
-            logging.exception("Could not determine port. Likely hosting failure.")
+            ctx.logger.exception("Could not determine port. Likely hosting failure.")
         with db_session:
-            ctx.auto_shutdown = Room.get(id=room_id).timeout
+            ctx.auto_shutdown = Room.get(id=ctx.room_id).timeout
         ctx.shutdown_task = asyncio.create_task(auto_shutdown(ctx, []))
-        await ctx.shutdown_task
+        try:
+            await ctx.shutdown_task
+        except asyncio.CancelledError:
+            if not ctx.exit_event.is_set():
+                raise
+            # /exit cancels the shutdown task
 
         # ensure auto launch is on the same page in regard to room activity.
         with db_session:
             room: Room = Room.get(id=ctx.room_id)
             room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(seconds=room.timeout + 60)
 
-        logging.info("Shutting down")
+        ctx.logger.info("Shutting down")
 
-    with Locker(room_id):
+    async def start_room(room_id):
+        logger = set_up_logging(room_id)
+        ctx: typing.Optional[WebHostContext] = None
         try:
-            asyncio.run(main())
-        except (KeyboardInterrupt, SystemExit):
-            with db_session:
-                room = Room.get(id=room_id)
-                # ensure the Room does not spin up again on its own, minute of safety buffer
-                room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(minutes=1, seconds=room.timeout)
+            with Locker(f"RoomLocker {room_id}"):
+                try:
+                    ctx = WebHostContext(static_server_data, logger)
+                    ctx.load(room_id)
+                    ctx.init_save()
+                    command_listener.add(ctx)
+                    await host_room(ctx)
+                except (KeyboardInterrupt, SystemExit):
+                    with db_session:
+                        room = Room.get(id=room_id)
+                        # ensure the Room does not spin up again on its own, minute of safety buffer
+                        room.last_activity = datetime.datetime.utcnow() - \
+                            datetime.timedelta(minutes=1, seconds=room.timeout)
+                    raise
+                except Exception:
+                    logger.exception(f"Exception while hosting room {room_id}")
+                    with db_session:
+                        room = Room.get(id=room_id)
+                        room.last_port = -1
+                        # ensure the Room does not spin up again on its own, minute of safety buffer
+                        room.last_activity = datetime.datetime.utcnow() - \
+                            datetime.timedelta(minutes=1, seconds=room.timeout)
+                finally:
+                    if ctx:
+                        command_listener.remove(ctx)
+                        ctx.exit_event.set()
+                        if ctx.server and hasattr(ctx.server, "ws_server"):
+                            ctx.server.ws_server.close()
+                        if ctx.saving:
+                            ctx._stop_async_saving()
+                            ctx._save(True)
         except Exception:
-            with db_session:
-                room = Room.get(id=room_id)
-                room.last_port = -1
-                # ensure the Room does not spin up again on its own, minute of safety buffer
-                room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(minutes=1, seconds=room.timeout)
-            raise
+            logging.exception(f"Room {room_id} could not be hosted.")
+        finally:
+            tear_down_logging(logger)
+            del ctx
+            gc.collect()  # the room's multidata can be quite large
+            rooms_shutting_down.put(room_id)
+
+    class Starter(threading.Thread):
+        def run(self):
+            while 1:
+                next_room = rooms_to_run.get(block=True, timeout=None)
+                asyncio.run_coroutine_threadsafe(start_room(next_room), loop)
+                logging.info(f"Starting room {next_room} on {name}.")
+
+    starter = Starter(name="RoomStarter", daemon=True)
+    starter.start()
+    try:
+        loop.run_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
@@ -1,9 +1,9 @@
-import concurrent.futures
 import json
 import os
 import pickle
 import random
 import tempfile
+import time
 import zipfile
 from collections import Counter
 from typing import Any, Dict, List, Optional, Union
@@ -14,7 +14,7 @@ from pony.orm import commit, db_session
 from BaseClasses import get_seed, seeddigits
 from Generate import PlandoOptions, handle_name
 from Main import main as ERmain
-from Utils import __version__
+from Utils import CancellationToken, GenerationCancelled, __version__
 from WebHostLib import app
 from worlds.alttp.EntranceRandomizer import parse_arguments
 from .check import get_yaml_data, roll_options
@@ -101,14 +101,23 @@ def generate(race=False):
     return render_template("generate.html", race=race, version=__version__)
 
 
-def gen_game(gen_options: dict, meta: Optional[Dict[str, Any]] = None, owner=None, sid=None):
+def gen_game(gen_options: dict, meta: Optional[Dict[str, Any]] = None, owner=None, sid=None,
+             timings: Optional[Dict[str, float]] = None, cancellation: Optional[CancellationToken] = None):
     if not meta:
         meta: Dict[str, Any] = {}
+    if timings is None:
+        timings = {}
+    if cancellation is None:
+        cancellation = CancellationToken(app.config["JOB_TIME"])
 
     meta.setdefault("server_options", {}).setdefault("hint_cost", 10)
     race = meta.setdefault("generator_options", {}).setdefault("race", False)
 
-    def task():
+    if sid and timings:
+        record_generation_timings(sid, timings)
+
+    try:
+        start = time.perf_counter()
         target = tempfile.TemporaryDirectory()
         playercount = len(gen_options)
         seed = get_seed()
@@ -147,39 +156,41 @@ def gen_game(gen_options: dict, meta: Optional[Dict[str, Any]] = None, owner=Non
             erargs.name[player] = handle_name(erargs.name[player], player, name_counter)
         if len(set(erargs.name.values())) != len(erargs.name):
             raise Exception(f"Names have to be unique. Names: {Counter(erargs.name.values())}")
-        ERmain(erargs, seed, baked_server_options=meta["server_options"])
+        ERmain(erargs, seed, baked_server_options=meta["server_options"], cancellation=cancellation)
+        timings["generation"] = time.perf_counter() - start
 
-        return upload_to_db(target.name, sid, owner, race)
-    thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-    thread = thread_pool.submit(task)
-
-    try:
-        return thread.result(app.config["JOB_TIME"])
-    except concurrent.futures.TimeoutError as e:
-        if sid:
-            with db_session:
-                gen = Generation.get(id=sid)
-                if gen is not None:
-                    gen.state = STATE_ERROR
-                    meta = json.loads(gen.meta)
-                    meta["error"] = (
-                            "Allowed time for Generation exceeded, please consider generating locally instead. " +
-                            e.__class__.__name__ + ": " + str(e))
-                    gen.meta = json.dumps(meta)
-                    commit()
+        return upload_to_db(target.name, sid, owner, race, timings)
     except BaseException as e:
         if sid:
-            with db_session:
-                gen = Generation.get(id=sid)
-                if gen is not None:
-                    gen.state = STATE_ERROR
-                    meta = json.loads(gen.meta)
-                    meta["error"] = (e.__class__.__name__ + ": " + str(e))
-                    gen.meta = json.dumps(meta)
-                    commit()
+            error = str(e) if isinstance(e, GenerationCancelled) else e.__class__.__name__ + ": " + str(e)
+            set_generation_error(sid, error, timings)
         raise
 
 
+def record_generation_timings(sid: UUID, timings: Dict[str, float]):
+    """Adds timings, in seconds, to the meta of a pending Generation."""
+    with db_session:
+        gen = Generation.get(id=sid)
+        if gen is not None:
+            meta = json.loads(gen.meta)
+            meta.setdefault("timings", {}).update(timings)
+            gen.meta = json.dumps(meta)
+            commit()
+
+
+def set_generation_error(sid: UUID, error: str, timings: Optional[Dict[str, float]] = None):
+    with db_session:
+        gen = Generation.get(id=sid)
+        if gen is not None:
+            gen.state = STATE_ERROR
+            meta = json.loads(gen.meta)
+            meta["error"] = error
+            if timings:
+                meta.setdefault("timings", {}).update(timings)
+            gen.meta = json.dumps(meta)
+            commit()
+
+
 @app.route('/wait/<suuid:seed>')
 def wait_seed(seed: UUID):
     seed_id = seed
@@ -195,13 +206,14 @@ def wait_seed(seed: UUID):
     return render_template("waitSeed.html", seed_id=seed_id)
 
 
-def upload_to_db(folder, sid, owner, race):
+def upload_to_db(folder, sid, owner, race, timings: Optional[Dict[str, float]] = None):
     for file in os.listdir(folder):
         file = os.path.join(folder, file)
         if file.endswith(".zip"):
             with db_session:
                 with zipfile.ZipFile(file) as zfile:
-                    res = upload_zip_to_db(zfile, owner, {"race": race}, sid)
+                    meta = {"race": race, "timings": timings} if timings else {"race": race}
+                    res = upload_zip_to_db(zfile, owner, meta, sid)
                 if type(res) == "str":
                     raise Exception(res)
                 elif res:
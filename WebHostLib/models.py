@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Optional as TypingOptional, Set as TypingSet
 from uuid import UUID, uuid4
-from pony.orm import Database, PrimaryKey, Required, Set, Optional, buffer, LongStr
+from pony.orm import Database, PrimaryKey, Required, Set, Optional, buffer, LongStr, exists, select
 
 db = Database()
 
@@ -13,10 +14,26 @@ class Slot(db.Entity):
     id = PrimaryKey(int, auto=True)
     player_id = Required(int)
     player_name = Required(str)
-    data = Optional(bytes, lazy=True)
+    data = Optional(bytes, lazy=True)  # only used by slots uploaded before SlotFile was introduced
+    files = Set('SlotFile')  # holds at most one, as a Set keeps the Slot table of existing databases compatible
     seed = Optional('Seed')
     game = Required(str)
 
+    def has_data(self) -> bool:
+        return not self.files.is_empty() or bool(self.data)
+
+    def get_data(self) -> TypingOptional[bytes]:
+        for slot_file in self.files:
+            return slot_file.data
+        return self.data
+
+
+class SlotFile(db.Entity):
+    """Patch or other per slot file, stored once for all slots that have the exact same content."""
+    checksum = PrimaryKey(str)  # sha256 hexdigest of data
+    data = Required(bytes, lazy=True)
+    slots = Set(Slot)
+
 
 class Room(db.Entity):
     id = PrimaryKey(UUID, default=uuid4)
@@ -31,6 +48,7 @@ class Room(db.Entity):
     tracker = Optional(UUID, index=True)
     # Port special value -1 means the server errored out. Another attempt can be made with a page refresh
     last_port = Optional(int, default=lambda: 0)
+    tracker_summary = Optional('TrackerSummary', cascade_delete=True)
 
 
 class Seed(db.Entity):
@@ -43,6 +61,11 @@ class Seed(db.Entity):
     spoiler = Optional(LongStr, lazy=True)
     meta = Required(LongStr, default=lambda: "{\"race\": false}")  # additional meta information/tags
 
+    def get_slot_ids_with_data(self) -> TypingSet[int]:
+        """Same as Slot.has_data() for all slots of the seed, in one query."""
+        return set(select(slot.id for slot in Slot
+                          if slot.seed == self and (exists(slot.files) or slot.data != b"")))
+
 
 class Command(db.Entity):
     id = PrimaryKey(int, auto=True)
@@ -58,6 +81,11 @@ class Generation(db.Entity):
     state = Required(int, default=0, index=True)
 
 
+class TrackerSummary(db.Entity):
+    room = PrimaryKey(Room)
+    data = Required(bytes)  # pickled per slot progress, written alongside Room.multisave
+
+
 class GameDataPackage(db.Entity):
     checksum = PrimaryKey(str)
     data = Required(bytes)
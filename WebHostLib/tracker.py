@@ -1,5 +1,7 @@
 import datetime
 import collections
+import pickle
+import threading
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, NamedTuple, Counter
 from uuid import UUID
@@ -11,12 +13,71 @@ from MultiServer import Context, get_saving_second
 from NetUtils import ClientStatus, Hint, NetworkItem, NetworkSlot, SlotType
 from Utils import restricted_loads, KeyedDefaultDict
 from . import app, cache
-from .models import GameDataPackage, Room
+from .customserver import get_tracker_summary
+from .models import GameDataPackage, Room, Seed
 
 # Multisave is currently updated, at most, every minute.
 TRACKER_CACHE_TIMEOUT_IN_SECONDS = 60
 
-_multidata_cache = {}
+# multidata keys any tracker reads, everything else is dropped before caching
+TRACKER_MULTIDATA_KEYS = {"seed_name", "slot_data", "slot_info", "locations", "precollected_items", "datapackage",
+                          "checks_in_area"}
+
+
+class MultidataCache:
+    """Least recently used cache of the tracker relevant parts of multidata by seed id.
+    Bound by the estimated decompressed size of its entries, configured by TRACKER_MULTIDATA_CACHE_SIZE.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: "collections.OrderedDict[UUID, Tuple[Dict[str, Any], int]]" = collections.OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        return app.config["TRACKER_MULTIDATA_CACHE_SIZE"]
+
+    def get(self, seed: Seed) -> Dict[str, Any]:
+        """Retrieves the trimmed multidata of a seed, only loading it from the database if it's not cached."""
+        with self.lock:
+            entry = self.entries.get(seed.id, None)
+            if entry:
+                self.entries.move_to_end(seed.id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        decompressed_multidata = Context.decompress(seed.multidata)
+        multidata = {key: value for key, value in decompressed_multidata.items() if key in TRACKER_MULTIDATA_KEYS}
+        size = len(pickle.dumps(multidata, pickle.HIGHEST_PROTOCOL))
+        with self.lock:
+            max_size = self.max_size
+            if seed.id not in self.entries and size <= max_size:
+                self.entries[seed.id] = multidata, size
+                self.size += size
+                while self.size > max_size:
+                    _, (_, evicted_size) = self.entries.popitem(last=False)
+                    self.size -= evicted_size
+                    self.evictions += 1
+        return multidata
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size": self.size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_multidata_cache = MultidataCache()
 _multiworld_trackers: Dict[str, Callable] = {}
 _player_trackers: Dict[str, Callable] = {}
 
@@ -49,14 +110,16 @@ class TrackerData:
     """
     room: Room
     _multidata: Dict[str, Any]
-    _multisave: Dict[str, Any]
+    _multisave: Optional[Dict[str, Any]]
+    _summary: Optional[Dict[str, Any]]
     _tracker_cache: Dict[str, Any]
 
     def __init__(self, room: Room):
         """Initialize a new RoomMultidata object for the current room."""
         self.room = room
-        self._multidata = Context.decompress(room.seed.multidata)
-        self._multisave = restricted_loads(room.multisave) if room.multisave else {}
+        self._multidata = _multidata_cache.get(room.seed)
+        self._multisave = None
+        self._summary = None
         self._tracker_cache = {}
 
         self.item_name_to_id: Dict[str, Dict[str, int]] = {}
@@ -80,6 +143,24 @@ class TrackerData:
             self.item_name_to_id[game] = game_package["item_name_to_id"]
             self.location_name_to_id[game] = game_package["item_name_to_id"]
 
+    def _get_multisave(self) -> Dict[str, Any]:
+        """Loads the full save of the room on first use. Only needed for per player details."""
+        if self._multisave is None:
+            self._multisave = restricted_loads(self.room.multisave) if self.room.multisave else {}
+        return self._multisave
+
+    def _get_summary(self) -> Dict[str, Any]:
+        """Loads the per slot progress published by the room on first use.
+        Rooms that have not saved since it was introduced, or saved an older layout of it,
+        get it condensed from their full save instead.
+        """
+        if self._summary is None:
+            if self.room.tracker_summary:
+                self._summary = restricted_loads(self.room.tracker_summary.data)
+            if self._summary is None or self._summary.keys() != get_tracker_summary({}).keys():
+                self._summary = get_tracker_summary(self._get_multisave())
+        return self._summary
+
     def get_seed_name(self) -> str:
         """Retrieves the seed name."""
         return self._multidata["seed_name"]
@@ -110,7 +191,11 @@ class TrackerData:
 
     def get_player_checked_locations(self, team: int, player: int) -> Set[int]:
         """Retrieves the set of all locations marked complete by this player."""
-        return self._multisave.get("location_checks", {}).get((team, player), set())
+        return self._get_multisave().get("location_checks", {}).get((team, player), set())
+
+    def get_player_checked_locations_count(self, team: int, player: int) -> int:
+        """Retrieves the number of locations marked complete by this player."""
+        return self._get_summary()["location_checks_count"].get((team, player), 0)
 
     @_cache_results
     def get_player_missing_locations(self, team: int, player: int) -> Set[int]:
@@ -119,7 +204,7 @@ class TrackerData:
 
     def get_player_received_items(self, team: int, player: int) -> List[NetworkItem]:
         """Returns all items received to this player in order of received."""
-        return self._multisave.get("received_items", {}).get((team, player, True), [])
+        return self._get_multisave().get("received_items", {}).get((team, player, True), [])
 
     @_cache_results
     def get_player_inventory_counts(self, team: int, player: int) -> collections.Counter:
@@ -137,7 +222,7 @@ class TrackerData:
     @_cache_results
     def get_player_hints(self, team: int, player: int) -> Set[Hint]:
         """Retrieves a set of all hints relevant for a particular player."""
-        return self._multisave.get("hints", {}).get((team, player), set())
+        return self._get_summary()["hints"].get((team, player), set())
 
     @_cache_results
     def get_player_last_activity(self, team: int, player: int) -> Optional[datetime.timedelta]:
@@ -148,11 +233,11 @@ class TrackerData:
 
     def get_player_client_status(self, team: int, player: int) -> ClientStatus:
         """Retrieves the ClientStatus of a particular player."""
-        return self._multisave.get("client_game_state", {}).get((team, player), ClientStatus.CLIENT_UNKNOWN)
+        return self._get_summary()["client_game_state"].get((team, player), ClientStatus.CLIENT_UNKNOWN)
 
     def get_player_alias(self, team: int, player: int) -> Optional[str]:
         """Returns the alias of a particular player, if any."""
-        return self._multisave.get("name_aliases", {}).get((team, player), None)
+        return self._get_summary()["name_aliases"].get((team, player), None)
 
     @_cache_results
     def get_team_completed_worlds_count(self) -> Dict[int, int]:
@@ -186,7 +271,7 @@ class TrackerData:
     def get_team_locations_checked_count(self) -> Dict[int, int]:
         """Retrieves a dictionary of checked player locations each team has."""
         return {
-            team: sum(len(self.get_player_checked_locations(team, player)) for player in players)
+            team: sum(self.get_player_checked_locations_count(team, player) for player in players)
             for team, players in self.get_all_players().items()
         }
 
@@ -241,7 +326,7 @@ class TrackerData:
     def get_room_locations_complete(self) -> Dict[TeamPlayer, int]:
         """Retrieves a dictionary of all locations complete per player."""
         return {
-            (team, player): len(self.get_player_checked_locations(team, player))
+            (team, player): self.get_player_checked_locations_count(team, player)
             for team, players in self.get_all_players().items() for player in players
         }
 
@@ -274,7 +359,7 @@ class TrackerData:
         """
         last_activity: Dict[TeamPlayer, datetime.timedelta] = {}
         now = datetime.datetime.utcnow()
-        for (team, player), timestamp in self._multisave.get("client_activity_timers", []):
+        for (team, player), timestamp in self._get_summary()["client_activity_timers"]:
             last_activity[team, player] = now - datetime.datetime.utcfromtimestamp(timestamp)
 
         return last_activity
@@ -286,7 +371,7 @@ class TrackerData:
         Only supported platforms are Twitch and YouTube.
         """
         video_feeds = {}
-        for (team, player), video_data in self._multisave.get("video", []):
+        for (team, player), video_data in self._get_summary()["video"]:
             video_feeds[team, player] = video_data
 
         return video_feeds
@@ -1,10 +1,10 @@
 import base64
+import hashlib
 import json
 import pickle
 import typing
 import uuid
 import zipfile
-import zlib
 
 from io import BytesIO
 from flask import request, flash, redirect, url_for, session, render_template, abort
@@ -15,12 +15,12 @@ import schema
 
 import MultiServer
 from NetUtils import SlotType
-from Utils import VersionException, __version__
+from Utils import VersionException, __version__, compress_multidata
 from worlds import GamesPackage
 from worlds.Files import AutoPatchRegister
 from worlds.AutoWorld import data_package_checksum
 from . import app
-from .models import Seed, Room, Slot, GameDataPackage
+from .models import Seed, Room, Slot, SlotFile, GameDataPackage
 
 banned_extensions = (".sfc", ".z64", ".n64", ".nes", ".smc", ".sms", ".gb", ".gbc", ".gba")
 allowed_options_extensions = (".yaml", ".json", ".yml", ".txt", ".zip")
@@ -48,7 +48,7 @@ def banned_file(filename: str) -> bool:
     return filename.endswith(banned_extensions)
 
 
-def process_multidata(compressed_multidata, files={}):
+def process_multidata(compressed_multidata, files: typing.Dict[int, str] = {}):
     game_data: GamesPackage
 
     decompressed_multidata = MultiServer.Context.decompress(compressed_multidata)
@@ -85,16 +85,41 @@ def process_multidata(compressed_multidata, files={}):
             # Ignore Player Groups (e.g. item links)
             if slot_info.type == SlotType.group:
                 continue
-            slots.add(Slot(data=files.get(slot, None),
+            slots.add(Slot(files=[SlotFile[files[slot]]] if slot in files else [],
                            player_name=slot_info.name,
                            player_id=slot,
                            game=slot_info.game))
         flush()  # commit slots
 
-    compressed_multidata = compressed_multidata[0:1] + zlib.compress(pickle.dumps(decompressed_multidata), 9)
+    compressed_multidata = compress_multidata(decompressed_multidata)
     return slots, compressed_multidata
 
 
+def store_slot_file(data: bytes) -> typing.Tuple[str, bool]:
+    """Stores data by its checksum, reusing an already stored file with identical content.
+    Returns the checksum and whether a new file was stored."""
+    checksum = hashlib.sha256(data).hexdigest()
+    if SlotFile.exists(checksum=checksum):
+        return checksum, False
+    SlotFile(checksum=checksum, data=data)
+    try:
+        commit()  # commit slot file, so rollbacks during process_multidata keep it
+    except TransactionIntegrityError:
+        rollback()  # stored concurrently
+        return checksum, False
+    return checksum, True
+
+
+def delete_slot_files(checksums: typing.Iterable[str]) -> None:
+    """Removes slot files stored by a failed upload, unless a slot has started using them in the meantime."""
+    rollback()
+    for checksum in checksums:
+        slot_file = SlotFile.get(checksum=checksum)
+        if slot_file and not slot_file.slots:
+            slot_file.delete()
+    commit()
+
+
 def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, sid=None):
     if not owner:
         owner = session["_id"]
@@ -105,22 +130,19 @@ def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, s
         return
 
     spoiler = ""
-    files = {}
+    files: typing.Dict[int, str] = {}
     multidata = None
+    slot_file_infos: typing.List[zipfile.ZipInfo] = []
 
-    # Load files.
+    # Check file names and load multidata, before anything gets stored.
     for file in infolist:
-        handler = AutoPatchRegister.get_handler(file.filename)
         if banned_file(file.filename):
             return "Uploaded data contained a rom file, which is likely to contain copyrighted material. " \
                    "Your file was deleted."
 
-        # AP Container
-        elif handler:
-            data = zfile.open(file, "r").read()
-            patch = handler(BytesIO(data))
-            patch.read()
-            files[patch.player] = data
+        # AP Container, Minecraft
+        elif AutoPatchRegister.get_handler(file.filename) or file.filename.endswith(".apmc"):
+            slot_file_infos.append(file)
 
         # Spoiler
         elif file.filename.endswith(".txt"):
@@ -134,12 +156,6 @@ def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, s
                 flash("Could not load multidata. File may be corrupted or incompatible.")
                 multidata = None
 
-        # Minecraft
-        elif file.filename.endswith(".apmc"):
-            data = zfile.open(file, "r").read()
-            metadata = json.loads(base64.b64decode(data).decode("utf-8"))
-            files[metadata["player_id"]] = data
-
         # Factorio
         elif file.filename.endswith(".zip"):
             try:
@@ -147,8 +163,7 @@ def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, s
             except ValueError:
                 flash("Error: Unexpected file found in .zip: " + file.filename)
                 return
-            data = zfile.open(file, "r").read()
-            files[int(slot_id[1:])] = data
+            slot_file_infos.append(file)
 
         # All other files using the standard MultiWorld.get_out_file_name_base method
         else:
@@ -157,11 +172,48 @@ def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, s
             except ValueError:
                 flash("Error: Unexpected file found in .zip: " + file.filename)
                 return
-            data = zfile.open(file, "r").read()
-            files[int(slot_id[1:])] = data
+            slot_file_infos.append(file)
+
+    if not multidata:
+        flash("No multidata was found in the zip file, which is required.")
+        return
 
-    # Load multi data.
-    if multidata:
+    # Load slot files one at a time, storing each of them only once across all seeds.
+    # They are committed as they go, so the ones new to the database are removed again if the upload fails.
+    stored_files: typing.List[str] = []
+    try:
+        for file in slot_file_infos:
+            with zfile.open(file, "r") as f:
+                data = f.read()
+            handler = AutoPatchRegister.get_handler(file.filename)
+
+            # AP Container
+            if handler:
+                patch = handler(BytesIO(data))
+                patch.read()
+                slot_id = patch.player
+
+            # Minecraft
+            elif file.filename.endswith(".apmc"):
+                metadata = json.loads(base64.b64decode(data).decode("utf-8"))
+                slot_id = metadata["player_id"]
+
+            # Factorio
+            elif file.filename.endswith(".zip"):
+                _, _, slot_id, *_ = file.filename.split('_')[0].split('-', 3)
+                slot_id = int(slot_id[1:])
+
+            # All other files using the standard MultiWorld.get_out_file_name_base method
+            else:
+                _, _, slot_id, *_ = file.filename.split('.')[0].split('_', 3)
+                slot_id = int(slot_id[1:])
+
+            files[slot_id], is_new = store_slot_file(data)
+            if is_new:
+                stored_files.append(files[slot_id])
+            del data
+
+        # Load multi data.
         slots, multidata = process_multidata(multidata, files)
 
         seed = Seed(multidata=multidata, spoiler=spoiler, slots=slots, owner=owner, meta=json.dumps(meta),
@@ -169,9 +221,10 @@ def upload_zip_to_db(zfile: zipfile.ZipFile, owner=None, meta={"race": False}, s
         flush()  # create seed
         for slot in slots:
             slot.seed = seed
-        return seed
-    else:
-        flash("No multidata was found in the zip file, which is required.")
+    except BaseException:
+        delete_slot_files(stored_files)
+        raise
+    return seed
 
 
 @app.route("/uploads", methods=["GET", "POST"])
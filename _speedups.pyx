@@ -12,7 +12,9 @@ import warnings
 from cpython cimport PyObject
 from typing import Any, Dict, Iterable, Iterator, Generator, Sequence, Tuple, TypeVar, Union, Set, List, TYPE_CHECKING
 from cymem.cymem cimport Pool
-from libc.stdint cimport int64_t, uint32_t
+from libc.stdint cimport int32_t, int64_t, uint32_t
+from libc.stdlib cimport malloc, free
+from libc.string cimport memcmp
 from libcpp.set cimport set as std_set
 from collections import defaultdict
 
@@ -218,6 +220,18 @@ cdef class LocationStore:
                         all_locations[sender].add(entry.location)
         return all_locations
 
+    def get_scouted(self, slot: int, locations: Iterable[int]) -> List[Tuple[int, int, int, int]]:
+        # NetworkItem order, so the results can be sent to the client as they are
+        cdef PlayerLocationProxy proxy = self[slot]
+        cdef LocationEntry* entry
+        cdef list scouted = []
+        for location in locations:
+            entry = proxy._get(location)
+            if not entry:
+                raise KeyError(f"No location {location} for player {slot}")
+            scouted.append((entry.item, entry.location, entry.receiver, entry.flags))
+        return scouted
+
     if TYPE_CHECKING:
         State = Dict[Tuple[int, int], Set[int]]
     else:
@@ -335,3 +349,148 @@ cdef class PlayerLocationProxy:
         count = self._store.sender_index[self._player].count
         for entry in self._store.entries[start:start+count]:
             yield entry.location, (entry.item, entry.receiver, entry.flags)
+
+
+# Yaz0 compression as done by the Compress tool of OoT, see worlds/oot/Yaz0.py for the pure python version.
+
+cdef enum:
+    YAZ0_MAX_DISTANCE = 0x1000
+    YAZ0_MAX_LENGTH = 0x111
+    YAZ0_HASH_BITS = 16
+
+
+cdef inline uint32_t _yaz0_hash(const unsigned char* data) noexcept nogil:
+    return <uint32_t>(((<uint32_t>data[0] << 16) | (<uint32_t>data[1] << 8) | data[2]) * <uint32_t>2654435761u) \
+        >> (32 - YAZ0_HASH_BITS)
+
+
+cdef size_t _yaz0_find_match(const unsigned char* data, size_t size, const int32_t* prev, int32_t* candidates,
+                             size_t pos, size_t* match_pos) noexcept nogil:
+    # prev links each position to the previous one with the same hash, candidates collects those within reach.
+    cdef size_t limit = min(size - pos, <size_t>YAZ0_MAX_LENGTH)
+    cdef size_t best_size = 0, length, count = 0, i
+    cdef int32_t candidate
+    if limit < 3:
+        return 0
+    candidate = prev[pos]
+    while candidate >= 0 and pos - candidate <= YAZ0_MAX_DISTANCE:
+        if memcmp(data + candidate, data + pos, 3) == 0:
+            candidates[count] = candidate
+            count += 1
+        candidate = prev[candidate]
+    # oldest first, so the earliest of the longest matches is used
+    while count:
+        count -= 1
+        i = candidates[count]
+        if best_size:
+            if data[i + best_size] != data[pos + best_size] or memcmp(data + i + 3, data + pos + 3, best_size - 3):
+                continue
+            length = best_size + 1
+        else:
+            length = 3
+        while length < limit and data[i + length] == data[pos + length]:
+            length += 1
+        best_size = length
+        match_pos[0] = i
+        if length == limit:
+            break
+    return best_size
+
+
+cdef size_t _yaz0_compress(const unsigned char* data, size_t size, int32_t* prev, int32_t* head, int32_t* candidates,
+                           unsigned char* out) noexcept nogil:
+    cdef size_t src = 0, dst = 16, code_byte_pos, i
+    cdef size_t hashed = size - 2 if size > 2 else 0
+    cdef size_t length, match_pos = 0, distance, next_length, next_pos = 0
+    cdef size_t lookahead_length = 0, lookahead_pos = 0
+    cdef unsigned char code_byte = 0, bitmask = 0x80
+    cdef uint32_t h
+    for i in range(<size_t>1 << YAZ0_HASH_BITS):
+        head[i] = -1
+    for i in range(hashed):
+        h = _yaz0_hash(data + i)
+        prev[i] = head[h]
+        head[h] = <int32_t>i
+
+    code_byte_pos = dst
+    out[dst] = 0
+    dst += 1
+    while src < size:
+        if lookahead_length:
+            length = lookahead_length
+            match_pos = lookahead_pos
+            lookahead_length = 0
+        else:
+            length = _yaz0_find_match(data, size, prev, candidates, src, &match_pos)
+            if length >= 3:
+                # prefer a single byte if it leads to a much longer match
+                next_length = _yaz0_find_match(data, size, prev, candidates, src + 1, &next_pos)
+                if next_length >= length + 2:
+                    length = 1
+                    lookahead_length = next_length
+                    lookahead_pos = next_pos
+
+        if length < 3:
+            out[dst] = data[src]
+            dst += 1
+            src += 1
+            code_byte |= bitmask
+        else:
+            distance = src - match_pos - 1
+            if length > 0x11:
+                out[dst] = <unsigned char>(distance >> 8)
+                out[dst + 1] = <unsigned char>distance
+                out[dst + 2] = <unsigned char>(length - 0x12)
+                dst += 3
+            else:
+                out[dst] = <unsigned char>(((length - 2) << 4) | (distance >> 8))
+                out[dst + 1] = <unsigned char>distance
+                dst += 2
+            src += length
+
+        bitmask >>= 1
+        if not bitmask:
+            out[code_byte_pos] = code_byte
+            code_byte_pos = dst
+            if src < size:
+                out[dst] = 0
+                dst += 1
+            code_byte = 0
+            bitmask = 0x80
+
+    if bitmask != 0x80 or not size:
+        out[code_byte_pos] = code_byte
+    while dst % 16:
+        out[dst] = 0
+        dst += 1
+    return dst
+
+
+def yaz0_compress(const unsigned char[:] data) -> bytes:
+    """Same output as worlds.oot.Yaz0.yaz0_compress. Releases the GIL while compressing."""
+    cdef size_t size = data.shape[0]
+    cdef size_t compressed_size, i
+    cdef const unsigned char* source = &data[0] if size else NULL
+    if size >= 0x7FFFFFFF:
+        raise ValueError("Data too large for Yaz0")
+    cdef int32_t* prev = <int32_t*>malloc(size * sizeof(int32_t) + 1)
+    cdef int32_t* head = <int32_t*>malloc((1 << YAZ0_HASH_BITS) * sizeof(int32_t))
+    cdef int32_t* candidates = <int32_t*>malloc(YAZ0_MAX_DISTANCE * sizeof(int32_t))
+    # worst case is every byte stored as is, one code byte per 8 of them, and the header and padding
+    cdef unsigned char* out = <unsigned char*>malloc(size + size // 8 + 0x30)
+    try:
+        if not prev or not head or not candidates or not out:
+            raise MemoryError()
+        with nogil:
+            compressed_size = _yaz0_compress(source, size, prev, head, candidates, out)
+        for i in range(4):
+            out[i] = b"Yaz0"[i]
+            out[4 + i] = <unsigned char>(size >> (24 - 8 * i))
+            out[8 + i] = 0
+            out[12 + i] = 0
+        return out[:compressed_size]
+    finally:
+        free(prev)
+        free(head)
+        free(candidates)
+        free(out)
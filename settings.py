@@ -27,6 +27,14 @@ _world_settings_name_cache_updated = False
 _lock = Lock()
 
 
+def get_world_settings_name(world: type) -> Optional[str]:
+    """Returns the name of the world class, if it provides a settings group"""
+    annotation = world.__annotations__.get("settings", None)
+    if annotation is None or annotation == "ClassVar[Optional['Group']]":
+        return None
+    return f"{world.__module__}.{world.__name__}"
+
+
 def _update_cache() -> None:
     """Load all worlds and update world_settings_name_cache"""
     global _world_settings_name_cache_updated
@@ -34,12 +42,17 @@ def _update_cache() -> None:
         return
 
     try:
+        from worlds import world_manifest
         from worlds.AutoWorld import AutoWorldRegister
-        for world in AutoWorldRegister.world_types.values():
-            annotation = world.__annotations__.get("settings", None)
-            if annotation is None or annotation == "ClassVar[Optional['Group']]":
-                continue
-            _world_settings_name_cache[world.settings_key] = f"{world.__module__}.{world.__name__}"
+        if world_manifest:  # don't import all worlds when loading them lazily
+            for world_info in world_manifest["games"].values():
+                if world_info["settings"]:
+                    _world_settings_name_cache[world_info["settings_key"]] = world_info["settings"]
+        else:
+            for world in AutoWorldRegister.world_types.values():
+                world_settings_name = get_world_settings_name(world)
+                if world_settings_name:
+                    _world_settings_name_cache[world.settings_key] = world_settings_name
     finally:
         _world_settings_name_cache_updated = True
 
@@ -665,6 +678,21 @@ class GeneratorOptions(Group):
         OFF = 0
         ON = 1
 
+    class ZipCompressionLevel(int):
+        """
+        Compression level of the output archive, from 0 (fastest) to 9 (smallest)
+        Files that are zip archives themselves, like most patch files, are stored without recompressing them
+        """
+
+    class MultidataCodec(str):
+        """
+        Compression of the multidata (.archipelago) file
+        "zlib" works everywhere, "lzma" is smaller but slower, "zstd" is fast but requires the zstandard module
+        """
+
+    class MultidataCompressionLevel(int):
+        """Compression level of the multidata, 0 to 9 for zlib and lzma, 1 to 22 for zstd"""
+
     enemizer_path: EnemizerPath = EnemizerPath("EnemizerCLI/EnemizerCLI.Core")  # + ".exe" is implied on Windows
     player_files_path: PlayerFilesPath = PlayerFilesPath("Players")
     players: Players = Players(0)
@@ -673,6 +701,9 @@ class GeneratorOptions(Group):
     spoiler: Spoiler = Spoiler(3)
     race: Race = Race(0)
     plando_options: PlandoOptions = PlandoOptions("bosses, connections, texts")
+    zip_compression_level: ZipCompressionLevel = ZipCompressionLevel(9)
+    multidata_codec: MultidataCodec = MultidataCodec("zlib")
+    multidata_compression_level: MultidataCompressionLevel = MultidataCompressionLevel(9)
 
 
 class SNIOptions(Group):
@@ -0,0 +1,29 @@
+import hashlib
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from Utils import read_snes_rom
+from worlds.Files import get_base_rom_data
+
+
+class TestBaseRomData(unittest.TestCase):
+    def test_read_once_and_verified(self):
+        """Tests that a base rom is verified, stripped of its header and only read once per file"""
+        data = bytes(range(256)) * 0x40
+        with TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "base.sfc")
+            with open(file_path, "wb") as stream:
+                stream.write(bytes(0x200) + data)
+            valid_hashes = {hashlib.md5(data).hexdigest()}
+
+            base_rom = get_base_rom_data(file_path, valid_hashes, "invalid rom", read_snes_rom)
+            self.assertEqual(base_rom, data)
+            os.remove(file_path)
+            self.assertIs(get_base_rom_data(file_path, valid_hashes, "invalid rom", read_snes_rom), base_rom)
+
+            other_path = os.path.join(directory, "other.sfc")
+            with open(other_path, "wb") as stream:
+                stream.write(data[1:])
+            with self.assertRaisesRegex(Exception, "invalid rom"):
+                get_base_rom_data(other_path, valid_hashes, "invalid rom", read_snes_rom)
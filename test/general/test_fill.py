@@ -9,6 +9,7 @@ from Fill import FillError, balance_multiworld_progression, fill_restrictive, \
 from BaseClasses import Entrance, LocationProgressType, MultiWorld, Region, Item, Location, \
     ItemClassification, CollectionState
 from worlds.generic.Rules import CollectionRule, add_item_rule, locality_rules, set_rule
+from Utils import GenerationCancelled
 
 
 def generate_multiworld(players: int = 1) -> MultiWorld:
@@ -511,6 +512,19 @@ class TestFillRestrictive(unittest.TestCase):
         self.assertEqual(1, len(player1.prog_items))
         self.assertIsNot(loc0.item, player1.prog_items[0], "Filled item was still present in item pool")
 
+    def test_cancelled_fill(self):
+        """Test that a cancelled fill stops without placing anything"""
+        multiworld = generate_multiworld()
+        player1 = generate_player_data(multiworld, 1, 2, 2)
+
+        multiworld.cancellation.cancel()
+        with self.assertRaises(GenerationCancelled):
+            fill_restrictive(multiworld, multiworld.state,
+                             player1.locations, player1.prog_items)
+
+        self.assertEqual(2, len(player1.prog_items))
+        self.assertEqual(2, len(player1.locations))
+
 
 class TestDistributeItemsRestrictive(unittest.TestCase):
     def test_basic_distribute(self):
@@ -0,0 +1,33 @@
+import json
+import unittest
+
+import worlds
+from worlds import LazyWorldTypes, build_world_manifest, network_data_package
+from worlds.AutoWorld import AutoWorldRegister
+
+
+class TestWorldManifest(unittest.TestCase):
+    def test_manifest_covers_worlds(self):
+        """Tests that the manifest holds everything needed about every world that was loaded"""
+        manifest = json.loads(json.dumps(build_world_manifest("stamp")))  # as stored on disk
+        sources = {world_source.path for world_source in worlds.world_sources}
+        self.assertEqual(set(manifest["games"]), set(AutoWorldRegister.world_types))
+        for game, world_info in manifest["games"].items():
+            with self.subTest(game=game):
+                world_type = AutoWorldRegister.world_types[game]
+                if world_type.__module__.startswith("worlds."):
+                    self.assertIn(world_info["source"], sources)
+                self.assertEqual(world_info["data_package"],
+                                 json.loads(json.dumps(network_data_package["games"][game])))
+                self.assertEqual(set(world_info["hint_blacklist"]), world_type.hint_blacklist)
+                self.assertEqual(world_info["settings_key"], world_type.settings_key)
+
+    def test_lazy_world_types(self):
+        """Tests that lazy world types only import worlds as their game is looked up"""
+        manifest = build_world_manifest("stamp")
+        game, world_type = next(iter(AutoWorldRegister.world_types.items()))
+        world_types = LazyWorldTypes(manifest["games"], {game: world_type})
+        self.assertIs(world_types[game], world_type)
+        self.assertFalse(world_types.complete)
+        self.assertNotIn("Not a Game", world_types)
+        self.assertTrue(world_types.complete)
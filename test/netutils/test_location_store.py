@@ -97,6 +97,12 @@ class Base:
             self.assertEqual(self.store.get_for_player(3), {4: {9}})
             self.assertEqual(self.store.get_for_player(1), {1: {13}, 2: {22, 23}})
 
+        def test_get_scouted(self) -> None:
+            self.assertEqual(self.store.get_scouted(1, [13, 11]), [(13, 13, 1, 0), (21, 11, 2, 7)])
+            self.assertEqual(self.store.get_scouted(3, []), [])
+            with self.assertRaises(KeyError):
+                self.store.get_scouted(1, [11, 7])
+
         def test_get_checked(self) -> None:
             self.assertEqual(self.store.get_checked(full_state, 0, 1), [11, 12, 13])
             self.assertEqual(self.store.get_checked(one_state, 0, 1), [12])
@@ -4,9 +4,11 @@ import unittest
 import os
 import os.path
 import sys
+import time
 
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest import mock
 
 import Generate
 
@@ -91,3 +93,67 @@ class TestGenerateMain(unittest.TestCase):
             user_path.cached_path = user_path_backup
 
         self.assertOutput(self.output_tempdir.name)
+
+
+class TestReadWeights(unittest.TestCase):
+    def setUp(self):
+        self.original_cache_path = getattr(Generate.Utils.cache_path, "cached_path", None)
+        self.cache_tempdir = TemporaryDirectory(prefix='AP_cache_')
+        Generate.Utils.cache_path.cached_path = self.cache_tempdir.name
+
+    def tearDown(self):
+        self.cache_tempdir.cleanup()
+        if self.original_cache_path is None:
+            del Generate.Utils.cache_path.cached_path
+        else:
+            Generate.Utils.cache_path.cached_path = self.original_cache_path
+
+    def test_cached_parse(self):
+        """Test that parsed yamls are cached by content and equal to a fresh parse"""
+        data = "name: Player{number}\ngame: Archipelago\n---\nname: Other\ngame: Archipelago\n".encode("utf-8-sig")
+        weights = Generate.parse_weights_yamls(data)
+        self.assertEqual(weights, tuple(Generate.parse_yamls(str(data, "utf-8-sig"))))
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_tempdir.name, "yaml"))), 1)
+        self.assertEqual(Generate.parse_weights_yamls(data), weights)
+        self.assertIsNot(Generate.parse_weights_yamls(data)[0], weights[0])
+
+    def test_prune(self):
+        """Test that cached yamls above the limit or unused for too long get removed, least recently used first"""
+        cache_dir = os.path.join(self.cache_tempdir.name, "yaml")
+        for number in range(3):
+            Generate.parse_weights_yamls(f"name: Player{number}\ngame: Archipelago\n".encode())
+        files = sorted(os.listdir(cache_dir))
+        old_time = time.time() - Generate.yaml_cache_max_age - 1
+        os.utime(os.path.join(cache_dir, files[0]), (old_time, old_time))
+        os.utime(os.path.join(cache_dir, files[1]), (old_time + 2, old_time + 2))
+        Generate.prune_yaml_cache(cache_dir)
+        self.assertEqual(sorted(os.listdir(cache_dir)), files[1:])
+
+        with mock.patch.object(Generate, "yaml_cache_max_files", 1):
+            Generate.prune_yaml_cache(cache_dir)
+        self.assertEqual(os.listdir(cache_dir), [files[2]])
+
+    def test_invalid_not_cached(self):
+        """Test that yamls failing the duplicate key check are not cached"""
+        with self.assertRaises(KeyError):
+            Generate.parse_weights_yamls(b"name: Player\nname: Player\n")
+        self.assertFalse(os.path.exists(os.path.join(self.cache_tempdir.name, "yaml")))
+
+
+class TestOptionCache(unittest.TestCase):
+    def test_cached_options(self):
+        """Test that players sharing option values get equal, but separate options from the cache"""
+        from BaseClasses import PlandoOptions
+        option_cache = Generate.OptionCache()
+        weights = {"name": "Player", "game": "Clique", "Clique": {"local_items": ["Button Activation"]}}
+        first = Generate.roll_settings(weights, PlandoOptions.none, option_cache)
+        second = Generate.roll_settings(weights, PlandoOptions.none, option_cache)
+        self.assertEqual(len(option_cache.options), 1)
+        self.assertEqual(first.local_items.value, second.local_items.value)
+        self.assertIsNot(first.local_items, second.local_items)
+        self.assertIsNot(first.local_items.value, second.local_items.value)
+
+    def test_random_not_cached(self):
+        option_cache = Generate.OptionCache()
+        self.assertIsNone(option_cache.get_key(None, Generate.Options.LocalItems, ["random"], None))
+        self.assertIsNone(option_cache.get_key(None, Generate.Options.Accessibility, "items", None))
@@ -1,5 +1,7 @@
+import asyncio
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+from MultiServer import Client, Context, ServerCommandProcessor, process_client_cmd
+from NetUtils import LocationStore, NetworkItem
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +40,56 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class TestLocationScouts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.ctx.locations = LocationStore({1: {location: (location + 100, 1, 0) for location in range(1, 2501)}})
+        self.ctx.location_checks[0, 1] = {3}
+        self.ctx.player_names = {(0, 1): "Player"}
+        self.ctx.clients = {0: {1: []}}
+        self.ctx.save = lambda: None
+        self.sent = []
+
+        async def send_msgs(endpoint, msgs) -> bool:
+            self.sent.extend(msgs)
+            return True
+
+        self.ctx.send_msgs = send_msgs
+        self.client = Client(None, self.ctx)
+        self.client.auth = True
+        self.client.team = 0
+        self.client.slot = 1
+
+    def scout(self, locations, create_as_hint: int = 0, **kwargs) -> None:
+        asyncio.run(process_client_cmd(self.ctx, self.client, {"cmd": "LocationScouts", "locations": locations,
+                                                               "create_as_hint": create_as_hint, **kwargs}))
+
+    def test_single_reply(self) -> None:
+        self.scout(list(range(1, 2501)))
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(self.sent[0]["locations"],
+                         [NetworkItem(location + 100, location, 1, 0) for location in range(1, 2501)])
+
+    def test_split_reply(self) -> None:
+        self.scout(list(range(1, 2501)), chunk_size=1000)
+        self.assertEqual([len(msg["locations"]) for msg in self.sent], [1000, 1000, 500])
+        self.assertEqual([item for msg in self.sent for item in msg["locations"]],
+                         [NetworkItem(location + 100, location, 1, 0) for location in range(1, 2501)])
+
+        self.sent.clear()
+        self.scout([], chunk_size=1000)
+        self.assertEqual(self.sent, [{"cmd": "LocationInfo", "locations": []}])
+
+    def test_hints(self) -> None:
+        self.scout([2, 3], create_as_hint=2)
+        hints = self.ctx.hints[0, 1]
+        self.assertEqual({hint.location for hint in hints}, {2})
+        self.assertEqual(len(self.sent), 1)
+
+    def test_invalid(self) -> None:
+        self.scout([1, "2"])
+        self.scout([1, 2501])
+        self.scout([1], chunk_size="2")
+        self.assertEqual([msg["cmd"] for msg in self.sent], ["InvalidPacket"] * 3)
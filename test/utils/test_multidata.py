@@ -0,0 +1,49 @@
+# Tests for the multidata format in Utils.py
+
+import importlib.util
+import pickle
+import unittest
+import zlib
+
+from NetUtils import NetworkSlot, SlotType
+from Utils import VersionException, compress_multidata, decompress_multidata, multidata_codecs
+
+
+def get_multidata() -> dict:
+    return {
+        "slot_info": {1: NetworkSlot("Player1", "Archipelago", SlotType.player)},
+        "slot_data": {1: {"option": 1, "data": list(range(100))}},
+        "locations": {1: {1000: (2000, 1, 0)}},
+        "datapackage": {"Archipelago": {"checksum": "0", "version": 0}},
+        "seed_name": "12345",
+        "version": (0, 4, 4),
+    }
+
+
+class TestMultidataFormat(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        """Test that multidata survives compression with every available codec"""
+        multidata = get_multidata()
+        for codec in multidata_codecs:
+            if codec == "zstd" and not importlib.util.find_spec("zstandard"):
+                continue
+            with self.subTest(codec):
+                data = compress_multidata(multidata, codec, 6)
+                self.assertEqual(data[0], 4)
+                self.assertEqual(decompress_multidata(data), multidata)
+
+    def test_without_sections(self) -> None:
+        """Test that multidata does not require any of the separately compressed keys"""
+        multidata = {"seed_name": "12345"}
+        self.assertEqual(decompress_multidata(compress_multidata(multidata)), multidata)
+
+    def test_version_3(self) -> None:
+        """Test that the previous format can still be loaded"""
+        multidata = get_multidata()
+        data = bytes([3]) + zlib.compress(pickle.dumps(multidata), 9)
+        self.assertEqual(decompress_multidata(data), multidata)
+
+    def test_future_version(self) -> None:
+        data = bytes([5]) + compress_multidata(get_multidata())[1:]
+        with self.assertRaises(VersionException):
+            decompress_multidata(data)
@@ -0,0 +1,49 @@
+import pickle
+import typing
+import unittest
+import uuid
+import zlib
+
+
+class FakeSeed(typing.NamedTuple):
+    id: uuid.UUID
+    multidata: bytes
+
+
+def make_seed(seed_name: str) -> FakeSeed:
+    multidata = {"seed_name": seed_name, "slot_info": {}, "er_hint_data": {1: {2: "x" * 1000}}}
+    return FakeSeed(uuid.uuid4(), bytes([3]) + zlib.compress(pickle.dumps(multidata)))
+
+
+class TestMultidataCache(unittest.TestCase):
+    def setUp(self) -> None:
+        from WebHostLib import app
+        from WebHostLib.tracker import MultidataCache
+        self.app = app
+        self.original_size = app.config["TRACKER_MULTIDATA_CACHE_SIZE"]
+        self.cache = MultidataCache()
+
+    def tearDown(self) -> None:
+        self.app.config["TRACKER_MULTIDATA_CACHE_SIZE"] = self.original_size
+
+    def test_trimmed(self) -> None:
+        multidata = self.cache.get(make_seed("A"))
+        self.assertEqual(multidata["seed_name"], "A")
+        self.assertNotIn("er_hint_data", multidata)
+
+    def test_hit_and_eviction(self) -> None:
+        seeds = [make_seed(str(x)) for x in range(3)]
+        self.cache.get(seeds[0])
+        entry_size = self.cache.size
+        self.app.config["TRACKER_MULTIDATA_CACHE_SIZE"] = entry_size * 2
+        self.cache.get(seeds[1])
+        self.assertIs(self.cache.get(seeds[0]), self.cache.get(seeds[0]))
+        self.cache.get(seeds[2])  # evicts seeds[1], as seeds[0] was used more recently
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["entries"], 2)
+        self.assertIn(seeds[0].id, self.cache.entries)
+        self.assertNotIn(seeds[1].id, self.cache.entries)
+        self.assertLessEqual(self.cache.size, entry_size * 2)
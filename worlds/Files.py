@@ -1,21 +1,48 @@
 from __future__ import annotations
 
 import abc
+import hashlib
 import json
 import zipfile
 from enum import IntEnum
 import os
 import threading
 
-from typing import ClassVar, Dict, List, Literal, Tuple, Any, Optional, Union, BinaryIO, overload, Sequence
+from typing import ClassVar, Dict, List, Literal, Tuple, Any, Optional, Union, BinaryIO, overload, Sequence, \
+    Callable, Collection
 
 import bsdiff4
 
 semaphore = threading.Semaphore(os.cpu_count() or 4)
+base_rom_lock = threading.Lock()
 
 del threading
 del os
 
+_base_roms: Dict[str, bytes] = {}
+
+
+def get_base_rom_data(file_path: str, valid_hashes: Collection[str], error_message: str,
+                      read: Optional[Callable[[BinaryIO], Union[bytes, bytearray]]] = None) -> bytes:
+    """
+    Reads a base rom and checks its MD5 against the known hashes, once per process for each file.
+    The returned bytes are shared between all callers and output threads, copy them into a bytearray to patch them.
+
+    :param file_path: path of the base rom
+    :param valid_hashes: MD5 hex digests of the accepted roms
+    :param error_message: message of the exception raised for any other rom
+    :param read: reads the rom from the opened file, for example Utils.read_snes_rom to strip a copier header
+    """
+    with base_rom_lock:
+        base_rom_bytes = _base_roms.get(file_path)
+        if base_rom_bytes is None:
+            with open(file_path, "rb") as stream:
+                base_rom_bytes = bytes(read(stream) if read else stream.read())
+            if hashlib.md5(base_rom_bytes).hexdigest() not in valid_hashes:
+                raise Exception(error_message)
+            _base_roms[file_path] = base_rom_bytes
+    return base_rom_bytes
+
 
 class AutoPatchRegister(abc.ABCMeta):
     patch_types: ClassVar[Dict[str, AutoPatchRegister]] = {}
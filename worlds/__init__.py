@@ -1,13 +1,20 @@
 import importlib
+import hashlib
+import json
+import logging
 import os
 import sys
 import warnings
 import zipimport
 import time
 import dataclasses
-from typing import Dict, List, TypedDict, Optional
+from typing import Dict, List, TypedDict, Optional, Type, TYPE_CHECKING
 
-from Utils import local_path, user_path
+import Utils
+from Utils import local_path, user_path, cache_path, __version__
+
+if TYPE_CHECKING:
+    from .AutoWorld import World
 
 local_folder = os.path.dirname(__file__)
 user_folder = user_path("worlds") if user_path() != local_path() else None
@@ -21,6 +28,7 @@ __all__ = {
     "GamesPackage",
     "DataPackage",
     "failed_world_loads",
+    "world_manifest",
 }
 
 
@@ -40,12 +48,26 @@ class DataPackage(TypedDict):
     games: Dict[str, GamesPackage]
 
 
+class WorldManifestGame(TypedDict):
+    source: Optional[str]  # path of the WorldSource registering the game
+    settings: Optional[str]  # world class providing the settings group, see settings.get_world_settings_name
+    settings_key: str
+    hint_blacklist: List[str]
+    data_package: GamesPackage
+
+
+class WorldManifest(TypedDict):
+    stamp: str
+    games: Dict[str, WorldManifestGame]
+
+
 @dataclasses.dataclass(order=True)
 class WorldSource:
     path: str  # typically relative path from this module
     is_zip: bool = False
     relative: bool = True  # relative to regular world import folder
     time_taken: Optional[float] = None
+    loaded: bool = dataclasses.field(default=False, compare=False)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.path}, is_zip={self.is_zip}, relative={self.relative})"
@@ -56,7 +78,12 @@ class WorldSource:
             return os.path.join(local_folder, self.path)
         return self.path
 
+    @property
+    def module_name(self) -> str:
+        return os.path.basename(self.path).rsplit(".", 1)[0] if self.is_zip else os.path.basename(self.path)
+
     def load(self) -> bool:
+        self.loaded = True
         try:
             start = time.perf_counter()
             if self.is_zip:
@@ -108,14 +135,154 @@ for folder in (folder for folder in (user_folder, local_folder) if folder):
             elif entry.is_file() and entry.name.endswith(".apworld"):
                 world_sources.append(WorldSource(file_name, is_zip=True, relative=relative))
 
-# import all submodules to trigger AutoWorldRegister
 world_sources.sort()
-for world_source in world_sources:
-    world_source.load()
 
-# Build the data package for each game.
+
+def get_world_sources_stamp() -> str:
+    """Returns a digest over the version and all files in the world folders, which changes whenever a world may."""
+    digest = hashlib.sha256(f"{__version__} {local_folder}".encode())
+    for folder in (folder for folder in (local_folder, user_folder) if folder and os.path.isdir(folder)):
+        for root, dirs, files in os.walk(folder):
+            dirs[:] = sorted(directory for directory in dirs if directory != "__pycache__")
+            for file in sorted(files):
+                stat = os.stat(os.path.join(root, file))
+                digest.update(f"{os.path.join(root, file)} {stat.st_size} {stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def get_world_manifest_path() -> str:
+    return cache_path("worlds", f"manifest_{hashlib.sha256(local_folder.encode()).hexdigest()[:16]}.json")
+
+
+def load_world_manifest(stamp: str) -> Optional[WorldManifest]:
+    """Returns the cached manifest, if it was built from the same world files."""
+    try:
+        with open(get_world_manifest_path(), encoding="utf-8") as f:
+            manifest: WorldManifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.debug(f"Could not load world manifest: {e}")
+        return None
+    return manifest if manifest.get("stamp") == stamp else None
+
+
+def build_world_manifest(stamp: str) -> WorldManifest:
+    """Builds the manifest from the currently registered worlds."""
+    from settings import get_world_settings_name
+    sources: Dict[str, str] = {}
+    for world_source in world_sources:
+        sources.setdefault(world_source.module_name, world_source.path)
+
+    games: Dict[str, WorldManifestGame] = {}
+    for game, world in AutoWorldRegister.world_types.items():
+        module = world.__module__.split(".")
+        games[game] = {
+            "source": sources.get(module[1]) if len(module) > 1 and module[0] == "worlds" else None,
+            "settings": get_world_settings_name(world),
+            "settings_key": world.settings_key,
+            "hint_blacklist": sorted(world.hint_blacklist),
+            "data_package": network_data_package["games"][game],
+        }
+    return {"stamp": stamp, "games": games}
+
+
+def store_world_manifest(manifest: WorldManifest) -> None:
+    path = get_world_manifest_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except Exception as e:
+        logging.debug(f"Could not store world manifest: {e}")
+
+
+class LazyWorldTypes(Dict[str, "Type[World]"]):
+    """Takes the place of AutoWorldRegister.world_types when loading worlds lazily.
+    Looking up a game imports the world source registering it, anything needing every game imports all worlds."""
+
+    def __init__(self, games: Dict[str, WorldManifestGame], *args) -> None:
+        super().__init__(*args)
+        self.games = games
+        self.sources = {world_source.path: world_source for world_source in world_sources}
+        self.complete = False
+
+    def load(self, game: str) -> None:
+        if self.complete or super().__contains__(game):
+            return
+        world_source = self.sources.get(self.games[game]["source"]) if game in self.games else None
+        if world_source:
+            if not world_source.loaded:
+                world_source.load()
+        else:  # unknown to the manifest, could come from a world that failed to load or be a typo
+            self.load_all()
+
+    def load_all(self) -> None:
+        if not self.complete:
+            self.complete = True
+            for world_source in world_sources:
+                if not world_source.loaded:
+                    world_source.load()
+
+    def __getitem__(self, game: str) -> "Type[World]":
+        self.load(game)
+        return super().__getitem__(game)
+
+    def __contains__(self, game: object) -> bool:
+        self.load(game)
+        return super().__contains__(game)
+
+    def get(self, game: str, default=None):
+        self.load(game)
+        return super().get(game, default)
+
+    def __iter__(self):
+        self.load_all()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self.load_all()
+        return super().__len__()
+
+    def keys(self):
+        self.load_all()
+        return super().keys()
+
+    def values(self):
+        self.load_all()
+        return super().values()
+
+    def items(self):
+        self.load_all()
+        return super().items()
+
+
+# With lazy_world_loading, the manifest is used in place of importing every world, if it is still current.
+# It holds everything needed about a game without importing its world and is rebuilt whenever a world changes.
+world_manifest: Optional[WorldManifest] = None
+if Utils.lazy_world_loading:
+    world_sources_stamp = get_world_sources_stamp()
+    world_manifest = load_world_manifest(world_sources_stamp)
+
 from .AutoWorld import AutoWorldRegister
 
-network_data_package: DataPackage = {
-    "games": {world_name: world.get_data_package_data() for world_name, world in AutoWorldRegister.world_types.items()},
-}
+if world_manifest:
+    AutoWorldRegister.world_types = LazyWorldTypes(world_manifest["games"], AutoWorldRegister.world_types)
+    network_data_package: DataPackage = {
+        "games": {game: world_info["data_package"] for game, world_info in world_manifest["games"].items()},
+    }
+else:
+    # import all submodules to trigger AutoWorldRegister
+    for world_source in world_sources:
+        world_source.load()
+
+    # Build the data package for each game.
+    network_data_package: DataPackage = {
+        "games": {world_name: world.get_data_package_data()
+                  for world_name, world in AutoWorldRegister.world_types.items()},
+    }
+    if Utils.lazy_world_loading:
+        world_manifest = build_world_manifest(world_sources_stamp)
+        store_world_manifest(world_manifest)
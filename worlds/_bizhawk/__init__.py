@@ -10,8 +10,12 @@ import base64
 import enum
 import json
 import sys
+import time
 import typing
 
+if typing.TYPE_CHECKING:
+    from CommonClient import PollScheduler
+
 
 BIZHAWK_SOCKET_PORT_RANGE_START = 43055
 BIZHAWK_SOCKET_PORT_RANGE_SIZE = 5
@@ -48,12 +52,19 @@ class BizHawkContext:
     connection_status: ConnectionStatus
     _lock: asyncio.Lock
     _port: typing.Optional[int]
+    _pending_requests: typing.List[typing.Tuple[typing.List[typing.Dict[str, typing.Any]], asyncio.Future]]
+    _flush_task: typing.Optional[asyncio.Task]
+    poll_scheduler: typing.Optional["PollScheduler"]
+    """Gets every response recorded as memory read, if set"""
 
     def __init__(self) -> None:
         self.streams = None
         self.connection_status = ConnectionStatus.NOT_CONNECTED
         self._lock = asyncio.Lock()
         self._port = None
+        self._pending_requests = []
+        self._flush_task = None
+        self.poll_scheduler = None
 
     async def _send_message(self, message: str):
         async with self._lock:
@@ -125,21 +136,59 @@ async def get_script_version(ctx: BizHawkContext) -> int:
 async def send_requests(ctx: BizHawkContext, req_list: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[typing.Dict[str, typing.Any]]:
     """Sends a list of requests to the BizHawk connector and returns their responses.
 
+    Requests sent concurrently, for example through `asyncio.gather`, are combined into a single message to the
+    connector, which handles them in order within the same frame.
+
     It's likely you want to use the wrapper functions instead of this."""
-    responses = json.loads(await ctx._send_message(json.dumps(req_list)))
-    errors: typing.List[ConnectorError] = []
+    future = asyncio.get_running_loop().create_future()
+    ctx._pending_requests.append((req_list, future))
+    if ctx._flush_task is None:
+        # runs after every other task that is ready right now had the chance to queue its requests
+        ctx._flush_task = asyncio.create_task(_flush_requests(ctx), name="BizHawkFlushRequests")
+    return await future
 
-    for response in responses:
-        if response["type"] == "ERROR":
-            errors.append(ConnectorError(response["err"]))
 
-    if errors:
-        if sys.version_info >= (3, 11, 0):
-            raise ExceptionGroup("Connector script returned errors", errors)  # noqa
-        else:
-            raise errors[0]
+async def _flush_requests(ctx: BizHawkContext) -> None:
+    pending = ctx._pending_requests
+    ctx._pending_requests = []
+    ctx._flush_task = None
 
-    return responses
+    try:
+        try:
+            start = time.perf_counter()
+            message = await ctx._send_message(json.dumps([req for req_list, _ in pending for req in req_list]))
+            if ctx.poll_scheduler:
+                ctx.poll_scheduler.record_read(message.encode("utf-8"), time.perf_counter() - start)
+            responses = json.loads(message)
+            if len(responses) != sum(len(req_list) for req_list, _ in pending):
+                raise SyncError(f"Expected {sum(len(req_list) for req_list, _ in pending)} responses "
+                                f"but got {len(responses)}")
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        index = 0
+        for req_list, future in pending:
+            own_responses = responses[index:index + len(req_list)]
+            index += len(req_list)
+            if future.done():  # caller was cancelled
+                continue
+
+            errors = [ConnectorError(response["err"]) for response in own_responses if response["type"] == "ERROR"]
+            if errors:
+                if sys.version_info >= (3, 11, 0):
+                    future.set_exception(ExceptionGroup("Connector script returned errors", errors))  # noqa
+                else:
+                    future.set_exception(errors[0])
+            else:
+                future.set_result(own_responses)
+    finally:
+        # if this task got cancelled, the callers must not wait forever for their responses
+        for _, future in pending:
+            if not future.done():
+                future.cancel()
 
 
 async def ping(ctx: BizHawkContext) -> None:
@@ -94,8 +94,9 @@ class BizHawkClient(abc.ABC, metaclass=AutoBizHawkClientRegister):
 
     @abc.abstractmethod
     async def game_watcher(self, ctx: BizHawkClientContext) -> None:
-        """Runs on a loop with the approximate interval `ctx.watcher_timeout`. The currently loaded ROM is guaranteed
-        to have passed your validator when this function is called, and the emulator is very likely to be connected."""
+        """Runs on a loop with an interval of at least `ctx.watcher_timeout`, which grows while the game's memory does
+        not change (see `ctx.poll_scheduler`). The currently loaded ROM is guaranteed to have passed your validator
+        when this function is called, and the emulator is very likely to be connected."""
         ...
 
     def on_package(self, ctx: BizHawkClientContext, cmd: str, args: dict) -> None:
@@ -9,7 +9,8 @@ import enum
 import subprocess
 from typing import Any, Dict, Optional
 
-from CommonClient import CommonContext, ClientCommandProcessor, get_base_parser, server_loop, logger, gui_enabled
+from CommonClient import CommonContext, ClientCommandProcessor, PollScheduler, get_base_parser, server_loop, logger, \
+    gui_enabled
 import Patch
 import Utils
 
@@ -39,6 +40,12 @@ class BizHawkClientCommandProcessor(ClientCommandProcessor):
             elif self.ctx.bizhawk_ctx.connection_status == ConnectionStatus.CONNECTED:
                 logger.info("BizHawk Connection Status: Connected")
 
+    def _cmd_poll_stats(self):
+        """Shows how often BizHawk's memory is being read"""
+        if isinstance(self.ctx, BizHawkClientContext):
+            logger.info(self.ctx.poll_scheduler.format_metrics())
+            self.ctx.poll_scheduler.reset_metrics()
+
 
 class BizHawkClientContext(CommonContext):
     command_processor = BizHawkClientCommandProcessor
@@ -48,16 +55,20 @@ class BizHawkClientContext(CommonContext):
     slot_data: Optional[Dict[str, Any]] = None
     rom_hash: Optional[str] = None
     bizhawk_ctx: BizHawkContext
+    poll_scheduler: PollScheduler
 
     watcher_timeout: float
-    """The maximum amount of time the game watcher loop will wait for an update from the server before executing"""
+    """The minimum amount of time the game watcher loop will wait for an update from the server before executing.
+    Backs off up to `poll_scheduler.max_interval` while the game's memory does not change."""
 
     def __init__(self, server_address: Optional[str], password: Optional[str]):
         super().__init__(server_address, password)
         self.auth_status = AuthStatus.NOT_AUTHENTICATED
         self.password_requested = False
         self.client_handler = None
+        self.poll_scheduler = PollScheduler()
         self.bizhawk_ctx = BizHawkContext()
+        self.bizhawk_ctx.poll_scheduler = self.poll_scheduler
         self.watcher_timeout = 0.5
 
     def run_gui(self):
@@ -114,11 +125,7 @@ async def _game_watcher(ctx: BizHawkClientContext):
     showed_no_handler_message = False
 
     while not ctx.exit_event.is_set():
-        try:
-            await asyncio.wait_for(ctx.watcher_event.wait(), ctx.watcher_timeout)
-        except asyncio.TimeoutError:
-            pass
-
+        await ctx.poll_scheduler.wait(ctx.watcher_event, ctx.watcher_timeout)
         ctx.watcher_event.clear()
 
         try:
@@ -154,13 +161,14 @@ async def _game_watcher(ctx: BizHawkClientContext):
 
             showed_connecting_message = False
 
-            await ping(ctx.bizhawk_ctx)
+            # sent to the connector as a single message
+            _, rom_hash, system = await asyncio.gather(ping(ctx.bizhawk_ctx), get_hash(ctx.bizhawk_ctx),
+                                                       get_system(ctx.bizhawk_ctx))
 
             if not showed_connected_message:
                 showed_connected_message = True
                 logger.info("Connected to BizHawk")
 
-            rom_hash = await get_hash(ctx.bizhawk_ctx)
             if ctx.rom_hash is not None and ctx.rom_hash != rom_hash:
                 if ctx.server is not None and not ctx.server.socket.closed:
                     logger.info(f"ROM changed. Disconnecting from server.")
@@ -172,7 +180,6 @@ async def _game_watcher(ctx: BizHawkClientContext):
             ctx.rom_hash = rom_hash
 
             if ctx.client_handler is None:
-                system = await get_system(ctx.bizhawk_ctx)
                 ctx.client_handler = await AutoBizHawkClientRegister.get_handler(ctx, system)
 
                 if ctx.client_handler is None:
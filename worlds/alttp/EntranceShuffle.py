@@ -1284,10 +1284,10 @@ def connect_simple(world, exitname, regionname, player):
 def connect_entrance(world, entrancename: str, exitname: str, player: int):
     entrance = world.get_entrance(entrancename, player)
     # check if we got an entrance or a region to connect to
-    try:
-        region = world.get_region(exitname, player)
+    region = world.regions.region_cache[player].get(exitname)
+    if region is not None:
         exit = None
-    except KeyError:
+    else:
         exit = world.get_entrance(exitname, player)
         region = exit.parent_region
 
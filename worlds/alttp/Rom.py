@@ -12,13 +12,14 @@ import json
 import hashlib
 import logging
 import os
+import pickle
 import random
 import struct
 import subprocess
 import threading
 import concurrent.futures
 import bsdiff4
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
 from BaseClasses import CollectionState, Region, Location, MultiWorld
 from Utils import local_path, user_path, int16_as_bytes, int32_as_bytes, snes_to_pc, is_frozen, parse_yaml, read_snes_rom
@@ -243,7 +244,7 @@ def apply_random_sprite_on_event(rom: LocalRom, sprite, local_random, allow_rand
 
         rom.write_int16(0x18637F, onevent)
 
-        sprite = Sprite(sprite) if os.path.isfile(sprite) else Sprite.get_sprite_from_name(sprite, local_random)
+        sprite = load_sprite(sprite) if os.path.isfile(sprite) else Sprite.get_sprite_from_name(sprite, local_random)
 
     # write link sprite if required
     if sprite:
@@ -256,7 +257,7 @@ def apply_random_sprite_on_event(rom: LocalRom, sprite, local_random, allow_rand
                 if isinstance(sprite_pool, str):
                     sprite_pool = sprite_pool.split(':')
                 for spritename in sprite_pool:
-                    sprite = Sprite(spritename) if os.path.isfile(spritename) else Sprite.get_sprite_from_name(
+                    sprite = load_sprite(spritename) if os.path.isfile(spritename) else Sprite.get_sprite_from_name(
                         spritename, local_random)
                     if sprite:
                         sprites.append(sprite)
@@ -506,18 +507,128 @@ _sprite_table = {}
 def _populate_sprite_table():
     with sprite_list_lock:
         if not _sprite_table:
-            def load_sprite_from_file(file):
-                sprite = Sprite(file)
-                if sprite.valid:
-                    _sprite_table[sprite.name.lower()] = sprite
-                    _sprite_table[os.path.basename(file).split(".")[0].lower()] = sprite  # alias for filename base
-                else:
-                    logging.debug(f"Spritefile {file} could not be loaded as a valid sprite.")
+            for dir in [user_path('data', 'sprites', 'alttpr'), user_path('data', 'sprites', 'custom')]:
+                for file, sprite in load_sprite_dir(dir):
+                    if sprite.valid:
+                        _sprite_table[sprite.name.lower()] = sprite
+                        _sprite_table[os.path.basename(file).split(".")[0].lower()] = sprite  # alias for filename base
+                    else:
+                        logging.debug(f"Spritefile {file} could not be loaded as a valid sprite.")
+
+
+sprite_cache_lock = threading.Lock()
+_sprite_cache: Dict[Tuple[str, bytes], Sprite] = {}
+
+
+def _load_sprite(filename: str) -> Tuple[Tuple[str, bytes], Sprite]:
+    with open(filename, 'rb') as file:
+        filedata = file.read()
+    key = os.path.basename(filename), hashlib.sha256(filedata).digest()
+    with sprite_cache_lock:
+        sprite = _sprite_cache.get(key)
+    if sprite is None:
+        sprite = Sprite(filename, filedata)
+        with sprite_cache_lock:
+            sprite = _sprite_cache.setdefault(key, sprite)
+    return key, sprite
+
+
+def load_sprite(filename: str) -> Sprite:
+    """Loads a sprite file, sharing the decoded sprite with every earlier load of the same file content."""
+    return _load_sprite(filename)[1]
+
+
+def _restore_sprite(key: Tuple[str, bytes], state: Dict[str, Any]) -> Sprite:
+    with sprite_cache_lock:
+        sprite = _sprite_cache.get(key)
+        if sprite is None:
+            if not hasattr(Sprite, "base_data"):
+                Sprite.get_vanilla_sprite_data()
+            sprite = _sprite_cache[key] = Sprite.__new__(Sprite)
+            sprite.__dict__.update(state)
+    return sprite
+
+
+sprite_index_lock = threading.Lock()
+# file path -> size, modification time, cache key and decoded state of the sprite
+_sprite_index: Optional[Dict[str, Tuple[int, int, Tuple[str, bytes], Dict[str, Any]]]] = None
+
+
+def _load_sprite_index() -> Dict[str, Tuple[int, int, Tuple[str, bytes], Dict[str, Any]]]:
+    try:
+        with open(Utils.cache_path("alttp", "sprite_index.pickle"), "rb") as stream:
+            index = Utils.restricted_loads(stream.read())
+        if isinstance(index, dict):
+            return index
+        logging.debug("Ignoring malformed ALttP sprite index.")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.debug(f"Could not load ALttP sprite index: {e}")
+    return {}
+
+
+def _store_sprite_index(index: Dict[str, Tuple[int, int, Tuple[str, bytes], Dict[str, Any]]]):
+    try:
+        index_file = Utils.cache_path("alttp", "sprite_index.pickle")
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        temp_file = f"{index_file}.{os.getpid()}"
+        with open(temp_file, "wb") as stream:
+            pickle.dump(index, stream, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, index_file)
+    except Exception as e:
+        logging.debug(f"Could not store ALttP sprite index: {e}")
+
+
+def _try_load_sprite(filename: str) -> Optional[Tuple[Tuple[str, bytes], Sprite]]:
+    try:
+        return _load_sprite(filename)
+    except Exception as e:
+        logging.debug(f"Spritefile {filename} could not be loaded: {e}")
+        return None
+
+
+def load_sprite_dir(path: str) -> List[Tuple[str, Sprite]]:
+    """Returns the file names and sprites of a sprite directory, skipping files that can't be read.
+    Files that didn't change since they were last loaded are taken from the sprite index instead of parsing them."""
+    global _sprite_index
+    with sprite_index_lock:
+        if _sprite_index is None:
+            _sprite_index = _load_sprite_index()
+        index_changed = False
+        sprites: Dict[str, Sprite] = {}
+        to_load: List[Tuple[str, os.stat_result]] = []
+        files = [file for file in os.listdir(path) if file != ".gitignore"]
+        for file in files:
+            filename = os.path.join(path, file)
+            stat = os.stat(filename)
+            entry = _sprite_index.get(filename)
+            if entry and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+                sprites[file] = _restore_sprite(entry[2], entry[3])
+            else:
+                to_load.append((file, stat))
 
+        if to_load:
             with concurrent.futures.ThreadPoolExecutor() as pool:
-                for dir in [user_path('data', 'sprites', 'alttpr'), user_path('data', 'sprites', 'custom')]:
-                    for file in os.listdir(dir):
-                        pool.submit(load_sprite_from_file, os.path.join(dir, file))
+                loaded = pool.map(_try_load_sprite, [os.path.join(path, file) for file, _ in to_load])
+                for (file, stat), result in zip(to_load, loaded):
+                    if result is None:
+                        continue
+                    key, sprite = result
+                    sprites[file] = sprite
+                    _sprite_index[os.path.join(path, file)] = stat.st_size, stat.st_mtime_ns, key, dict(sprite.__dict__)
+            index_changed = True
+
+        # forget files that were removed from the directory
+        filenames = {os.path.join(path, file) for file in files}
+        for filename in [filename for filename in _sprite_index
+                         if os.path.dirname(filename) == path and filename not in filenames]:
+            del _sprite_index[filename]
+            index_changed = True
+
+        if index_changed:
+            _store_sprite_index(_sprite_index)
+        return [(file, sprites[file]) for file in files if file in sprites]
 
 
 class Sprite():
@@ -527,11 +638,12 @@ class Sprite():
     author_name: Optional[str] = None
     base_data: bytes
 
-    def __init__(self, filename):
+    def __init__(self, filename, filedata: Optional[bytes] = None):
         if not hasattr(Sprite, "base_data"):
             self.get_vanilla_sprite_data()
-        with open(filename, 'rb') as file:
-            filedata = file.read()
+        if filedata is None:
+            with open(filename, 'rb') as file:
+                filedata = file.read()
         self.name = os.path.basename(filename)
         self.valid = True
         if filename.endswith(".apsprite"):
@@ -559,7 +671,8 @@ class Sprite():
         else:
             self.valid = False
 
-    def get_vanilla_sprite_data(self):
+    @staticmethod
+    def get_vanilla_sprite_data():
         file_name = get_base_rom_path()
         base_rom_bytes = bytes(read_snes_rom(open(file_name, "rb")))
         Sprite.sprite = base_rom_bytes[0x80000:0x87000]
@@ -645,7 +758,7 @@ class Sprite():
 
     @staticmethod
     def default_link_sprite():
-        return Sprite(local_path('data', 'default.apsprite'))
+        return load_sprite(local_path('data', 'default.apsprite'))
 
     def decode8(self, pos):
         arr = [[0 for _ in range(8)] for _ in range(8)]
@@ -3006,18 +3119,10 @@ class LttPDeltaPatch(worlds.Files.APDeltaPatch):
 
 
 def get_base_rom_bytes(file_name: str = "") -> bytes:
-    base_rom_bytes = getattr(get_base_rom_bytes, "base_rom_bytes", None)
-    if not base_rom_bytes:
-        file_name = get_base_rom_path(file_name)
-        base_rom_bytes = bytes(read_snes_rom(open(file_name, "rb")))
-
-        basemd5 = hashlib.md5()
-        basemd5.update(base_rom_bytes)
-        if LTTPJPN10HASH != basemd5.hexdigest():
-            raise Exception('Supplied Base Rom does not match known MD5 for Japan(1.0) release. '
-                            'Get the correct game and version, then dump it')
-        get_base_rom_bytes.base_rom_bytes = base_rom_bytes
-    return base_rom_bytes
+    return worlds.Files.get_base_rom_data(get_base_rom_path(file_name), {LTTPJPN10HASH},
+                                          'Supplied Base Rom does not match known MD5 for Japan(1.0) release. '
+                                          'Get the correct game and version, then dump it',
+                                          read_snes_rom)
 
 
 def get_base_rom_path(file_name: str = "") -> str:
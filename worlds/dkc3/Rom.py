@@ -1,14 +1,13 @@
 import Utils
 from Utils import read_snes_rom
 from worlds.AutoWorld import World
-from worlds.Files import APDeltaPatch
+from worlds.Files import APDeltaPatch, get_base_rom_data
 from .Locations import lookup_id_to_name, all_locations
 from .Levels import level_list, level_dict
 
 USHASH = '120abf304f0c40fe059f6a192ed4f947'
 ROM_PLAYER_LIMIT = 65535
 
-import hashlib
 import os
 import math
 
@@ -722,18 +721,10 @@ class DKC3DeltaPatch(APDeltaPatch):
 
 
 def get_base_rom_bytes(file_name: str = "") -> bytes:
-    base_rom_bytes = getattr(get_base_rom_bytes, "base_rom_bytes", None)
-    if not base_rom_bytes:
-        file_name = get_base_rom_path(file_name)
-        base_rom_bytes = bytes(read_snes_rom(open(file_name, "rb")))
-
-        basemd5 = hashlib.md5()
-        basemd5.update(base_rom_bytes)
-        if USHASH != basemd5.hexdigest():
-            raise Exception('Supplied Base Rom does not match known MD5 for US(1.0) release. '
-                            'Get the correct game and version, then dump it')
-        get_base_rom_bytes.base_rom_bytes = base_rom_bytes
-    return base_rom_bytes
+    return get_base_rom_data(get_base_rom_path(file_name), {USHASH},
+                             'Supplied Base Rom does not match known MD5 for US(1.0) release. '
+                             'Get the correct game and version, then dump it',
+                             read_snes_rom)
 
 def get_base_rom_path(file_name: str = "") -> str:
     options = Utils.get_options()
@@ -2,13 +2,12 @@ import typing
 from pkgutil import get_data
 
 import Utils
-from typing import Optional, TYPE_CHECKING
-import hashlib
+from typing import TYPE_CHECKING
 import os
 import struct
 
 import settings
-from worlds.Files import APDeltaPatch
+from worlds.Files import APDeltaPatch, get_base_rom_data
 from .Aesthetics import get_palette_bytes, kirby_target_palettes, get_kirby_palette, gooey_target_palettes, \
     get_gooey_palette
 from .Compression import hal_decompress
@@ -554,18 +553,10 @@ def patch_rom(world: "KDL3World", rom: RomData):
 
 
 def get_base_rom_bytes() -> bytes:
-    rom_file: str = get_base_rom_path()
-    base_rom_bytes: Optional[bytes] = getattr(get_base_rom_bytes, "base_rom_bytes", None)
-    if not base_rom_bytes:
-        base_rom_bytes = bytes(Utils.read_snes_rom(open(rom_file, "rb")))
-
-        basemd5 = hashlib.md5()
-        basemd5.update(base_rom_bytes)
-        if basemd5.hexdigest() not in {KDL3UHASH, KDL3JHASH}:
-            raise Exception("Supplied Base Rom does not match known MD5 for US or JP release. "
-                            "Get the correct game and version, then dump it")
-        get_base_rom_bytes.base_rom_bytes = base_rom_bytes
-    return base_rom_bytes
+    return get_base_rom_data(get_base_rom_path(), {KDL3UHASH, KDL3JHASH},
+                             "Supplied Base Rom does not match known MD5 for US or JP release. "
+                             "Get the correct game and version, then dump it",
+                             Utils.read_snes_rom)
 
 
 def get_base_rom_path(file_name: str = "") -> str:
@@ -1,10 +1,8 @@
-import hashlib
 import os
-from typing import Optional
 
 import Utils
 from settings import get_settings
-from worlds.Files import APDeltaPatch
+from worlds.Files import APDeltaPatch, get_base_rom_data
 
 L2USHASH: str = "6efc477d6203ed2b3b9133c1cd9e9c5d"
 
@@ -20,18 +18,10 @@ class L2ACDeltaPatch(APDeltaPatch):
 
 
 def get_base_rom_bytes(file_name: str = "") -> bytes:
-    base_rom_bytes: Optional[bytes] = getattr(get_base_rom_bytes, "base_rom_bytes", None)
-    if not base_rom_bytes:
-        file_path: str = get_base_rom_path(file_name)
-        base_rom_bytes = bytes(Utils.read_snes_rom(open(file_path, "rb")))
-
-        basemd5 = hashlib.md5()
-        basemd5.update(base_rom_bytes)
-        if L2USHASH != basemd5.hexdigest():
-            raise Exception("Supplied Base Rom does not match known MD5 for US release. "
-                            "Get the correct game and version, then dump it")
-        setattr(get_base_rom_bytes, "base_rom_bytes", base_rom_bytes)
-    return base_rom_bytes
+    return get_base_rom_data(get_base_rom_path(file_name), {L2USHASH},
+                             "Supplied Base Rom does not match known MD5 for US release. "
+                             "Get the correct game and version, then dump it",
+                             Utils.read_snes_rom)
 
 
 def get_base_rom_path(file_name: str = "") -> str:
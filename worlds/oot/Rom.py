@@ -5,10 +5,12 @@ import struct
 import subprocess
 import copy
 import threading
+from tempfile import TemporaryDirectory
 from .Utils import subprocess_args, data_path, get_version_bytes, __version__
 from Utils import user_path
 from .ntype import BigStream
 from .crc import calculate_crc
+from .Yaz0 import compress_rom, decompress_rom, fast_yaz0_compress
 
 DMADATA_START = 0x7430
 
@@ -91,26 +93,12 @@ class Rom(BigStream):
             raise RuntimeError('ROM file %s is not a valid OoT 1.0 US ROM.' % file)
         elif len(self.buffer) == 0x2000000:
             # If Input ROM is compressed, then Decompress it
-
-            sub_dir = data_path("Decompress")
-
-            if platform.system() == 'Windows':
-                subcall = [sub_dir + "\\Decompress.exe", file, decomp_file]
-            elif platform.system() == 'Linux':
-                if platform.uname()[4] == 'aarch64' or platform.uname()[4] == 'arm64':
-                    subcall = [sub_dir + "/Decompress_ARM64", file, decomp_file]
-                else:
-                    subcall = [sub_dir + "/Decompress", file, decomp_file]
-            elif platform.system() == 'Darwin':
-                subcall = [sub_dir + "/Decompress.out", file, decomp_file]
-            else:
-                raise RuntimeError(
-                    'Unsupported operating system for decompression. Please supply an already decompressed ROM.')
-
-            if not os.path.exists(subcall[0]):
-                raise RuntimeError(f'Decompressor does not exist! Please place it at {subcall[0]}.')
-            subprocess.call(subcall, **subprocess_args())
-            self.read_rom(decomp_file)
+            self.buffer = decompress_rom(self.buffer)
+            # other threads may be reading the decompressed rom already
+            temp_file = f'{decomp_file}.{threading.get_ident()}'
+            with open(temp_file, 'wb') as outfile:
+                outfile.write(self.buffer)
+            os.replace(temp_file, decomp_file)
         else:
             # ROM file is a valid and already uncompressed
             pass
@@ -141,6 +129,20 @@ class Rom(BigStream):
         with open(file, 'wb') as outfile:
             outfile.write(self.buffer)
 
+    def write_compressed_to_file(self, file):
+        self.verify_dmadata()
+        self.update_header()
+        compressor_path = get_compressor_path()
+        if compressor_path:
+            with TemporaryDirectory() as work_dir:
+                decomp_file = os.path.join(work_dir, 'decomp.z64')
+                with open(decomp_file, 'wb') as outfile:
+                    outfile.write(self.buffer)
+                run_compressor(compressor_path, decomp_file, file)
+        else:
+            with open(file, 'wb') as outfile:
+                outfile.write(compress_rom(self.buffer))
+
     def update_header(self):
         crc = calculate_crc(self)
         self.write_bytes(0x10, crc)
@@ -281,9 +283,11 @@ class Rom(BigStream):
         return max_end
 
 
-def compress_rom_file(input_file, output_file):
-    compressor_path = "."
-
+def get_compressor_path():
+    # The bundled Compress tool is about twice as fast as the python version of yaz0_compress,
+    # but much slower than the compiled one from _speedups, which works on the ROM in memory.
+    if fast_yaz0_compress:
+        return None
     if platform.system() == 'Windows':
         executable_path = "Compress.exe"
     elif platform.system() == 'Linux':
@@ -294,10 +298,25 @@ def compress_rom_file(input_file, output_file):
     elif platform.system() == 'Darwin':
         executable_path = "Compress.out"
     else:
-        raise RuntimeError('Unsupported operating system for compression.')
-    compressor_path = os.path.join(compressor_path, executable_path)
-    if not os.path.exists(compressor_path):
-        raise RuntimeError(f'Compressor does not exist! Please place it at {compressor_path}.')
+        return None
+    compressor_path = data_path("Compress", executable_path)
+    return compressor_path if os.path.exists(compressor_path) else None
+
+
+def run_compressor(compressor_path, input_file, output_file):
     import logging
-    logging.info(subprocess.check_output([compressor_path, input_file, output_file],
-                                             **subprocess_args(include_stdout=False)))
+    # the tool reads dmaTable.dat from and keeps its ARCHIVE.bin in the working directory
+    logging.info(subprocess.check_output([compressor_path, os.path.abspath(input_file), os.path.abspath(output_file)],
+                                         cwd=os.path.dirname(compressor_path),
+                                         **subprocess_args(include_stdout=False)))
+
+
+def compress_rom_file(input_file, output_file):
+    compressor_path = get_compressor_path()
+    if compressor_path:
+        run_compressor(compressor_path, input_file, output_file)
+        return
+    with open(input_file, 'rb') as stream:
+        rom = stream.read()
+    with open(output_file, 'wb') as outfile:
+        outfile.write(compress_rom(rom))
@@ -1,8 +1,15 @@
 import ast
 from collections import defaultdict
+import hashlib
+from importlib.util import MAGIC_NUMBER
 from inspect import signature, _ParameterKind
 import logging
+import marshal
+import os
+import pickle
 import re
+import sys
+from types import CodeType
 
 from .Items import item_table
 from .Location import OOTLocation
@@ -11,6 +18,7 @@ from BaseClasses import CollectionState as State
 from .Utils import data_path, read_json
 
 from worlds.generic.Rules import set_rule
+from Utils import cache_path, restricted_loads
 
 
 escaped_items = {}
@@ -46,6 +54,99 @@ def load_aliases():
     nonaliases = escaped_items.keys() - rule_aliases.keys()
 
 
+# Parsed rules only depend on the settings read while parsing them, not on the player,
+# so they are shared between all worlds and kept on disk between generations.
+# map (rule string, region name, spot type) -> [(settings read, events, rule ast string)]
+parsed_rules = defaultdict(list)
+# map rule ast string -> code object creating the rule for the given kwarg_defaults
+compiled_rules = {}
+rule_cache_changed = False
+# bumped whenever the layout of the cache file changes
+rule_cache_format_version = 1
+# settings combinations kept per rule key, older ones are dropped first
+rule_cache_max_variants = 8
+
+
+def get_rule_cache_path():
+    # code objects are specific to the python version, the parser itself depends on items and aliases
+    digest = hashlib.sha256(MAGIC_NUMBER)
+    for file_path in (__file__, os.path.join(os.path.dirname(__file__), 'Items.py'), data_path('LogicHelpers.json')):
+        with open(file_path, 'rb') as file:
+            digest.update(file.read())
+    return cache_path('oot', f'rules_{digest.hexdigest()[:16]}.pickle')
+
+
+def is_valid_rule_cache(rule_cache):
+    if not isinstance(rule_cache, dict) or \
+            rule_cache.get('version') != (rule_cache_format_version, tuple(sys.version_info[:2])):
+        return False
+    compiled = rule_cache.get('compiled')
+    parsed = rule_cache.get('parsed')
+    if not isinstance(compiled, dict) or not isinstance(parsed, dict):
+        return False
+    if not all(isinstance(rule_str, str) and isinstance(code, bytes) for rule_str, code in compiled.items()):
+        return False
+    for rule_key, variants in parsed.items():
+        if not (isinstance(rule_key, tuple) and len(rule_key) == 3 and isinstance(rule_key[0], str)
+                and all(part is None or isinstance(part, str) for part in rule_key[1:])):
+            return False
+        if not isinstance(variants, list) or len(variants) > rule_cache_max_variants:
+            return False
+        for variant in variants:
+            if not (isinstance(variant, tuple) and len(variant) == 3):
+                return False
+            used_settings, events, rule_str = variant
+            if not (isinstance(used_settings, tuple)
+                    and all(isinstance(setting, tuple) and len(setting) == 2 and isinstance(setting[0], str)
+                            and (setting[1] is None or isinstance(setting[1], str)) for setting in used_settings)):
+                return False
+            if not (isinstance(events, frozenset) and all(isinstance(event, str) for event in events)):
+                return False
+            if rule_str not in compiled:
+                return False
+    return True
+
+
+def load_rule_cache():
+    try:
+        with open(get_rule_cache_path(), 'rb') as file:
+            rule_cache = restricted_loads(file.read())
+        if not is_valid_rule_cache(rule_cache):
+            logging.getLogger('').debug('Ignoring outdated or malformed OoT rule cache.')
+            return
+        compiled = {rule_str: marshal.loads(code) for rule_str, code in rule_cache['compiled'].items()}
+        if not all(isinstance(code, CodeType) for code in compiled.values()):
+            logging.getLogger('').debug('Ignoring malformed OoT rule cache.')
+            return
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        logging.getLogger('').debug('Could not load cached OoT rules: %s', e)
+        return
+    compiled_rules.update(compiled)
+    parsed_rules.update(rule_cache['parsed'])
+
+
+def save_rule_cache():
+    global rule_cache_changed
+    if not rule_cache_changed:
+        return
+    try:
+        cache_file = get_rule_cache_path()
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temp_file = f'{cache_file}.{os.getpid()}'
+        with open(temp_file, 'wb') as file:
+            pickle.dump({
+                'version': (rule_cache_format_version, tuple(sys.version_info[:2])),
+                'parsed': dict(parsed_rules),
+                'compiled': {rule_str: marshal.dumps(code) for rule_str, code in compiled_rules.items()},
+            }, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)  # concurrent generations may write the same file
+    except Exception as e:
+        logging.getLogger('').debug('Could not cache OoT rules: %s', e)
+    rule_cache_changed = False
+
+
 def isliteral(expr):
     return isinstance(expr, (ast.Num, ast.Str, ast.Bytes, ast.NameConstant))
 
@@ -63,12 +164,27 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         # lazy load aliases
         if not rule_aliases:
             load_aliases()
+            load_rule_cache()
         # final rule cache
         self.rule_cache = {}
+        # settings read while parsing the current rule, and whether it can be shared with other worlds
+        self.used_settings = {}
+        self.cacheable = True
         self.kwarg_defaults = kwarg_defaults.copy()  # otherwise this gets contaminated between players
         self.kwarg_defaults['player'] = self.player
 
 
+    def has_setting(self, name):
+        settings = self.multiworld.__dict__
+        self.used_settings[name] = repr(settings[name]) if name in settings else None
+        return name in settings
+
+    def get_setting(self, name):
+        value = getattr(self.multiworld, name)
+        self.used_settings[name] = repr(value)
+        return value
+
+
     def visit_Name(self, node):
         if node.id in dir(self):
             return getattr(self, node.id)(node)
@@ -84,11 +200,11 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has',
                     ctx=ast.Load()),
-                args=[ast.Str(escaped_items[node.id]), ast.Constant(self.player)],
+                args=[ast.Str(escaped_items[node.id]), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])
-        elif node.id in self.multiworld.__dict__:
+        elif self.has_setting(node.id):
             # Settings are constant
-            return ast.parse('%r' % self.multiworld.__dict__[node.id], mode='eval').body
+            return ast.parse('%r' % self.get_setting(node.id), mode='eval').body
         elif node.id in State.__dict__:
             return self.make_call(node, node.id, [], [])
         elif node.id in self.kwarg_defaults or node.id in allowed_globals:
@@ -100,7 +216,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has',
                     ctx=ast.Load()),
-                args=[ast.Str(node.id.replace('_', ' ')), ast.Constant(self.player)],
+                args=[ast.Str(node.id.replace('_', ' ')), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])
         else:
             raise Exception('Parse Error: invalid node name %s' % node.id, self.current_spot.name, ast.dump(node, False))
@@ -111,7 +227,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(node.s), ast.Constant(self.player)],
+            args=[ast.Str(node.s), ast.Name(id='player', ctx=ast.Load())],
             keywords=[])
 
     # python 3.8 compatibility: ast walking now uses visit_Constant for Constant subclasses
@@ -137,7 +253,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
         if isinstance(count, ast.Name):
             # Must be a settings constant
-            count = ast.parse('%r' % self.multiworld.__dict__[count.id], mode='eval').body
+            count = ast.parse('%r' % self.get_setting(count.id), mode='eval').body
 
         if iname in escaped_items:
             iname = escaped_items[iname]
@@ -150,7 +266,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(iname), ast.Constant(self.player), count],
+            args=[ast.Str(iname), ast.Name(id='player', ctx=ast.Load()), count],
             keywords=[])
 
 
@@ -182,7 +298,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         new_args = []
         for child in node.args:
             if isinstance(child, ast.Name):
-                if child.id in self.multiworld.__dict__:
+                if self.has_setting(child.id):
                     # child = ast.Attribute(
                     #     value=ast.Attribute(
                     #         value=ast.Name(id='state', ctx=ast.Load()),
@@ -190,7 +306,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     #         ctx=ast.Load()),
                     #     attr=child.id,
                     #     ctx=ast.Load())
-                    child = ast.Constant(getattr(self.multiworld, child.id))
+                    child = ast.Constant(self.get_setting(child.id))
                 elif child.id in rule_aliases:
                     child = self.visit(child)
                 elif child.id in escaped_items:
@@ -221,7 +337,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                                 ctx=ast.Load()),
                             attr='worlds',
                             ctx=ast.Load()),
-                        slice=ast.Index(value=ast.Constant(self.player)),
+                        slice=ast.Index(value=ast.Name(id='player', ctx=ast.Load())),
                         ctx=ast.Load()),
                     attr=node.value.id,
                     ctx=ast.Load()),
@@ -242,7 +358,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         # Fast check for json can_use
         if (len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq)
                 and isinstance(node.left, ast.Name) and isinstance(node.comparators[0], ast.Name)
-                and node.left.id not in self.multiworld.__dict__ and node.comparators[0].id not in self.multiworld.__dict__):
+                and not self.has_setting(node.left.id) and not self.has_setting(node.comparators[0].id)):
             return ast.NameConstant(node.left.id == node.comparators[0].id)
 
         node.left = escape_or_string(node.left)
@@ -325,7 +441,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has_any' if early_return else 'has_all',
                     ctx=ast.Load()),
-                args=[ast.Tuple(elts=[ast.Str(i) for i in items], ctx=ast.Load()), ast.Constant(self.player)],
+                args=[ast.Tuple(elts=[ast.Str(i) for i in items], ctx=ast.Load()), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])] + new_values
         else:
             node.values = new_values
@@ -341,8 +457,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         if not hasattr(State, name):
             raise Exception('Parse Error: No such function State.%s' % name, self.current_spot.name, ast.dump(node, False))
 
-        for (k, v) in self.kwarg_defaults.items():
-            keywords.append(ast.keyword(arg=f'{k}', value=ast.Constant(v)))
+        for k in self.kwarg_defaults:
+            keywords.append(ast.keyword(arg=f'{k}', value=ast.Name(id=k, ctx=ast.Load())))
 
         return ast.Call(
             func=ast.Attribute(
@@ -354,6 +470,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
 
     def replace_subrule(self, target, node):
+        # subrule names depend on the rules parsed before in this world
+        self.cacheable = False
         rule = ast.dump(node, False)
         if rule in self.replaced_rules[target]:
             return self.replaced_rules[target][rule]
@@ -367,7 +485,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(subrule_name), ast.Constant(self.player)],
+            args=[ast.Str(subrule_name), ast.Name(id='player', ctx=ast.Load())],
             keywords=[])
         # Cache the subrule for any others in this region
         # (and reserve the item name in the process)
@@ -401,27 +519,47 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
 
     def make_access_rule(self, body):
+        return self.bind_access_rule(self.compile_access_rule(body))
+
+
+    # Compiles a function returning the rule for the given kwarg_defaults (the player),
+    # so it can be shared by all worlds. Returns the key of the compiled rule.
+    def compile_access_rule(self, body):
+        global rule_cache_changed
         rule_str = ast.dump(body, False)
-        if rule_str not in self.rule_cache:
+        if rule_str not in compiled_rules:
             # requires consistent iteration on dicts
             kwargs = [ast.arg(arg=k) for k in self.kwarg_defaults.keys()]
-            kwd = list(map(ast.Constant, self.kwarg_defaults.values()))
+            kwd = [ast.Name(id=k, ctx=ast.Load()) for k in self.kwarg_defaults.keys()]
             try:
-                self.rule_cache[rule_str] = eval(compile(
+                compiled_rules[rule_str] = compile(
                     ast.fix_missing_locations(
                         ast.Expression(ast.Lambda(
                             args=ast.arguments(
                                 posonlyargs=[],
-                                args=[ast.arg(arg='state')],
+                                args=kwargs,
                                 defaults=[],
-                                kwonlyargs=kwargs,
-                                kw_defaults=kwd),
-                            body=body))),
-                    '<string>', 'eval'),
-                    # globals/locals. if undefined, everything in the namespace *now* would be allowed
-                    allowed_globals)
+                                kwonlyargs=[],
+                                kw_defaults=[]),
+                            body=ast.Lambda(
+                                args=ast.arguments(
+                                    posonlyargs=[],
+                                    args=[ast.arg(arg='state')],
+                                    defaults=[],
+                                    kwonlyargs=kwargs,
+                                    kw_defaults=kwd),
+                                body=body)))),
+                    '<string>', 'eval')
             except TypeError as e:
                 raise Exception('Parse Error: %s' % e, self.current_spot.name, ast.dump(body, False))
+            rule_cache_changed = True
+        return rule_str
+
+
+    def bind_access_rule(self, rule_str):
+        if rule_str not in self.rule_cache:
+            # globals/locals. if undefined, everything in the namespace *now* would be allowed
+            self.rule_cache[rule_str] = eval(compiled_rules[rule_str], allowed_globals)(**self.kwarg_defaults)
         return self.rule_cache[rule_str]
 
 
@@ -448,7 +586,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     ## Handlers for compile-time optimizations (former State functions)
 
     def at_day(self, node):
-        if self.multiworld.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAY or (tod == NONE and (ss or find a path from a provider))
             # parsing is better than constructing this expression by hand
             r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
@@ -456,7 +594,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         return ast.NameConstant(True)
 
     def at_dampe_time(self, node):
-        if self.multiworld.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAMPE or (tod == NONE and (find a path from a provider))
             # parsing is better than constructing this expression by hand
             r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
@@ -464,10 +602,10 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         return ast.NameConstant(True)
 
     def at_night(self, node):
-        if self.current_spot.type == 'GS Token' and self.multiworld.logic_no_night_tokens_without_suns_song:
+        if self.current_spot.type == 'GS Token' and self.get_setting('logic_no_night_tokens_without_suns_song'):
             # Using visit here to resolve 'can_play' rule
             return self.visit(ast.parse('can_play(Suns_Song)', mode='eval').body)
-        if self.multiworld.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAMPE or (tod == NONE and (ss or find a path from a provider))
             # parsing is better than constructing this expression by hand
             r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
@@ -478,8 +616,35 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     # Parse entry point
     # If spot is None, here() rules won't work.
     def parse_rule(self, rule_string, spot=None):
+        global rule_cache_changed
         self.current_spot = spot
-        return self.make_access_rule(self.visit(ast.parse(rule_string, mode='eval').body))
+        if spot is None:
+            rule_key = (rule_string, None, None)
+        else:
+            r = spot if type(spot) == OOTRegion else spot.parent_region
+            rule_key = (rule_string, r.name if r else None, getattr(spot, 'type', None))
+
+        settings = self.multiworld.__dict__
+        for used_settings, events, rule_str in parsed_rules.get(rule_key, ()):
+            if all((repr(settings[name]) if name in settings else None) == value for name, value in used_settings):
+                self.events.update(events)
+                return self.bind_access_rule(rule_str)
+
+        events, self.events = self.events, set()
+        self.used_settings = {}
+        self.cacheable = True
+        try:
+            body = self.visit(ast.parse(rule_string, mode='eval').body)
+        finally:
+            parsed_events, self.events = self.events, events
+            self.events.update(parsed_events)
+        rule_str = self.compile_access_rule(body)
+        if self.cacheable:
+            variants = parsed_rules[rule_key]
+            variants.append((tuple(self.used_settings.items()), frozenset(parsed_events), rule_str))
+            del variants[:-rule_cache_max_variants]
+            rule_cache_changed = True
+        return self.bind_access_rule(rule_str)
 
     def parse_spot_rule(self, spot):
         rule = spot.rule_string.split('#', 1)[0].strip()
@@ -494,20 +659,20 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     # Hijacking functions
     def current_spot_child_access(self, node): 
         r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'child', {self.player})", mode='eval').body
+        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'child', player)", mode='eval').body
 
     def current_spot_adult_access(self, node): 
         r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'adult', {self.player})", mode='eval').body
+        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'adult', player)", mode='eval').body
 
     def current_spot_starting_age_access(self, node): 
-        return self.current_spot_child_access(node) if self.multiworld.starting_age == 'child' else self.current_spot_adult_access(node)
+        return self.current_spot_child_access(node) if self.get_setting('starting_age') == 'child' else self.current_spot_adult_access(node)
 
     def has_bottle(self, node): 
-        return ast.parse(f"state._oot_has_bottle({self.player})", mode='eval').body
+        return ast.parse("state._oot_has_bottle(player)", mode='eval').body
 
     def can_live_dmg(self, node):
-        return ast.parse(f"state._oot_can_live_dmg({self.player}, {node.args[0].value})", mode='eval').body
+        return ast.parse(f"state._oot_can_live_dmg(player, {node.args[0].value})", mode='eval').body
 
     def region_has_shortcuts(self, node):
-        return ast.parse(f"state._oot_region_has_shortcuts({self.player}, '{node.args[0].value}')", mode='eval').body
+        return ast.parse(f"state._oot_region_has_shortcuts(player, '{node.args[0].value}')", mode='eval').body
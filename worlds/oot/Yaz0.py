@@ -0,0 +1,312 @@
+import bisect
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from Utils import cache_path, restricted_loads
+from .crc import calculate_crc
+from .ntype import BigStream
+from .Utils import data_path
+
+# Python versions of the Compress and Decompress tools in data/, producing the same ROMs without a subprocess.
+
+try:
+    # compiled version of yaz0_compress, several times faster than the Compress tool
+    from _speedups import yaz0_compress as fast_yaz0_compress
+except ImportError:
+    fast_yaz0_compress = None
+
+UINTSIZE = 0x1000000
+COMPSIZE = 0x2000000
+DCMPSIZE = 0x4000000
+
+MAKEROM_RECORD = struct.pack('>II', 0x00000000, 0x00001060)
+CIC_6105_CRC = 0x98BC2C86
+
+MAX_DISTANCE = 0x1000
+MAX_LENGTH = 0x111
+
+
+# Like the tools, looks for the dmadata record of the makerom, which starts the dmadata table.
+def find_dma_table(rom):
+    pos = rom.find(MAKEROM_RECORD, 1048 * 4)
+    while pos != -1 and pos + 16 < UINTSIZE * 4:
+        if pos % 16 == 0:
+            return pos
+        pos = rom.find(MAKEROM_RECORD, pos + 1)
+    raise Exception("Couldn't find dma table in ROM!")
+
+
+def get_dma_records(rom):
+    table_start = find_dma_table(rom)
+    dma_start, dma_end, _, _ = struct.unpack_from('>IIII', rom, table_start + 0x20)
+    return table_start, [struct.unpack_from('>IIII', rom, table_start + i * 0x10)
+                         for i in range((dma_end - dma_start) // 0x10)]
+
+
+def fix_crc(rom):
+    # Only OoT's boot code is supported, the tools leave other ROMs unchanged.
+    if zlib.crc32(rom[0x40:0x1000]) == CIC_6105_CRC:
+        rom[0x10:0x18] = calculate_crc(BigStream(rom))
+
+
+def yaz0_decompress(data, size):
+    data = memoryview(data)
+    out = bytearray(size)
+    src = 0x10
+    dst = 0
+    code_byte = 0
+    bit_count = 0
+    while dst < size:
+        if not bit_count:
+            code_byte = data[src]
+            src += 1
+            bit_count = 8
+            if code_byte == 0xFF and dst + 8 <= size:
+                out[dst:dst + 8] = data[src:src + 8]
+                src += 8
+                dst += 8
+                bit_count = 0
+                continue
+
+        if code_byte & 0x80:
+            out[dst] = data[src]
+            src += 1
+            dst += 1
+        else:
+            byte1 = data[src]
+            byte2 = data[src + 1]
+            src += 2
+            copy_pos = dst - (((byte1 & 0xF) << 8) | byte2) - 1
+            length = byte1 >> 4
+            if length:
+                length += 2
+            else:
+                length = data[src] + 0x12
+                src += 1
+            if copy_pos + length <= dst:
+                out[dst:dst + length] = out[copy_pos:copy_pos + length]
+            else:
+                # the copy overlaps itself, repeating the bytes between copy_pos and dst
+                pattern = out[copy_pos:dst]
+                out[dst:dst + length] = (pattern * (length // len(pattern) + 1))[:length]
+            dst += length
+
+        code_byte = (code_byte << 1) & 0xFF
+        bit_count -= 1
+    return out
+
+
+# Returns the size and position of the longest earliest match of data at pos within the last 0x1000 bytes.
+def find_match(data, positions, pos):
+    size = len(data)
+    limit = min(size - pos, MAX_LENGTH)
+    if limit < 3:
+        return 0, 0
+    candidates = positions.get(data[pos:pos + 3])
+    best_size = best_pos = 0
+    if not candidates:
+        return best_size, best_pos
+    start = bisect.bisect_left(candidates, pos - MAX_DISTANCE)
+    end = bisect.bisect_left(candidates, pos, start)
+    for i in candidates[start:end]:
+        if best_size:
+            # to be better, a match has to include the byte after the best match so far
+            if data[i + best_size] != data[pos + best_size] \
+                    or data[i + 3:i + best_size] != data[pos + 3:pos + best_size]:
+                continue
+            length = best_size + 1
+        else:
+            length = 3
+        while length < limit and data[i + length] == data[pos + length]:
+            length += 1
+        best_size = length
+        best_pos = i
+        if length == limit:
+            break
+    return best_size, best_pos
+
+
+def yaz0_compress(data):
+    data = bytes(data)
+    size = len(data)
+    positions = {}
+    for i in range(size - 2):
+        key = data[i:i + 3]
+        if key in positions:
+            positions[key].append(i)
+        else:
+            positions[key] = [i]
+
+    out = bytearray(b'Yaz0' + struct.pack('>I', size) + bytes(8))
+    src = 0
+    code_byte_pos = len(out)
+    out.append(0)
+    code_byte = 0
+    bitmask = 0x80
+    lookahead = None
+    while src < size:
+        if lookahead:
+            length, match_pos = lookahead
+            lookahead = None
+        else:
+            length, match_pos = find_match(data, positions, src)
+            if length >= 3:
+                # prefer a single byte if it leads to a much longer match
+                next_length, next_pos = find_match(data, positions, src + 1)
+                if next_length >= length + 2:
+                    length = 1
+                    lookahead = next_length, next_pos
+
+        if length < 3:
+            out.append(data[src])
+            src += 1
+            code_byte |= bitmask
+        else:
+            distance = src - match_pos - 1
+            if length > 0x11:
+                out += bytes((distance >> 8, distance & 0xFF, length - 0x12))
+            else:
+                out += bytes((((length - 2) << 4) | (distance >> 8), distance & 0xFF))
+            src += length
+
+        bitmask >>= 1
+        if not bitmask:
+            out[code_byte_pos] = code_byte
+            code_byte_pos = len(out)
+            if src < size:
+                out.append(0)
+            code_byte = 0
+            bitmask = 0x80
+
+    if bitmask != 0x80 or not size:
+        out[code_byte_pos] = code_byte
+    out += bytes(-len(out) % 16)
+    return bytes(out)
+
+
+def get_file_exclusions(file_count):
+    # 0: keep the file uncompressed, 1: compress, 2: the file shouldn't exist
+    exclusions = bytearray([1]) * file_count
+    exclusions[0:3] = bytes(3)
+    with open(data_path('Compress', 'dmaTable.dat'), 'r') as stream:
+        for entry in stream.read().split():
+            index = int(entry)
+            if abs(index) >= file_count:
+                raise Exception(f'Entry {entry} in dmaTable.dat is out of bounds')
+            if index < 0:
+                exclusions[-index] = 2
+            else:
+                exclusions[index] = 0
+    return exclusions
+
+
+def load_compress_archive():
+    try:
+        with open(cache_path('oot', 'compress_archive.pickle'), 'rb') as stream:
+            archive = restricted_loads(stream.read())
+        if isinstance(archive, dict) and \
+                all(isinstance(key, bytes) and isinstance(value, bytes) for key, value in archive.items()):
+            return archive
+        logging.debug('Ignoring malformed OoT compression archive.')
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.debug(f'Could not load OoT compression archive: {e}')
+    return {}
+
+
+# Like the ARCHIVE.bin of the Compress tool, keeps the compressed files of the last ROM to reuse them.
+def store_compress_archive(archive):
+    try:
+        archive_file = cache_path('oot', 'compress_archive.pickle')
+        os.makedirs(os.path.dirname(archive_file), exist_ok=True)
+        temp_file = f'{archive_file}.{os.getpid()}'
+        with open(temp_file, 'wb') as stream:
+            pickle.dump(archive, stream, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, archive_file)
+    except Exception as e:
+        logging.debug(f'Could not store OoT compression archive: {e}')
+
+
+def compress_rom(rom):
+    table_start, records = get_dma_records(rom)
+    rom = memoryview(rom)
+    exclusions = get_file_exclusions(len(records))
+    archive = load_compress_archive()
+    new_archive = {}
+
+    files = [b''] * len(records)
+    to_compress = []
+    for i in range(3, len(records)):
+        start_v, end_v, _, _ = records[i]
+        if exclusions[i] == 1:
+            key = hashlib.sha256(rom[start_v:end_v]).digest()
+            if key in archive:
+                files[i] = new_archive[key] = archive[key]
+            else:
+                to_compress.append(i)
+        elif exclusions[i] == 0:
+            files[i] = rom[start_v:end_v]
+
+    if to_compress:
+        logging.info(f'Compressing {len(to_compress)} files.')
+        sources = [rom[records[i][0]:records[i][1]].tobytes() for i in to_compress]
+        # the compiled version releases the GIL, the python version needs processes to use all cores
+        if fast_yaz0_compress:
+            pool, compress = ThreadPoolExecutor(), fast_yaz0_compress
+        else:
+            pool, compress = ProcessPoolExecutor(), yaz0_compress
+        with pool:
+            for i, source, compressed in zip(to_compress, sources, pool.map(compress, sources)):
+                files[i] = new_archive[hashlib.sha256(source).digest()] = compressed
+    store_compress_archive(new_archive)
+
+    prefix_size = table_start + records[2][1] - records[2][0]
+    out = bytearray(max(COMPSIZE, prefix_size + sum(map(len, files))))
+    out[:prefix_size] = rom[:prefix_size]
+    pos = prefix_size
+    for i in range(3, len(records)):
+        start_v, end_v, start_p, end_p = records[i]
+        data = files[i]
+        if start_v != end_v:
+            start_p = pos
+            if exclusions[i] == 1:
+                end_p = start_p + len(data)
+            elif exclusions[i] == 2:
+                start_p = end_p = 0xFFFFFFFF
+            if start_p != 0xFFFFFFFF:
+                out[start_p:start_p + len(data)] = data
+            struct.pack_into('>IIII', out, table_start + i * 0x10, start_v, end_v, start_p, end_p)
+        pos += len(data)
+
+    fix_crc(out)
+    return out
+
+
+def decompress_rom(rom):
+    rom = bytearray(rom)
+    if rom[0] == 0x37:
+        # byteswapped ROM
+        rom[0::2], rom[1::2] = rom[1::2], rom[0::2]
+    table_start, records = get_dma_records(rom)
+
+    out = bytearray(DCMPSIZE)
+    dma_end = records[2][1]
+    out[:dma_end] = rom[:dma_end]
+    for i in range(3, len(records)):
+        start_v, end_v, start_p, end_p = records[i]
+        if start_p >= DCMPSIZE or end_p == 0xFFFFFFFF:
+            continue
+        if end_p == 0:
+            out[start_v:end_v] = rom[start_p:start_p + end_v - start_v]
+        else:
+            out[start_v:end_v] = yaz0_decompress(memoryview(rom)[start_p:end_p], end_v - start_v)
+        struct.pack_into('>IIII', out, table_start + i * 0x10, start_v, end_v, start_v, 0)
+
+    fix_crc(out)
+    return out
@@ -19,7 +19,7 @@ from .Items import OOTItem, item_table, oot_data_to_ap_id, oot_is_item_of_type
 from .ItemPool import generate_itempool, get_junk_item, get_junk_pool
 from .Regions import OOTRegion, TimeOfDay
 from .Rules import set_rules, set_shop_rules, set_entrances_based_rules
-from .RuleParser import Rule_AST_Transformer
+from .RuleParser import Rule_AST_Transformer, save_rule_cache
 from .Options import oot_options
 from .Utils import data_path, read_json
 from .LocationList import business_scrubs, set_drop_location_names, dungeon_song_locations
@@ -824,6 +824,12 @@ class OOTWorld(World):
         set_entrances_based_rules(self)
 
 
+    @classmethod
+    def stage_set_rules(cls, multiworld: MultiWorld):
+        # Keep the rules parsed for all worlds for the next generation
+        save_rule_cache()
+
+
     def generate_basic(self):  # mostly killing locations that shouldn't exist by settings
 
         # Gather items for ice trap appearances
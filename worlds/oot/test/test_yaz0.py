@@ -0,0 +1,121 @@
+import os
+import platform
+import random
+import shutil
+import struct
+import subprocess
+import unittest
+from tempfile import TemporaryDirectory
+
+import Utils
+from ..Utils import data_path
+from ..Yaz0 import compress_rom, decompress_rom, fast_yaz0_compress, get_dma_records, yaz0_compress, yaz0_decompress
+
+
+def random_bytes(rng, size):
+    # Random.randbytes and getrandbits(0) require python 3.9
+    return rng.getrandbits(8 * size).to_bytes(size, "little") if size else b""
+
+
+def get_test_files():
+    rng = random.Random(0)
+    with open(data_path("Triforce.zobj"), "rb") as stream:
+        model = stream.read()
+    with open(__file__, "rb") as stream:
+        text = stream.read()
+    files = []
+    for i in range(40):
+        kind = i % 5
+        size = rng.randrange(0x40, 0x4000)
+        if kind == 0:
+            start = rng.randrange(len(model) - size) if len(model) > size else 0
+            files.append(model[start:start + size])
+        elif kind == 1:
+            # the Compress tool only has room for 0x250 bytes more than the file
+            files.append(random_bytes(rng, size % 0x1000))
+        elif kind == 2:
+            files.append(bytes(size))
+        elif kind == 3:
+            files.append(random_bytes(rng, rng.randrange(1, 0x30)) * (size // 8))
+        else:
+            files.append(text[:size])
+    files[20] = b""
+    return files
+
+
+# Builds a decompressed ROM with the makerom, boot and dmadata files, followed by the given files.
+# The dmadata table is padded with empty records to the size the exclusion list expects.
+def make_rom(files):
+    rng = random.Random(1)
+    table_start = 0x7430
+    records = [(0, 0x1060), (0x1060, table_start), (table_start, table_start + 1530 * 0x10)]
+    pos = 0x10000
+    for data in files:
+        records.append((pos, pos + len(data)))
+        pos = (pos + len(data) + 0xF) & ~0xF
+    records += [(0, 0)] * (1530 - len(records))
+
+    rom = bytearray(max(pos, 0x200000))
+    rom[:table_start] = random_bytes(rng, table_start)
+    for i, (start, end) in enumerate(records):
+        struct.pack_into(">IIII", rom, table_start + i * 0x10, start, end, start if end else 0, 0)
+    for (start, end), data in zip(records[3:], files):
+        rom[start:end] = data
+    return rom
+
+
+class TestYaz0(unittest.TestCase):
+    def setUp(self):
+        # keep the compression archive of the tests separate
+        Utils.cache_path()
+        self.original_cache_path = Utils.cache_path.cached_path
+        self.cache_dir = TemporaryDirectory(prefix="AP_cache_")
+        Utils.cache_path.cached_path = self.cache_dir.name
+
+    def tearDown(self):
+        Utils.cache_path.cached_path = self.original_cache_path
+        self.cache_dir.cleanup()
+
+    def test_round_trip(self):
+        for data in get_test_files():
+            with self.subTest(size=len(data)):
+                self.assertEqual(yaz0_decompress(yaz0_compress(data), len(data)), data)
+
+    @unittest.skipUnless(fast_yaz0_compress, "_speedups not available")
+    def test_fast_compress(self):
+        for data in get_test_files():
+            with self.subTest(size=len(data)):
+                self.assertEqual(fast_yaz0_compress(data), yaz0_compress(data))
+
+    def test_rom_round_trip(self):
+        files = get_test_files()
+        rom = decompress_rom(compress_rom(make_rom(files)))
+        _, records = get_dma_records(rom)
+        for (start, end, _, _), data in zip(records[3:], files):
+            self.assertEqual(rom[start:end], data)
+        # compressing again reuses the archive
+        self.assertEqual(compress_rom(make_rom(files)), compress_rom(make_rom(files)))
+
+    @unittest.skipUnless(platform.system() == "Linux" and platform.machine() == "x86_64",
+                         "requires the Linux x86_64 Compress and Decompress binaries")
+    def test_matches_binaries(self):
+        rom = make_rom(get_test_files())
+        with TemporaryDirectory() as work_dir:
+            shutil.copy(data_path("Compress", "dmaTable.dat"), work_dir)
+            with open(os.path.join(work_dir, "rom.z64"), "wb") as stream:
+                stream.write(rom)
+            subprocess.run([data_path("Compress", "Compress"), "rom.z64", "comp.z64"],
+                           cwd=work_dir, check=True, capture_output=True)
+            subprocess.run([data_path("Decompress", "Decompress"), "comp.z64", "decomp.z64"],
+                           cwd=work_dir, check=True, capture_output=True)
+            with open(os.path.join(work_dir, "comp.z64"), "rb") as stream:
+                compressed = stream.read()
+            with open(os.path.join(work_dir, "decomp.z64"), "rb") as stream:
+                decompressed = stream.read()
+
+        _, records = get_dma_records(compressed)
+        for start_v, end_v, start_p, end_p in records[3:]:
+            if end_p not in (0, 0xFFFFFFFF):
+                self.assertEqual(yaz0_compress(rom[start_v:end_v]), compressed[start_p:end_p])
+        self.assertEqual(compress_rom(rom), compressed)
+        self.assertEqual(decompress_rom(compressed), decompressed)
@@ -1,10 +1,9 @@
-import hashlib
 import os
 
 import json
 import Utils
 from Utils import read_snes_rom
-from worlds.Files import APDeltaPatch
+from worlds.Files import APDeltaPatch, get_base_rom_data
 from .variaRandomizer.utils.utils import openFile
 
 SMJUHASH = '21f3e98df4780ee1c667b84e57d88675'
@@ -21,18 +20,10 @@ class SMDeltaPatch(APDeltaPatch):
         return get_base_rom_bytes()
 
 def get_base_rom_bytes(file_name: str = "") -> bytes:
-    base_rom_bytes = getattr(get_base_rom_bytes, "base_rom_bytes", None)
-    if not base_rom_bytes:
-        file_name = get_base_rom_path(file_name)
-        base_rom_bytes = bytes(read_snes_rom(open(file_name, "rb")))
-
-        basemd5 = hashlib.md5()
-        basemd5.update(base_rom_bytes)
-        if SMJUHASH != basemd5.hexdigest():
-            raise Exception('Supplied Base Rom does not match known MD5 for Japan+US release. '
-                            'Get the correct game and version, then dump it')
-        get_base_rom_bytes.base_rom_bytes = base_rom_bytes
-    return base_rom_bytes
+    return get_base_rom_data(get_base_rom_path(file_name), {SMJUHASH},
+                             'Supplied Base Rom does not match known MD5 for Japan+US release. '
+                             'Get the correct game and version, then dump it',
+                             read_snes_rom)
 
 
 def get_base_rom_path(file_name: str = "") -> str:
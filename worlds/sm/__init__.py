@@ -5,6 +5,7 @@ import copy
 import logging
 import threading
 import typing
+from collections import OrderedDict
 from typing import Any, Dict, Iterable, List, Set, TextIO, TypedDict
 
 import settings
@@ -112,12 +113,16 @@ class SMWorld(World):
     required_client_version = (0, 2, 6)
 
     itemManager: ItemManager
+    # results of the rules for the most recent item states, oldest first
+    ruleCache: typing.OrderedDict[typing.Tuple[typing.Callable, int, int, bool], bool]
+    ruleCacheSize = 0x10000
 
     Logic.factory('vanilla')
 
     def __init__(self, world: MultiWorld, player: int):
         self.rom_name_available_event = threading.Event()
         self.locations = {}
+        self.ruleCache = OrderedDict()
         super().__init__(world, player)
 
     @classmethod
@@ -207,21 +212,35 @@ class SMWorld(World):
     def evalSMBool(self, smbool, maxDiff):
         return smbool.bool == True and smbool.difficulty <= maxDiff
 
+    def evalRule(self, func, smbm):
+        # the result of a rule only depends on the items of the SMBoolManager, so it is shared by all states
+        key = (func, smbm.cacheKey, smbm.maxDiff, smbm.onlyBossLeft)
+        ruleCache = self.ruleCache
+        ret = ruleCache.get(key)
+        if ret is None:
+            ret = self.evalSMBool(func(smbm), smbm.maxDiff)
+            ruleCache[key] = ret
+            if len(ruleCache) > self.ruleCacheSize:
+                ruleCache.popitem(last=False)
+        else:
+            ruleCache.move_to_end(key)
+        return ret
+
     def add_entrance_rule(self, entrance, player, func):
-        add_rule(entrance, lambda state: self.evalSMBool(func(state.smbm[player]), state.smbm[player].maxDiff))
+        add_rule(entrance, lambda state: self.evalRule(func, state.smbm[player]))
 
     def set_rules(self):
         def add_accessFrom_rule(location, player, accessFrom):
-            add_rule(location, lambda state: any((state.can_reach(accessName, player=player) and self.evalSMBool(rule(state.smbm[player]), state.smbm[player].maxDiff)) for accessName, rule in accessFrom.items()))
+            add_rule(location, lambda state: any((state.can_reach(accessName, player=player) and self.evalRule(rule, state.smbm[player])) for accessName, rule in accessFrom.items()))
 
         def add_postAvailable_rule(location, player, func):
-            add_rule(location, lambda state: self.evalSMBool(func(state.smbm[player]), state.smbm[player].maxDiff))
+            add_rule(location, lambda state: self.evalRule(func, state.smbm[player]))
 
         def set_available_rule(location, player, func):
-            set_rule(location, lambda state: self.evalSMBool(func(state.smbm[player]), state.smbm[player].maxDiff))
+            set_rule(location, lambda state: self.evalRule(func, state.smbm[player]))
 
         def set_entrance_rule(entrance, player, func):
-            set_rule(entrance, lambda state: self.evalSMBool(func(state.smbm[player]), state.smbm[player].maxDiff))
+            set_rule(entrance, lambda state: self.evalRule(func, state.smbm[player]))
 
         self.multiworld.completion_condition[self.player] = lambda state: state.has('Mother Brain', self.player)
 
@@ -0,0 +1,37 @@
+import unittest
+
+from ..variaRandomizer.logic.smboolmanager import SMBoolManager
+
+
+class TestCacheKey(unittest.TestCase):
+    def setUp(self) -> None:
+        self.smbm = SMBoolManager()
+
+    def test_add_remove(self) -> None:
+        self.smbm.addItem("Morph")
+        morph_key = self.smbm.cacheKey
+        self.assertNotEqual(morph_key, 0)
+        self.smbm.addItem("Missile")
+        self.assertNotEqual(self.smbm.cacheKey, morph_key)
+        self.smbm.removeItem("Missile")
+        self.assertEqual(self.smbm.cacheKey, morph_key)
+        self.smbm.removeItem("Morph")
+        self.assertEqual(self.smbm.cacheKey, 0)
+
+    def test_count_items_are_clamped(self) -> None:
+        for _ in range(127):
+            self.smbm.addItem("Missile")
+        key = self.smbm.cacheKey
+        self.smbm.addItem("Missile")
+        self.assertEqual(self.smbm.cacheKey, key)
+        self.assertEqual(self.smbm.itemCount("Missile"), 128)
+        # the overflow must not spill into the bits of other items
+        pos, mask = self.smbm.itemsPositions["Missile"]
+        self.assertEqual(self.smbm.cacheKey & ~mask, 0)
+        self.assertEqual((self.smbm.cacheKey & mask) >> pos, 127)
+
+    def test_unknown_item(self) -> None:
+        self.smbm.addItem("ArchipelagoItem")
+        self.assertEqual(self.smbm.cacheKey, 0)
+        with self.assertRaises(ValueError):
+            self.smbm.addItem("NotAnItem")
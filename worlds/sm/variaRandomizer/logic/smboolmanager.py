@@ -24,8 +24,7 @@ class SMBoolManager(object):
         self.onlyBossLeft = onlyBossLeft
 
         # cache related
-        #self.cacheKey = 0
-        #self.computeItemsPositions()
+        self.cacheKey = 0
         Cache.reset()
         Logic.factory('vanilla')
         self.helpers = Logic.HelpersGraph(self)
@@ -35,24 +34,31 @@ class SMBoolManager(object):
         self.createKnowsFunctions(player)
         self.resetItems()
 
-    def computeItemsPositions(self):
+    maxBitsForCountItem = 7 # 128 values with 7 bits
+
+    @classmethod
+    def computeItemsPositions(cls):
         # compute index in cache key for each items
-        self.itemsPositions = {}
-        maxBitsForCountItem = 7 # 128 values with 7 bits
-        for (i, item) in enumerate(self.countItems):
-            pos = i*maxBitsForCountItem
-            bitMask = (2<<(maxBitsForCountItem-1))-1
+        cls.itemsPositions = {}
+        for (i, item) in enumerate(cls.countItems):
+            pos = i*cls.maxBitsForCountItem
+            bitMask = (2<<(cls.maxBitsForCountItem-1))-1
             bitMask = bitMask << pos
-            self.itemsPositions[item] = (pos, bitMask)
-        for (i, item) in enumerate(self.items, (i+1)*maxBitsForCountItem+1):
-            if item in self.countItems:
+            cls.itemsPositions[item] = (pos, bitMask)
+        for (i, item) in enumerate(cls.items, (i+1)*cls.maxBitsForCountItem+1):
+            if item in cls.countItems:
                 continue
-            self.itemsPositions[item] = (i, 1<<i)
+            cls.itemsPositions[item] = (i, 1<<i)
 
     def computeNewCacheKey(self, item, value):
         # generate an unique integer for each items combinations which is use as key in the cache.
-        if item in ['Nothing', 'NoEnergy']:
+        # no logic reads these, they don't need a place in the key
+        if item in ['Nothing', 'NoEnergy', 'ArchipelagoItem']:
             return
+        if item not in self.itemsPositions:
+            raise ValueError("Item {} has no position in the cache key".format(item))
+        # no rule asks for more than 127 of an item, more of them can share the same key
+        value = min(value, (1<<self.maxBitsForCountItem)-1)
         (pos, bitMask) = self.itemsPositions[item]
 #        print("--------------------- {} {} ----------------------------".format(item, value))
 #        print("old:  "+format(self.cacheKey, '#067b'))
@@ -101,7 +107,7 @@ class SMBoolManager(object):
         self._items = { item : smboolFalse for item in self.items }
         self._counts = { item : 0 for item in self.countItems }
 
-        #self.cacheKey = 0
+        self.cacheKey = 0
         #Cache.update(self.cacheKey)
 
     def addItem(self, item):
@@ -110,9 +116,9 @@ class SMBoolManager(object):
         if self.isCountItem(item):
             count = self._counts[item] + 1
             self._counts[item] = count
-            #self.computeNewCacheKey(item, count)
-        #else:
-            #self.computeNewCacheKey(item, 1)
+            self.computeNewCacheKey(item, count)
+        else:
+            self.computeNewCacheKey(item, 1)
 
         #Cache.update(self.cacheKey)
 
@@ -124,9 +130,9 @@ class SMBoolManager(object):
             if self.isCountItem(item):
                 count = self._counts[item] + 1
                 self._counts[item] = count
-                #self.computeNewCacheKey(item, count)
-            #else:
-                #self.computeNewCacheKey(item, 1)
+                self.computeNewCacheKey(item, count)
+            else:
+                self.computeNewCacheKey(item, 1)
 
         #Cache.update(self.cacheKey)
 
@@ -137,10 +143,10 @@ class SMBoolManager(object):
             self._counts[item] = count
             if count == 0:
                 self._items[item] = smboolFalse
-            #self.computeNewCacheKey(item, count)
+            self.computeNewCacheKey(item, count)
         else:
             self._items[item] = smboolFalse
-            #self.computeNewCacheKey(item, 0)
+            self.computeNewCacheKey(item, 0)
 
         #Cache.update(self.cacheKey)
 
@@ -241,6 +247,8 @@ class SMBoolManager(object):
         else:
             return smboolFalse
 
+SMBoolManager.computeItemsPositions()
+
 class SMBoolManagerPlando(SMBoolManager):
     def __init__(self):
         super(SMBoolManagerPlando, self).__init__()
@@ -257,9 +265,9 @@ class SMBoolManagerPlando(SMBoolManager):
         if isCount:
             count = self._counts[item] + 1
             self._counts[item] = count
-            #self.computeNewCacheKey(item, count)
-        #else:
-            #self.computeNewCacheKey(item, 1)
+            self.computeNewCacheKey(item, count)
+        else:
+            self.computeNewCacheKey(item, 1)
 
         #Cache.update(self.cacheKey)
 
@@ -270,14 +278,14 @@ class SMBoolManagerPlando(SMBoolManager):
             self._counts[item] = count
             if count == 0:
                 self._items[item] = smboolFalse
-            #self.computeNewCacheKey(item, count)
+            self.computeNewCacheKey(item, count)
         else:
             dup = 'dup_'+item
             if self._items.get(dup, None) is None:
                 self._items[item] = smboolFalse
-                #self.computeNewCacheKey(item, 0)
+                self.computeNewCacheKey(item, 0)
             else:
                 del self._items[dup]
-                #self.computeNewCacheKey(item, 1)
+                self.computeNewCacheKey(item, 1)
 
         #Cache.update(self.cacheKey)
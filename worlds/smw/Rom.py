@@ -1,6 +1,6 @@
 import Utils
 from worlds.AutoWorld import World
-from worlds.Files import APDeltaPatch
+from worlds.Files import APDeltaPatch, get_base_rom_data
 from .Aesthetics import generate_shuffled_header_data, generate_shuffled_ow_palettes, generate_curated_level_palette_data, generate_curated_map_palette_data, generate_shuffled_sfx
 from .Levels import level_info_dict, full_bowser_rooms, standard_bowser_rooms, submap_boss_rooms, ow_boss_rooms
 from .Names.TextBox import generate_goal_text, title_text_mapping, generate_text_box
@@ -8,7 +8,6 @@ from .Names.TextBox import generate_goal_text, title_text_mapping, generate_text
 USHASH = 'cdd3c8c37322978ca8669b34bc89c804'
 ROM_PLAYER_LIMIT = 65535
 
-import hashlib
 import os
 import math
 import pkgutil
@@ -3168,18 +3167,10 @@ def patch_rom(world: World, rom, player, active_level_dict):
     rom.write_bytes(0x7FC0, rom.name)
 
 def get_base_rom_bytes(file_name: str = "") -> bytes:
-    base_rom_bytes = getattr(get_base_rom_bytes, "base_rom_bytes", None)
-    if not base_rom_bytes:
-        file_name = get_base_rom_path(file_name)
-        base_rom_bytes = bytes(Utils.read_snes_rom(open(file_name, "rb")))
-
-        basemd5 = hashlib.md5()
-        basemd5.update(base_rom_bytes)
-        if USHASH != basemd5.hexdigest():
-            raise Exception('Supplied Base Rom does not match known MD5 for US(1.0) release. '
-                            'Get the correct game and version, then dump it')
-        get_base_rom_bytes.base_rom_bytes = base_rom_bytes
-    return base_rom_bytes
+    return get_base_rom_data(get_base_rom_path(file_name), {USHASH},
+                             'Supplied Base Rom does not match known MD5 for US(1.0) release. '
+                             'Get the correct game and version, then dump it',
+                             Utils.read_snes_rom)
 
 
 def get_base_rom_path(file_name: str = "") -> str:
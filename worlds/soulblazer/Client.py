@@ -1,7 +1,7 @@
 import logging
 import asyncio
 import types
-from typing import Dict, List, Optional, NamedTuple, TYPE_CHECKING, Set
+from typing import Any, Dict, List, Optional, NamedTuple, TYPE_CHECKING, Set, Tuple
 
 from .Names import Addresses, ItemID, MapID
 from .Names.ArchipelagoID import BASE_ID, LAIR_ID_OFFSET, NPC_REWARD_OFFSET
@@ -48,6 +48,19 @@ class LocationData(NamedTuple):
         return MapID.map_id_for_number[(self.map_number, self.map_sub_number)]
 
 
+def decode_operands(slot_data: Dict[str, Any], kind: str) -> Dict[Tuple[int, int], int]:
+    """Returns the operands of this slot's "gem" or "exp" items, keyed by (location, player) of the item."""
+    if f"{kind}_operands" in slot_data:
+        values: List[int] = slot_data[f"{kind}_operands"]
+        return {(values[i], values[i + 1]): values[i + 2] for i in range(0, len(values), 3)}
+    # Seeds from before the compact format used "item:location:player" keys.
+    return {
+        (int(location), int(player)): operand
+        for key, operand in slot_data.get(f"{kind}_data", {}).items()
+        for _, location, player in (key.split(":"),)
+    }
+
+
 class SoulBlazerSNIClient(SNIClient):
     game = "Soul Blazer"
     patch_suffix = ".apsb"
@@ -147,13 +160,13 @@ class SoulBlazerSNIClient(SNIClient):
             if cmd in {"Connected", "RoomUpdate"}:
                 slot_data = args.get("slot_data", None)
                 if slot_data:
-                    self.gem_data = slot_data.get("gem_data", {})
-                    self.exp_data = slot_data.get("exp_data", {})
+                    self.gem_data = decode_operands(slot_data, "gem")
+                    self.exp_data = decode_operands(slot_data, "exp")
             elif cmd == "Retrieved":
                 slot_data = args["keys"].get(f"_read_slot_data_{self.slot}", None)
                 if slot_data:
-                    self.gem_data = slot_data.get("gem_data", {})
-                    self.exp_data = slot_data.get("exp_data", {})
+                    self.gem_data = decode_operands(slot_data, "gem")
+                    self.exp_data = decode_operands(slot_data, "exp")
             elif cmd == "PrintJSON":
                 # We want ItemSends from us to another player so we can print them in game
                 if (
@@ -353,9 +366,9 @@ class SoulBlazerSNIClient(SNIClient):
             item_data = self.item_data_for_code[item.item]
             operand = item_data.operand_for_id
             if item_data.id == ItemID.GEMS:
-                operand = ctx.gem_data.get(f"{item.item}:{item.location}:{item.player}", operand)
+                operand = ctx.gem_data.get((item.location, item.player), operand)
             if item_data.id == ItemID.EXP:
-                operand = ctx.exp_data.get(f"{item.item}:{item.location}:{item.player}", operand)
+                operand = ctx.exp_data.get((item.location, item.player), operand)
 
             snes_buffered_write(ctx, Addresses.RX_INCREMENT, bytes([0x01]))
             snes_buffered_write(ctx, Addresses.RX_ID, item_data.id.to_bytes(1, "little"))
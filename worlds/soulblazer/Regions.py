@@ -1,9 +1,9 @@
-import logging
-from typing import Dict, List, Callable, TYPE_CHECKING, NamedTuple
+import functools
+from typing import Dict, List, Callable, TYPE_CHECKING, NamedTuple, Tuple
 from BaseClasses import MultiWorld, Region, Entrance, CollectionState
 from .Items import swords_table, stones_table, redhots_table
 from .Names import RegionName, ItemName, LairName, ChestName, NPCName, NPCRewardName
-from .Locations import SoulBlazerLocation, all_locations_table
+from .Locations import SoulBlazerLocation, SoulBlazerLocationData, all_locations_table
 from .Options import SoulBlazerOptions
 from .Rules import no_requirement, RuleFlag, rule_for_flag
 
@@ -594,26 +594,60 @@ exits_for_region_open_deathtoll: Dict[str, List[ExitData]] = {
 }
 
 
-def get_rule_for_exit(data: ExitData, player: int) -> Callable[[CollectionState], bool]:
-    """Returns the access rule for the given exit."""
+def get_rule_for_exit(data: ExitData) -> Callable[[CollectionState, int], bool]:
+    """Returns the access rule for the given exit, taking the player as second argument."""
 
+    flag_rule = rule_for_flag[data.rule_flag]
     if not data.has_all and not data.has_any:
+        return flag_rule
 
-        def rule_simple(state: CollectionState) -> bool:
-            return rule_for_flag[data.rule_flag](state, player)
+    has_all = tuple(data.has_all)
+    has_any = tuple(data.has_any)
 
-        return rule_simple
-
-    def rule(state: CollectionState) -> bool:
+    def rule(state: CollectionState, player: int) -> bool:
         return (
-            rule_for_flag[data.rule_flag](state, player)
-            and state.has_all(data.has_all, player)
-            and (not data.has_any or state.has_any(data.has_any, player))
+            flag_rule(state, player)
+            and state.has_all(has_all, player)
+            and (not has_any or state.has_any(has_any, player))
         )
 
     return rule
 
 
+class ExitTemplate(NamedTuple):
+    destination: str
+    rule: Callable[[CollectionState, int], bool]
+
+
+def build_exit_templates(open_deathtoll: bool, open_mode: bool) -> Dict[str, Tuple[ExitTemplate, ...]]:
+    """Merges the exits for the given options and resolves their rules."""
+    exits = {**exits_for_region}
+    exits = {**exits, **exits_for_region_open_deathtoll} if open_deathtoll else exits
+    exits = {**exits, **exits_for_region_open_mode} if open_mode else exits
+    return {
+        region_name: tuple(ExitTemplate(data.destination, get_rule_for_exit(data)) for data in region_exits)
+        for region_name, region_exits in exits.items()
+    }
+
+
+# The exits only depend on these two options, so all variants are built once and shared by every player.
+exit_templates: Dict[Tuple[bool, bool], Dict[str, Tuple[ExitTemplate, ...]]] = {
+    (open_deathtoll, open_mode): build_exit_templates(open_deathtoll, open_mode)
+    for open_deathtoll in (False, True)
+    for open_mode in (False, True)
+}
+
+location_data_for_region: Dict[str, Tuple[Tuple[str, SoulBlazerLocationData], ...]] = {
+    region_name: tuple((loc, all_locations_table[loc]) for loc in locations)
+    for region_name, locations in locations_for_region.items()
+}
+
+# All of the locations should be placed in regions.
+assert {loc for locations in locations_for_region.values() for loc in locations} == all_locations_table.keys(), (
+    "Soulblazer: Regions do not contain all locations. Something is likely broken with the logic."
+)
+
+
 def create_regions(world: "SoulBlazerWorld") -> None:
     """
     Creates and connects regions for the world.
@@ -624,32 +658,14 @@ def create_regions(world: "SoulBlazerWorld") -> None:
     regions = {k: Region(k, world.player, world.multiworld) for k in locations_for_region.keys()}
     world.multiworld.regions += regions.values()
 
-    all_locations: List[SoulBlazerLocation] = []
+    exits = exit_templates[bool(world.options.open_deathtoll), world.options.act_progression == "open"]
 
     # Populate each region with locations and exits
     for region in regions.values():
-        locations = [
-            SoulBlazerLocation(world.player, loc, data, region)
-            for loc in locations_for_region[region.name]
-            for data in [all_locations_table[loc]]
+        region.locations += [
+            SoulBlazerLocation(world.player, loc, data, region) for loc, data in location_data_for_region[region.name]
         ]
 
-        region.locations += locations
-        all_locations += locations
-        exits = {**exits_for_region}
-        exits = {**exits, **exits_for_region_open_deathtoll} if world.options.open_deathtoll else exits
-        exits = {**exits, **exits_for_region_open_mode} if world.options.act_progression == "open" else exits
-
-        for exit_data in exits.get(region.name, []):
-            connect_to = regions[exit_data.destination]
-            region.connect(connect_to, None, get_rule_for_exit(exit_data, world.player))
-
-    # All of the locations should have been placed in regions.
-    # TODO: Delete once confident that all locations are in or move into a test instead?
-    if len(all_locations) < len(all_locations_table):
-        all_location_names = {loc.name for loc in all_locations}
-        all_locations_table_names = {*all_locations_table.keys()}
-        unplaced = all_locations_table_names - all_location_names
-        logging.warning("Soulblazer: Regions do not contain all locations. Something is likely broken with the logic.")
-        for loc in unplaced:
-            logging.warning(loc)
+        for exit_template in exits.get(region.name, ()):
+            connect_to = regions[exit_template.destination]
+            region.connect(connect_to, None, functools.partial(exit_template.rule, player=world.player))
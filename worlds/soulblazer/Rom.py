@@ -1,4 +1,3 @@
-import hashlib
 import os
 import math
 import pkgutil
@@ -9,7 +8,7 @@ from typing import Callable, Dict, TYPE_CHECKING
 from BaseClasses import ItemClassification
 from Utils import read_snes_rom
 from worlds.AutoWorld import World
-from worlds.Files import APDeltaPatch
+from worlds.Files import APDeltaPatch, get_base_rom_data
 from .Names import Addresses, ItemID
 from .Items import SoulBlazerItem, SoulBlazerItemData
 from .Locations import SoulBlazerLocation, LocationType, SoulBlazerLocationData
@@ -36,8 +35,8 @@ class LocalRom(object):
         self.hash = hash
         # self.orig_buffer = None
 
-        with open(file, "rb") as stream:
-            self.buffer = read_snes_rom(stream)
+        # the base rom is read and verified once per process, and shared between slots
+        self.buffer = bytearray(get_base_rom_bytes(file))
         if patch:
             self.apply_basepatch()
         #     self.orig_buffer = self.buffer.copy()
@@ -168,20 +167,10 @@ class SoulBlazerDeltaPatch(APDeltaPatch):
 
 
 def get_base_rom_bytes(file_name: str = "") -> bytes:
-    base_rom_bytes = getattr(get_base_rom_bytes, "base_rom_bytes", None)
-    if not base_rom_bytes:
-        file_name = get_base_rom_path(file_name)
-        base_rom_bytes = bytes(read_snes_rom(open(file_name, "rb")))
-
-        basemd5 = hashlib.md5()
-        basemd5.update(base_rom_bytes)
-        if USHASH != basemd5.hexdigest():
-            raise Exception(
-                "Supplied Base Rom does not match known MD5 for US release. "
-                "Get the correct game and version, then dump it"
-            )
-        get_base_rom_bytes.base_rom_bytes = base_rom_bytes
-    return base_rom_bytes
+    return get_base_rom_data(get_base_rom_path(file_name), {USHASH},
+                             "Supplied Base Rom does not match known MD5 for US release. "
+                             "Get the correct game and version, then dump it",
+                             read_snes_rom)
 
 
 def get_base_rom_path(file_name: str = "") -> str:
@@ -234,14 +234,17 @@ class SoulBlazerWorld(World):
 
     def fill_slot_data(self) -> Dict[str, Any]:
         slot_data = dict()
-        slot_data["gem_data"] = {
-            f"{item.code}:{item.location.address}:{item.location.player}": item.operand_for_id
+        # Flat location, player, operand triples. Read by Client.decode_operands.
+        slot_data["gem_operands"] = [
+            value
             for item in self.gem_items
-        }
-        slot_data["exp_data"] = {
-            f"{item.code}:{item.location.address}:{item.location.player}": item.operand_for_id
+            for value in (item.location.address, item.location.player, item.operand_for_id)
+        ]
+        slot_data["exp_operands"] = [
+            value
             for item in self.exp_items
-        }
+            for value in (item.location.address, item.location.player, item.operand_for_id)
+        ]
         for option_name in (
             attr.name
             for attr in dataclasses.fields(SoulBlazerOptions)
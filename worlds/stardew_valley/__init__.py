@@ -1,7 +1,7 @@
 import logging
 from typing import Dict, Any, Iterable, Optional, Union, List, TextIO
 
-from BaseClasses import Region, Entrance, Location, Item, Tutorial, ItemClassification, MultiWorld
+from BaseClasses import Region, Entrance, Location, Item, Tutorial, ItemClassification, MultiWorld, CollectionState
 from Options import PerGameCommonOptions
 from worlds.AutoWorld import World, WebWorld
 from . import rules
@@ -282,6 +282,20 @@ class StardewValleyWorld(World):
             # if item.name in self.all_progression_items:
             #     self.all_progression_items[item.name] -= 1
 
+    def collect(self, state: CollectionState, item: Item) -> bool:
+        change = super().collect(state, item)
+        if change:
+            state.prog_items[self.player][Event.received_progression_item] += 1
+        return change
+
+    def remove(self, state: CollectionState, item: Item) -> bool:
+        # removing an item that isn't in state doesn't change the total
+        had_item = state.prog_items[self.player][item.name] > 0
+        change = super().remove(state, item)
+        if change and had_item:
+            state.prog_items[self.player][Event.received_progression_item] -= 1
+        return change
+
     def create_starting_item(self, item: Union[str, ItemData]) -> StardewItem:
         if isinstance(item, str):
             item = item_table[item]
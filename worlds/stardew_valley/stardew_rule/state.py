@@ -5,6 +5,7 @@ from BaseClasses import ItemClassification, CollectionState
 from .base import BaseStardewRule, CombinableStardewRule
 from .protocol import StardewRule
 from ..items import item_table
+from ..strings.ap_names.event_names import Event
 
 
 class TotalReceived(BaseStardewRule):
@@ -122,13 +123,8 @@ class HasProgressionPercent(CombinableStardewRule):
         stardew_world = state.multiworld.worlds[self.player]
         total_count = stardew_world.total_progression_items
         needed_count = (total_count * self.percent) // 100
-        total_count = 0
-        for item in state.prog_items[self.player]:
-            item_count = state.prog_items[self.player][item]
-            total_count += item_count
-            if total_count >= needed_count:
-                return True
-        return False
+        # The world keeps a running total of the collected progression items, instead of summing them on each call.
+        return state.has(Event.received_progression_item, self.player, needed_count)
 
     def evaluate_while_simplifying(self, state: CollectionState) -> Tuple[StardewRule, bool]:
         return self, self(state)
@@ -4,3 +4,4 @@ class Event:
     start_dark_talisman_quest = "Start Dark Talisman Quest"
     can_ship_items = "Can Ship Items"
     can_shop_at_pierre = "Can Shop At Pierre's"
+    received_progression_item = "Received Progression Item"
@@ -6,6 +6,7 @@ from ..data.craftable_data import all_crafting_recipes_by_name
 from ..locations import locations_by_tag, LocationTags, location_table
 from ..options import ToolProgression, BuildingProgression, ExcludeGingerIsland, Chefsanity, Craftsanity, Shipsanity, SeasonRandomization, Friendsanity, \
     FriendsanityHeartSize, BundleRandomization, SkillProgression
+from ..strings.ap_names.event_names import Event
 from ..strings.entrance_names import Entrance
 from ..strings.region_names import Region
 from ..strings.tool_names import Tool, ToolMaterial
@@ -795,3 +796,18 @@ class TestVanillaSkillLogicSimplification(SVTestBase):
     def test_skill_logic_has_level_only_uses_one_has_progression_percent(self):
         rule = self.multiworld.worlds[1].logic.skill.has_level("Farming", 8)
         self.assertEqual(1, sum(1 for i in rule.current_rules if type(i) == HasProgressionPercent))
+
+
+class TestHasProgressionPercentTotal(SVTestBase):
+
+    def test_total_follows_collected_and_removed_items(self):
+        state = self.multiworld.state
+        stardrop = self.world.create_item("Stardrop")
+        for i in range(5):
+            state.collect(stardrop, event=False)
+        self.remove(stardrop)
+        self.remove(self.world.create_item("Shipping Bin"))
+
+        expected_total = sum(count for item, count in state.prog_items[self.player].items()
+                             if item != Event.received_progression_item)
+        self.assertEqual(expected_total, state.count(Event.received_progression_item, self.player))
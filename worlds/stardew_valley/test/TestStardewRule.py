@@ -101,6 +101,7 @@ class TestEvaluateWhileSimplifying(unittest.TestCase):
 
     def test_short_circuit_when_combinable_rules_is_false(self):
         collection_state = MagicMock()
+        collection_state.has.return_value = False
         other_rule = MagicMock()
         rule = And(HasProgressionPercent(1, 10), other_rule)
 